@@ -0,0 +1,139 @@
+"""Compare decode time and peak RSS of response decoding strategies on a
+10000 feature observation page.
+
+Every strategy runs in a fresh process, and the growth of its peak resident
+set size during one decode is reported.
+
+Run with::
+
+    $ python benchmarks/bench_decoding.py [payload.json]
+
+Without a payload argument a synthetic metObs page is used.
+"""
+
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from dmi_open_data import decoding
+
+
+def write_synthetic_page(f, n: int = 10000) -> None:
+    # Written one feature at a time, so this process stays small: Linux
+    # carries the peak RSS of a process over into the benchmarks it spawns
+    f.write(b'{"type": "FeatureCollection", "features": [')
+    for i in range(n):
+        feature = {
+            "type": "Feature",
+            "id": f"{i:08x}-0000-0000-0000-000000000000",
+            "geometry": {"type": "Point", "coordinates": [12.5621, 55.7077]},
+            "properties": {
+                "created": "2021-07-20T00:15:03.123456Z",
+                "observed": "2021-07-20T00:10:00Z",
+                "parameterId": "temp_dry",
+                "stationId": f"{6000 + i % 500:05d}",
+                "value": 15.0 + (i % 100) / 10,
+            },
+        }
+        f.write((", " if i > 0 else "").encode() + json.dumps(feature).encode())
+    f.write(f'], "numberReturned": {n}}}'.encode())
+
+
+def measure(func, payload: bytes, repeat: int = 5):
+    """Best decode time, and growth of the peak RSS over a single decode.
+
+    The peak resident set size includes the C-level buffers of orjson and
+    yajl, which tracemalloc does not see, so each strategy has to run in a
+    fresh process for the peaks to be comparable.
+    """
+    baseline = _max_rss()
+    func(payload)
+    peak = _max_rss() - baseline
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payload)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return elapsed, peak
+
+
+def _max_rss() -> int:
+    # Kilobytes on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def double_parse(payload: bytes):
+    json.loads(payload)
+    return json.loads(payload)
+
+
+def consume_stream(payload: bytes):
+    for _ in decoding.iter_features(io.BytesIO(payload)):
+        pass
+
+
+def consume_stream_with_links(payload: bytes):
+    # As done by the client, to follow `next` links of streamed pages
+    for _ in decoding.iter_features(io.BytesIO(payload), links=[]):
+        pass
+
+
+def strategies():
+    strategies = {
+        "json, parsed twice (previous _query)": double_parse,
+        "json, parsed once": json.loads,
+    }
+    if decoding.orjson is not None:
+        strategies["orjson"] = decoding.orjson.loads
+    if decoding.ijson is not None:
+        strategies["ijson streaming"] = consume_stream
+        strategies["ijson streaming, collecting links"] = consume_stream_with_links
+    return strategies
+
+
+def run_strategy(name: str, path: str):
+    with open(path, "rb") as f:
+        payload = f.read()
+    func = strategies()[name]
+    elapsed, peak = measure(func, payload)
+    print(json.dumps({"elapsed": elapsed, "peak": peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("payload", nargs="?", help="JSON page to decode")
+    parser.add_argument("--strategy", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.strategy is not None:
+        return run_strategy(args.strategy, args.payload)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.payload
+        if path is None:
+            path = os.path.join(directory, "page.json")
+            with open(path, "wb") as f:
+                write_synthetic_page(f)
+        print(f"payload: {os.path.getsize(path) / 1024 ** 2:.1f} MiB")
+        for name in strategies():
+            output = subprocess.run(
+                [sys.executable, __file__, path, "--strategy", name],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{name:<40} {result['elapsed'] * 1000:8.1f} ms "
+                f"{result['peak'] / 1024 ** 2:8.1f} MiB peak RSS"
+            )
+
+
+if __name__ == "__main__":
+    main()
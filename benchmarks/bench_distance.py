@@ -0,0 +1,65 @@
+"""Compare scalar `distance` against the vectorized distance functions.
+
+Run with::
+
+    $ python benchmarks/bench_distance.py
+"""
+
+import time
+
+import numpy as np
+
+from dmi_open_data.utils import distance, distances_to, distance_matrix
+
+SIZES = [1_000, 100_000, 10_000_000]
+# The scalar loop is timed on at most this many points and extrapolated
+MAX_SCALAR_POINTS = 1_000_000
+
+
+def timeit(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = np.random.default_rng(0)
+    lat, lon = 55.707722, 12.562119
+    print(
+        f"{'points':>10} {'scalar':>10} {'numpy f64':>10} {'numpy f32':>10} {'speedup':>8}"
+    )
+    for n in SIZES:
+        lats = rng.uniform(54.5, 57.8, n)
+        lons = rng.uniform(8.0, 15.2, n)
+        m = min(n, MAX_SCALAR_POINTS)
+        lats_list, lons_list = lats[:m].tolist(), lons[:m].tolist()
+        scalar = timeit(
+            lambda: [distance(lat, lon, a, b) for a, b in zip(lats_list, lons_list)],
+            repeat=1,
+        ) * (n / m)
+        f64 = timeit(lambda: distances_to(lat, lon, lats, lons))
+        f32 = timeit(lambda: distances_to(lat, lon, lats, lons, float32=True))
+        print(
+            f"{n:>10} {scalar:>9.4f}s {f64:>9.4f}s {f32:>9.4f}s {scalar / f64:>7.1f}x"
+        )
+
+    # Full matrix: 1000 query points against 500 stations
+    lats1, lons1 = rng.uniform(54.5, 57.8, 1000), rng.uniform(8.0, 15.2, 1000)
+    lats2, lons2 = rng.uniform(54.5, 57.8, 500), rng.uniform(8.0, 15.2, 500)
+    matrix = timeit(lambda: distance_matrix(lats1, lons1, lats2, lons2))
+    pairs = list(zip(lats2.tolist(), lons2.tolist()))
+    scalar = timeit(
+        lambda: [
+            [distance(a, b, c, d) for c, d in pairs]
+            for a, b in zip(lats1.tolist(), lons1.tolist())
+        ],
+        repeat=1,
+    )
+    print(f"distance_matrix 1000x500: scalar {scalar:.4f}s, numpy {matrix:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
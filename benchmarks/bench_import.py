@@ -0,0 +1,82 @@
+"""Measure cold start latency: importing the package, constructing a client and
+looking up the closest station from a local station snapshot.
+
+Every measurement runs in a fresh interpreter, and the median of several runs
+is reported next to an interpreter that only starts up, and one that imports
+all modules of the package eagerly.
+
+Run with::
+
+    $ python benchmarks/bench_import.py [n_runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from dmi_open_data.metadata import StationSnapshot
+from stub_server import make_station
+
+SCENARIOS = {
+    "import dmi_open_data": "import dmi_open_data",
+    "import + DMIOpenDataClient()": (
+        "import dmi_open_data; dmi_open_data.DMIOpenDataClient(api_key='x')"
+    ),
+    "import + get_closest_station (snapshot)": (
+        "import dmi_open_data; "
+        "client = dmi_open_data.DMIOpenDataClient(api_key='x', "
+        "station_snapshot=dmi_open_data.StationSnapshot({path!r})); "
+        "client.get_closest_station(latitude=55.7, longitude=12.5)"
+    ),
+    "eager import of all modules": (
+        "import dmi_open_data.client, dmi_open_data.async_client, "
+        "dmi_open_data.columnar, dmi_open_data.sync, dmi_open_data.aggregate, "
+        "dmi_open_data.utils, requests"
+    ),
+}
+
+TIMER = (
+    "import time; start = time.perf_counter(); {code}; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure(code: str, n_runs: int) -> float:
+    seconds = []
+    for _ in range(n_runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        seconds.append(float(output))
+    return statistics.median(seconds)
+
+
+def measure_startup(n_runs: int) -> float:
+    import time
+
+    seconds = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stations.json")
+        StationSnapshot(path).save([make_station(i) for i in range(1000)])
+        print(f"{'interpreter startup':<42} {measure_startup(n_runs) * 1000:8.1f} ms")
+        for name, code in SCENARIOS.items():
+            seconds = measure(code.format(path=path), n_runs)
+            print(f"{name:<42} {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
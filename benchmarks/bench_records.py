@@ -0,0 +1,74 @@
+"""Compare memory of raw GeoJSON observations with `Observation` records.
+
+Decodes synthetic observation pages, keeps all observations in memory either as
+the decoded dicts or as parsed records, and reports the retained bytes per
+observation and the decode (and parse) time.
+
+Run with::
+
+    $ python benchmarks/bench_records.py [n_observations]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from dmi_open_data.records import parse_observations
+
+
+def synthetic_pages(n: int, page_size: int = 10000):
+    for start in range(0, n, page_size):
+        yield json.dumps(
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    {
+                        "type": "Feature",
+                        "id": f"{i:08x}-0000-0000-0000-000000000000",
+                        "geometry": {
+                            "type": "Point",
+                            "coordinates": [8.0 + (i % 500) * 0.01, 55.0],
+                        },
+                        "properties": {
+                            "created": "2021-07-20T00:15:03.123456Z",
+                            "observed": f"2021-07-{1 + i // 72000 % 28:02d}T00:10:00Z",
+                            "parameterId": "temp_dry",
+                            "stationId": f"{6000 + i % 500:05d}",
+                            "value": 15.0 + (i % 100) / 10,
+                        },
+                    }
+                    for i in range(start, min(n, start + page_size))
+                ],
+            }
+        ).encode()
+
+
+def features(n: int):
+    for page in synthetic_pages(n):
+        yield from json.loads(page)["features"]
+
+
+def measure(func, n: int):
+    start = time.perf_counter()
+    func(features(n))
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    retained = func(features(n))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(retained) == n
+    return size, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{n} observations")
+    results = {"dict": measure(list, n), "Observation": measure(parse_observations, n)}
+    for name, (size, elapsed) in results.items():
+        print(f"{name:<12} {size / n:8.0f} bytes/observation {elapsed:7.2f} s")
+    print(f"Reduction: {results['dict'][0] / results['Observation'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare one-connection-per-request against the pooled client session.
+
+Run with::
+
+    $ python benchmarks/bench_transport.py
+"""
+
+import time
+
+import requests
+
+from dmi_open_data import DMIOpenDataClient
+from stub_server import StubServer
+
+
+N_REQUESTS = 500
+
+
+def bench_bare_requests(base_url: str) -> float:
+    start = time.perf_counter()
+    for _ in range(N_REQUESTS):
+        requests.get(
+            f"{base_url}/v2/metObs/collections/station/items",
+            params={"api-key": "stub", "limit": 10},
+        ).json()
+    return N_REQUESTS / (time.perf_counter() - start)
+
+
+def bench_pooled_client(base_url: str) -> float:
+    class StubClient(DMIOpenDataClient):
+        _base_url = base_url + "/{version}/{api}"
+
+    with StubClient(api_key="stub") as client:
+        start = time.perf_counter()
+        for _ in range(N_REQUESTS):
+            client.get_stations(limit=10)
+        return N_REQUESTS / (time.perf_counter() - start)
+
+
+def main():
+    with StubServer() as server:
+        before = bench_bare_requests(server.url)
+        after = bench_pooled_client(server.url)
+    print(f"requests.get (new connection per call): {before:8.1f} req/s")
+    print(f"DMIOpenDataClient (pooled session):     {after:8.1f} req/s")
+    print(f"speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
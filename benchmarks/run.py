@@ -0,0 +1,191 @@
+"""Offline benchmark suite against the local stub API.
+
+Measures throughput, latency percentiles and peak memory of the main client
+operations and writes a machine-readable JSON report.
+
+Run with::
+
+    $ python benchmarks/run.py --output report.json [--latency 0.005] [--error-rate 0.01]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+import dmi_open_data
+from dmi_open_data import DMIOpenDataClient, Parameter, RetryPolicy
+from stub_server import StubServer
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def run_scenario(name, server, func, repeat: int, expected_items: int):
+    """Call `func` `repeat` times and summarize. `func` returns the number of items.
+
+    Every call must return `expected_items` items, the number the stub serves,
+    so a scenario cannot get faster by silently dropping data.
+    """
+    latencies, n_items = [], 0
+    n_requests = server.n_requests
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call_start = time.perf_counter()
+        items = func()
+        latencies.append(time.perf_counter() - call_start)
+        if items != expected_items:
+            raise AssertionError(
+                f"{name}: returned {items} items, expected {expected_items}"
+            )
+        n_items += items
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "name": name,
+        "calls": repeat,
+        "requests": server.n_requests - n_requests,
+        "items": n_items,
+        "seconds": elapsed,
+        "calls_per_second": repeat / elapsed,
+        "items_per_second": n_items / elapsed,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "latency_mean_ms": statistics.mean(latencies) * 1000,
+        "peak_memory_bytes": peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--output", default="bench_report.json")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with StubServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        max_page_size=args.page_size,
+    ) as server:
+
+        class StubClient(DMIOpenDataClient):
+            _base_url = server.url + "/{version}/{api}"
+
+        client = StubClient(
+            api_key="stub",
+            retry_policy=RetryPolicy(max_attempts=10, backoff_base=0.01),
+        )
+        from_time, to_time = datetime(2021, 1, 1), datetime(2021, 1, 8)
+        batch_station_ids = [f"{6000 + i:05d}" for i in range(10)]
+        batch_parameters = [Parameter.TempDry, Parameter.Humidity, Parameter.WindSpeed]
+        scenarios = [
+            (
+                "get_stations",
+                lambda: len(client.get_stations()),
+                args.repeat,
+                server.n_stations,
+            ),
+            (
+                "iter_observations (paginated, 1 station, 7 days)",
+                lambda: sum(
+                    1
+                    for _ in client.iter_observations(
+                        station_id="06000",
+                        from_time=from_time,
+                        to_time=to_time,
+                        page_size=500,
+                    )
+                ),
+                args.repeat,
+                server.n_observations(
+                    station_id="06000", from_time=from_time, to_time=to_time
+                ),
+            ),
+            (
+                "get_closest_station",
+                lambda: int(
+                    client.get_closest_station(latitude=55.7, longitude=12.5)
+                    is not None
+                ),
+                args.repeat * 50,
+                1,
+            ),
+            (
+                "get_observations_batch (10 stations x 3 parameters, 1 day)",
+                lambda: sum(
+                    len(features)
+                    for features in client.get_observations_batch(
+                        station_ids=batch_station_ids,
+                        parameters=batch_parameters,
+                        from_time=from_time,
+                        to_time=datetime(2021, 1, 2),
+                    ).values()
+                ),
+                max(1, args.repeat // 4),
+                sum(
+                    server.n_observations(
+                        station_id=station_id,
+                        parameter_id=parameter.value,
+                        from_time=from_time,
+                        to_time=datetime(2021, 1, 2),
+                    )
+                    for station_id in batch_station_ids
+                    for parameter in batch_parameters
+                ),
+            ),
+            (
+                "get_observations_sharded (all stations, temp_dry, 1 day)",
+                lambda: len(
+                    client.get_observations_sharded(
+                        from_time=from_time,
+                        to_time=datetime(2021, 1, 2),
+                        parameters=[Parameter.TempDry],
+                    )
+                ),
+                max(1, args.repeat // 4),
+                server.n_observations(
+                    parameter_id=Parameter.TempDry.value,
+                    from_time=from_time,
+                    to_time=datetime(2021, 1, 2),
+                ),
+            ),
+        ]
+        results = [
+            run_scenario(name, server, func, repeat, expected_items)
+            for name, func, repeat, expected_items in scenarios
+        ]
+        client.close()
+
+    report = {
+        "created": datetime.utcnow().isoformat() + "Z",
+        "version": dmi_open_data.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for result in results:
+        print(
+            f"{result['name']:<62} {result['calls_per_second']:9.1f} calls/s "
+            f"p50 {result['latency_p50_ms']:8.2f} ms p99 {result['latency_p99_ms']:8.2f} ms "
+            f"peak {result['peak_memory_bytes'] / 1024 ** 2:7.1f} MiB"
+        )
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Local stand-in for the DMI Open Data API used by the benchmarks.
+
+Serves synthetic, deterministic GeoJSON for the metObs station and observation
+collections and the climateData stationValue collection, supporting the
+`stationId`, `parameterId`, `datetime`, `limit` and `offset` query parameters
+and `next` links. Latency, maximum page size and error injection are
+configurable.
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlparse, parse_qs
+
+START = datetime(2021, 1, 1)
+
+
+def make_station(i: int):
+    return {
+        "type": "Feature",
+        "id": f"station-{i}",
+        "geometry": {
+            "type": "Point",
+            "coordinates": [8.0 + (i % 70) * 0.1, 54.5 + (i // 70) * 0.1],
+        },
+        "properties": {
+            "stationId": f"{6000 + i:05d}",
+            "name": f"Station {i}",
+        },
+    }
+
+
+class Collection:
+    """Synthetic collection of one value per time step, station and parameter.
+
+    Features are generated on demand from their index, ordered by time, then
+    station, then parameter, so arbitrarily large collections cost no memory.
+    """
+
+    def __init__(self, stations, parameters, step: timedelta, n_steps: int, kind: str):
+        self.stations = stations
+        self.parameters = parameters
+        self.step = step
+        self.n_steps = n_steps
+        self.kind = kind
+
+    def query(self, station_id=None, parameter_id=None, interval=None):
+        stations = [
+            i
+            for i, station in enumerate(self.stations)
+            if station_id is None or station["properties"]["stationId"] == station_id
+        ]
+        parameters = [p for p in self.parameters if parameter_id in (None, p)]
+        first, last = 0, self.n_steps
+        if interval is not None:
+            start, end = _parse_interval(interval)
+            if start is not None:
+                first = max(first, -(-(start - START) // self.step))
+            if end is not None:
+                last = min(last, -(-(end - START) // self.step))
+        return stations, parameters, first, max(first, last)
+
+    def page(self, stations, parameters, first, last, offset, limit):
+        total = (last - first) * len(stations) * len(parameters)
+        features = []
+        for index in range(offset, min(total, offset + limit)):
+            step, rest = divmod(index, len(stations) * len(parameters))
+            station, parameter = divmod(rest, len(parameters))
+            features.append(
+                self.feature(first + step, stations[station], parameters[parameter])
+            )
+        return features, total
+
+    def feature(self, step: int, station_index: int, parameter: str):
+        station = self.stations[station_index]
+        time = START + self.step * step
+        properties = {
+            "stationId": station["properties"]["stationId"],
+            "parameterId": parameter,
+            "value": round(10 + 5 * ((step + station_index) % 24) / 24, 2),
+        }
+        if self.kind == "observation":
+            properties["observed"] = f"{time.isoformat()}Z"
+        else:
+            properties["from"] = f"{time.isoformat()}Z"
+            properties["to"] = f"{(time + self.step).isoformat()}Z"
+            properties["timeResolution"] = "day"
+        return {
+            "type": "Feature",
+            "id": f"{self.kind}-{step}-{station_index}-{parameter}",
+            "geometry": station["geometry"],
+            "properties": properties,
+        }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.n_requests += 1
+            fail = server.random.random() < server.error_rate
+        if server.latency > 0:
+            time.sleep(server.latency)
+        if fail:
+            return self.send_json(
+                503,
+                {"http_status_code": 503, "message": "Injected error"},
+                headers={"Retry-After": "0"},
+            )
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        limit = min(int(query.get("limit", 1000)), server.max_page_size)
+        offset = int(query.get("offset", 0))
+
+        if url.path.endswith("/metObs/collections/station/items"):
+            features = server.stations[offset : offset + limit]
+            total = len(server.stations)
+        elif url.path.endswith("/metObs/collections/observation/items"):
+            features, total = self.query(server.observations, query, offset, limit)
+        elif url.path.endswith("/climateData/collections/stationValue/items"):
+            features, total = self.query(server.climate_data, query, offset, limit)
+        else:
+            return self.send_json(
+                404, {"http_status_code": 404, "message": "Not found"}
+            )
+
+        links = []
+        if offset + len(features) < total:
+            next_query = {**query, "offset": offset + len(features)}
+            links.append(
+                {
+                    "href": f"http://{self.headers['Host']}{url.path}?{urlencode(next_query)}",
+                    "rel": "next",
+                }
+            )
+        self.send_json(
+            200,
+            {
+                "type": "FeatureCollection",
+                "features": features,
+                "numberReturned": len(features),
+                "links": links,
+            },
+        )
+
+    def query(self, collection, query, offset, limit):
+        selection = collection.query(
+            station_id=query.get("stationId"),
+            parameter_id=query.get("parameterId"),
+            interval=query.get("datetime"),
+        )
+        return collection.page(*selection, offset=offset, limit=limit)
+
+    def send_json(self, status, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/geo+json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    """Serve the stub API from a background thread.
+
+    Usage::
+
+        with StubServer(latency=0.01, error_rate=0.05) as server:
+            url = server.url  # http://127.0.0.1:<port>
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        n_stations: int = 500,
+        parameters=("temp_dry", "humidity", "wind_speed"),
+        days: int = 7,
+        latency: float = 0.0,
+        max_page_size: int = 10000,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """Initialize stub server.
+
+        Args:
+            host (str, optional): Host to bind. Defaults to "127.0.0.1".
+            port (int, optional): Port to bind. Defaults to 0 (any free port).
+            n_stations (int, optional): Number of stations. Defaults to 500.
+            parameters (tuple, optional): Observation parameters served.
+            days (int, optional): Days of data served, starting 2021-01-01. Defaults to 7.
+            latency (float, optional): Seconds added to every response. Defaults to 0.
+            max_page_size (int, optional): Largest page served regardless of `limit`.
+                Defaults to 10000.
+            error_rate (float, optional): Fraction of requests answered with
+                HTTP 503. Defaults to 0.
+            seed (int, optional): Seed of the error injection. Defaults to 0.
+        """
+        self._server = ThreadingHTTPServer((host, port), StubHandler)
+        self._server.daemon_threads = True
+        stations = [make_station(i) for i in range(n_stations)]
+        self._server.stations = stations
+        self._server.observations = Collection(
+            stations, list(parameters), timedelta(minutes=10), days * 144, "observation"
+        )
+        self._server.climate_data = Collection(
+            stations, ["mean_temp"], timedelta(days=1), days, "stationValue"
+        )
+        self._server.latency = latency
+        self._server.max_page_size = max_page_size
+        self._server.error_rate = error_rate
+        self._server.random = random.Random(seed)
+        self._server.lock = threading.Lock()
+        self._server.n_requests = 0
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def n_requests(self) -> int:
+        """Number of requests handled so far."""
+        return self._server.n_requests
+
+    @property
+    def n_stations(self) -> int:
+        """Number of stations served."""
+        return len(self._server.stations)
+
+    def n_observations(
+        self, station_id=None, parameter_id=None, from_time=None, to_time=None
+    ) -> int:
+        """Number of observations served for a query."""
+        interval = "/".join(
+            ".." if time is None else time.isoformat() for time in (from_time, to_time)
+        )
+        stations, parameters, first, last = self._server.observations.query(
+            station_id=station_id, parameter_id=parameter_id, interval=interval
+        )
+        return (last - first) * len(stations) * len(parameters)
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _parse_interval(value: str):
+    def parse(part):
+        if part in ("", ".."):
+            return None
+        return datetime.fromisoformat(part.rstrip("Z"))
+
+    if "/" not in value:
+        time = parse(value)
+        return time, time + timedelta(microseconds=1)
+    start, end = value.split("/", 1)
+    return parse(start), parse(end)
@@ -2,15 +2,49 @@
 
 __version__ = "0.1.1"
 
-from dmi_open_data.client import DMIOpenDataClient
-from dmi_open_data.enums import Parameter, ClimateDataParameter
-from dmi_open_data.utils import microseconds2date, date2microseconds
-
-
-__all__ = [
-    "ClimateDataParameter",
-    "DMIOpenDataClient",
-    "Parameter",
-    "microseconds2date",
-    "date2microseconds",
-]
+import importlib
+
+# Public names are imported from their modules on first access (PEP 562), so
+# `import dmi_open_data` does not pay for requests, NumPy or pyarrow up front.
+_LAZY_ATTRIBUTES = {
+    "AsyncDMIOpenDataClient": "dmi_open_data.async_client",
+    "CircuitBreaker": "dmi_open_data.retry",
+    "CircuitOpenError": "dmi_open_data.exceptions",
+    "ClimateDataParameter": "dmi_open_data.enums",
+    "ClimateValue": "dmi_open_data.records",
+    "DMIOpenDataClient": "dmi_open_data.client",
+    "HTTPError": "dmi_open_data.exceptions",
+    "Interpolator": "dmi_open_data.interpolation",
+    "Observation": "dmi_open_data.records",
+    "Observer": "dmi_open_data.instrumentation",
+    "OpenTelemetryObserver": "dmi_open_data.instrumentation",
+    "Parameter": "dmi_open_data.enums",
+    "ParquetStore": "dmi_open_data.sync",
+    "PrometheusObserver": "dmi_open_data.instrumentation",
+    "ResponseCache": "dmi_open_data.cache",
+    "RetryPolicy": "dmi_open_data.retry",
+    "Station": "dmi_open_data.records",
+    "StationCatalog": "dmi_open_data.metadata",
+    "StationIndex": "dmi_open_data.station_index",
+    "StationSnapshot": "dmi_open_data.metadata",
+    "StatsObserver": "dmi_open_data.instrumentation",
+    "TokenBucket": "dmi_open_data.retry",
+    "microseconds2date": "dmi_open_data.utils",
+    "date2microseconds": "dmi_open_data.utils",
+}
+
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+import sys
+
+from dmi_open_data.cli import main
+
+sys.exit(main())
@@ -0,0 +1,262 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+from dmi_open_data.enums import Parameter, ClimateDataParameter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+AGGREGATIONS = ("mean", "min", "max", "sum", "first", "last", "count")
+
+# Observation parameter and aggregation approximating daily climate data values.
+# DMI computes climate data from quality controlled observations, so locally
+# computed values can differ slightly.
+CLIMATE_DATA_AGGREGATES: Dict[ClimateDataParameter, Tuple[Parameter, str]] = {
+    ClimateDataParameter.MeanTemp: (Parameter.TempDry, "mean"),
+    ClimateDataParameter.MaxTempWDate: (Parameter.TempMaxPast1h, "max"),
+    ClimateDataParameter.MinTemp: (Parameter.TempMinPast1h, "min"),
+    ClimateDataParameter.TempGrass: (Parameter.TempGrass, "mean"),
+    ClimateDataParameter.MeanRelativeHum: (Parameter.Humidity, "mean"),
+    ClimateDataParameter.MaxRelativeHum: (Parameter.Humidity, "max"),
+    ClimateDataParameter.MinRelativeHum: (Parameter.Humidity, "min"),
+    ClimateDataParameter.MeanWindSpeed: (Parameter.WindSpeed, "mean"),
+    ClimateDataParameter.MaxWindSpeed_10min: (Parameter.WindMax, "max"),
+    ClimateDataParameter.MaxWindSpeed_3sec: (Parameter.WindGustAlwaysPast1h, "max"),
+    ClimateDataParameter.MeanPressure: (Parameter.Pressure, "mean"),
+    ClimateDataParameter.MaxPressure: (Parameter.Pressure, "max"),
+    ClimateDataParameter.MinPressure: (Parameter.Pressure, "min"),
+    ClimateDataParameter.AccPrecip: (Parameter.PrecipPast1h, "sum"),
+    ClimateDataParameter.BrightSunshine: (Parameter.SunLast1hGlob, "sum"),
+    ClimateDataParameter.MeanCloudCover: (Parameter.CloudCover, "mean"),
+}
+
+# Unit conversions of the aggregated observations, eg. sunshine is observed in
+# minutes per hour but reported in hours per day.
+CLIMATE_DATA_SCALES: Dict[ClimateDataParameter, float] = {
+    ClimateDataParameter.BrightSunshine: 1 / 60,
+}
+
+
+def resample(
+    columns: Dict[str, "np.ndarray"],
+    freq: str = "h",
+    how: str = "mean",
+    time_column: str = "observed",
+) -> Dict[str, "np.ndarray"]:
+    """Resample columnar observations per station and parameter.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Columns as returned by
+            `DMIOpenDataClient.get_observations_table`.
+        freq (str, optional): NumPy datetime unit of the buckets, optionally with
+            a multiplier, eg. "10m", "h", "D", "M". Defaults to "h".
+        how (str, optional): Aggregation, one of "mean", "min", "max", "sum",
+            "first", "last" and "count". Defaults to "mean".
+        time_column (str, optional): Column with timestamps. Defaults to "observed".
+
+    Returns:
+        Dict[str, np.ndarray]: Columns `time_column` (start of bucket), `value`,
+            `count`, `stationId` and `parameterId` (codes into the passed through
+            `*_categories`), ordered by station, parameter and time.
+    """
+    if np is None:
+        raise ImportError(
+            "NumPy is required for aggregation: pip install dmi-open-data[numpy]"
+        )
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unsupported aggregation: {how}")
+
+    times = columns[time_column]
+    values = columns["value"]
+    valid = ~np.isnan(values) & ~np.isnat(times)
+    times, values = times[valid], values[valid]
+    stations, parameters = columns["stationId"][valid], columns["parameterId"][valid]
+    buckets = times.astype(f"datetime64[{freq}]")
+
+    order = np.lexsort((times, buckets, parameters, stations))
+    times, values, buckets = times[order], values[order], buckets[order]
+    stations, parameters = stations[order], parameters[order]
+
+    n = len(values)
+    is_start = np.ones(n, dtype=bool)
+    is_start[1:] = (
+        (stations[1:] != stations[:-1])
+        | (parameters[1:] != parameters[:-1])
+        | (buckets[1:] != buckets[:-1])
+    )
+    starts = np.flatnonzero(is_start)
+    ends = np.append(starts[1:], n)
+    counts = ends - starts
+
+    if n == 0:
+        aggregated = np.array([], dtype=np.float64)
+    elif how == "mean":
+        aggregated = np.add.reduceat(values, starts) / counts
+    elif how == "sum":
+        aggregated = np.add.reduceat(values, starts)
+    elif how == "min":
+        aggregated = np.minimum.reduceat(values, starts)
+    elif how == "max":
+        aggregated = np.maximum.reduceat(values, starts)
+    elif how == "first":
+        aggregated = values[starts]
+    elif how == "last":
+        aggregated = values[ends - 1]
+    else:
+        aggregated = counts.astype(np.float64)
+
+    result = {
+        time_column: buckets[starts],
+        "value": aggregated,
+        "count": counts,
+        "stationId": stations[starts],
+        "parameterId": parameters[starts],
+    }
+    for name in ("stationId_categories", "parameterId_categories"):
+        if name in columns:
+            result[name] = columns[name]
+    return result
+
+
+def fill_gaps(values: "np.ndarray", method: str = "ffill") -> "np.ndarray":
+    """Fill NaN gaps along the first axis.
+
+    Args:
+        values (np.ndarray): 1D series or 2D matrix with time along the first axis.
+        method (str, optional): "ffill" to carry the last value forward, or
+            "linear" to interpolate linearly between values. Leading gaps stay NaN
+            with "ffill", and are filled with the first value with "linear".
+            Defaults to "ffill".
+
+    Returns:
+        np.ndarray: Copy of `values` with gaps filled.
+    """
+    if method not in ("ffill", "linear"):
+        raise ValueError(f"Unsupported fill method: {method}")
+    values = np.array(values, dtype=np.float64)
+    squeeze = values.ndim == 1
+    if squeeze:
+        values = values[:, np.newaxis]
+    rows = np.arange(values.shape[0])
+    missing = np.isnan(values)
+    if method == "ffill":
+        last_valid = np.where(missing, 0, rows[:, np.newaxis])
+        np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+        filled = np.take_along_axis(values, last_valid, axis=0)
+    else:
+        filled = values.copy()
+        for j in range(values.shape[1]):
+            known = ~missing[:, j]
+            if known.any():
+                filled[:, j] = np.interp(rows, rows[known], values[known, j])
+    return filled[:, 0] if squeeze else filled
+
+
+def align(
+    columns: Dict[str, "np.ndarray"],
+    freq: str = "h",
+    how: str = "mean",
+    fill: Optional[str] = None,
+    time_column: str = "observed",
+) -> Dict[str, "np.ndarray"]:
+    """Align observations of several stations and parameters on one time index.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Columns as returned by
+            `DMIOpenDataClient.get_observations_table`.
+        freq (str, optional): NumPy datetime unit of the time index, eg. "10m",
+            "h", "D". Defaults to "h".
+        how (str, optional): Aggregation within a time step, see `resample`.
+            Defaults to "mean".
+        fill (Optional[str], optional): Fill gaps with "ffill" or "linear",
+            see `fill_gaps`. Defaults to None (gaps are NaN).
+        time_column (str, optional): Column with timestamps. Defaults to "observed".
+
+    Returns:
+        Dict[str, np.ndarray]: `time` index, `stationId` and `parameterId`
+            labels of each series, and `values` matrix of shape
+            (len(time), number of series).
+    """
+    resampled = resample(columns, freq=freq, how=how, time_column=time_column)
+    buckets = resampled[time_column]
+    if len(buckets) == 0:
+        times = np.array([], dtype=f"datetime64[{freq}]")
+    else:
+        times = np.arange(buckets.min(), buckets.max() + 1)
+    series, series_index = np.unique(
+        np.stack([resampled["stationId"], resampled["parameterId"]], axis=1),
+        axis=0,
+        return_inverse=True,
+    )
+    values = np.full((len(times), len(series)), np.nan)
+    if len(buckets) > 0:
+        values[(buckets - times[0]).astype(np.int64), series_index.ravel()] = resampled[
+            "value"
+        ]
+    if fill is not None:
+        values = fill_gaps(values, method=fill)
+    return {
+        "time": times,
+        "stationId": _labels(resampled, "stationId", series[:, 0]),
+        "parameterId": _labels(resampled, "parameterId", series[:, 1]),
+        "values": values,
+    }
+
+
+def daily_aggregates(
+    columns: Dict[str, "np.ndarray"],
+    parameters: Optional[Sequence[ClimateDataParameter]] = None,
+) -> Dict[ClimateDataParameter, Dict[str, "np.ndarray"]]:
+    """Compute daily climate data values from observations locally.
+
+    Days are UTC days. Observations summarizing the preceding hour, eg.
+    `precip_past1h`, are stamped at the end of that hour and counted on the day
+    the hour belongs to. See `CLIMATE_DATA_AGGREGATES` for the supported
+    parameters, and `CLIMATE_DATA_SCALES` for unit conversions.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Columns as returned by
+            `DMIOpenDataClient.get_observations_table`.
+        parameters (Optional[Sequence[ClimateDataParameter]], optional): Climate data
+            parameters to compute. Defaults to None (all supported parameters
+            whose observations are present).
+
+    Returns:
+        Dict[ClimateDataParameter, Dict[str, np.ndarray]]: Daily values per
+            climate data parameter, see `resample`.
+    """
+    if parameters is None:
+        parameters = list(CLIMATE_DATA_AGGREGATES)
+    categories = list(columns["parameterId_categories"])
+    aggregates = {}
+    for parameter in parameters:
+        if parameter not in CLIMATE_DATA_AGGREGATES:
+            raise ValueError(f"Cannot compute {parameter} from observations")
+        source, how = CLIMATE_DATA_AGGREGATES[parameter]
+        if source.value not in categories:
+            continue
+        rows = columns["parameterId"] == categories.index(source.value)
+        selected = {
+            name: column[rows] if not name.endswith("_categories") else column
+            for name, column in columns.items()
+        }
+        if _covers_past_hour(source):
+            selected["observed"] = selected["observed"] - np.timedelta64(1, "h")
+        daily = resample(selected, freq="D", how=how)
+        if parameter in CLIMATE_DATA_SCALES:
+            daily["value"] = daily["value"] * CLIMATE_DATA_SCALES[parameter]
+        aggregates[parameter] = daily
+    return aggregates
+
+
+def _covers_past_hour(parameter: Parameter) -> bool:
+    return parameter.value.endswith("_past1h") or parameter is Parameter.SunLast1hGlob
+
+
+def _labels(
+    columns: Dict[str, "np.ndarray"], name: str, codes: "np.ndarray"
+) -> "np.ndarray":
+    categories = columns.get(f"{name}_categories")
+    return codes if categories is None else categories[codes]
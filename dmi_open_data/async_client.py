@@ -0,0 +1,308 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    List,
+    Dict,
+    Optional,
+    Any,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from dmi_open_data.cache import cache_key
+from dmi_open_data.client import DMIOpenDataClient, _construct_datetime_argument
+from dmi_open_data.enums import Parameter, ClimateDataParameter
+from dmi_open_data.instrumentation import Observer
+from dmi_open_data.metadata import StationSnapshot
+from dmi_open_data.retry import CircuitBreaker, RetryPolicy, TokenBucket
+from dmi_open_data.singleflight import AsyncSingleFlight
+from dmi_open_data.watch import ObservationWatcher, plan_watch
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
+
+
+class AsyncDMIOpenDataClient:
+    """Asyncio variant of `DMIOpenDataClient`.
+
+    Requests are sent through a single pooled session shared by all coroutines.
+    At most `max_concurrency` requests are in flight at a time, and rate limiting
+    and retry backoff use `asyncio.sleep` so they never block the event loop.
+    Retrying queries back off without holding one of the `max_concurrency` slots.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        version: str = "v2",
+        max_concurrency: int = 10,
+        session: Optional["requests.Session"] = None,
+        station_index_ttl: float = 3600,
+        station_snapshot: Optional[StationSnapshot] = None,
+        timeout: Optional[Union[float, Tuple[float, float]]] = (3.05, 30),
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce: bool = False,
+        observers: Optional[Sequence[Observer]] = None,
+    ):
+        """Initialize asynchronous DMI Open Data client.
+
+        Args:
+            api_key (str): DMI Open Data API key.
+            version (str, optional): API version. Defaults to "v2".
+            max_concurrency (int, optional): Maximum number of requests in flight
+                at the same time. Also used as connection pool size. Defaults to 10.
+            session (Optional[requests.Session], optional): Use an existing session
+                instead of creating a pooled one. Defaults to None.
+            station_index_ttl (float, optional): Number of seconds before the stations
+                used by `get_closest_station` are revalidated. Defaults to 3600.
+            station_snapshot (Optional[StationSnapshot], optional): Local snapshot of
+                the stations, see `DMIOpenDataClient`. Defaults to None (not persisted).
+            timeout (Optional[Union[float, Tuple[float, float]]], optional): Request timeout
+                in seconds, or a (connect, read) tuple. Defaults to (3.05, 30).
+            retry_policy (Optional[RetryPolicy], optional): Retry policy for transient
+                failures. Defaults to None (`RetryPolicy()`).
+            rate_limiter (Optional[TokenBucket], optional): Rate limiter, which can be shared
+                with other clients. Defaults to None (no rate limit).
+            circuit_breaker (Optional[CircuitBreaker], optional): Circuit breaker around
+                all requests of the client. Defaults to None (`CircuitBreaker()`).
+            coalesce (bool, optional): Share a single request between concurrent
+                identical queries. The number of coalesced queries is counted in
+                `single_flight.coalesced`. Defaults to False.
+            observers (Optional[Sequence[Observer]], optional): Instrumentation hooks
+                receiving request timings and retries. Defaults to None
+                (no instrumentation).
+        """
+        if max_concurrency < 1:
+            raise ValueError(
+                f"Invalid value for `max_concurrency`: {max_concurrency}"
+            )
+        self._client = DMIOpenDataClient(
+            api_key=api_key,
+            version=version,
+            pool_maxsize=max_concurrency,
+            pool_block=True,
+            session=session,
+            station_index_ttl=station_index_ttl,
+            station_snapshot=station_snapshot,
+            timeout=timeout,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker,
+            observers=observers,
+        )
+        self.max_concurrency = max_concurrency
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._semaphore = None
+
+    async def __aenter__(self) -> "AsyncDMIOpenDataClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections and worker threads held by the client."""
+        self._executor.shutdown(wait=False)
+        self._client.close()
+
+    async def _query(self, api: str, service: str, params: Dict[str, Any], **kwargs):
+        if self.single_flight is None:
+            return await self._send(api=api, service=service, params=params, **kwargs)
+        return await self.single_flight.do(
+            cache_key(api=api, service=service, params=params),
+            self._send,
+            api=api,
+            service=service,
+            params=params,
+            **kwargs,
+        )
+
+    async def _send(self, api: str, service: str, params: Dict[str, Any], **kwargs):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        url = f"{self._client.base_url(api=api)}/{service}"
+        send = partial(self._client._send, url=url, params=params, **kwargs)
+        retry_policy = self._client.retry_policy
+        circuit_breaker = self._client.circuit_breaker
+        rate_limiter = self._client.rate_limiter
+        attempt = 1
+        while True:
+            circuit_breaker.before_call()
+            if rate_limiter is not None:
+                await rate_limiter.acquire_async()
+            try:
+                async with self._semaphore:
+                    res = await loop.run_in_executor(self._executor, send)
+            except Exception as exc:
+                if not retry_policy.is_retryable(exc):
+                    circuit_breaker.record_success()
+                    raise
+                circuit_breaker.record_failure()
+                if attempt >= retry_policy.max_attempts:
+                    raise
+                delay = retry_policy.delay(attempt=attempt, exc=exc)
+                if self._client.observers:
+                    self._client._notify("on_retry", url, attempt, delay, exc)
+                # Back off without holding a request slot, so other queries
+                # can use it meanwhile
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            circuit_breaker.record_success()
+            return res
+
+    async def get_stations(
+        self, limit: Optional[int] = 10000, offset: Optional[int] = 0
+    ) -> List[Dict[str, Any]]:
+        """Get DMI stations.
+
+        See `DMIOpenDataClient.get_stations`.
+        """
+        if limit == 10000 and offset == 0:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, self._client.get_stations
+            )
+        res = await self._query(
+            api="metObs",
+            service="collections/station/items",
+            params={
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        return res.get("features", [])
+
+    async def get_observations(
+        self,
+        parameter: Optional[Parameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        limit: Optional[int] = 10000,
+        offset: Optional[int] = 0,
+    ) -> List[Dict[str, Any]]:
+        """Get raw DMI observation.
+
+        See `DMIOpenDataClient.get_observations`.
+        """
+        res = await self._query(
+            api="metObs",
+            service="collections/observation/items",
+            params={
+                "parameterId": None if parameter is None else parameter.value,
+                "stationId": station_id,
+                "datetime": _construct_datetime_argument(
+                    from_time=from_time, to_time=to_time
+                ),
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        return res.get("features", [])
+
+    async def get_climate_data(
+        self,
+        parameter: Optional[ClimateDataParameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        time_resolution: Optional[str] = None,
+        limit: Optional[int] = 10000,
+        offset: Optional[int] = 0,
+    ) -> List[Dict[str, Any]]:
+        """Get raw DMI climate data.
+
+        See `DMIOpenDataClient.get_climate_data`.
+        """
+        res = await self._query(
+            api="climateData",
+            service="collections/stationValue/items",
+            params={
+                "parameterId": None if parameter is None else parameter.value,
+                "stationId": station_id,
+                "datetime": _construct_datetime_argument(
+                    from_time=from_time, to_time=to_time
+                ),
+                "timeResolution": time_resolution,
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        return res.get("features", [])
+
+    async def get_closest_station(
+        self, latitude: float, longitude: float
+    ) -> Dict[str, Any]:
+        """Get closest weather station from given coordinates.
+
+        See `DMIOpenDataClient.get_closest_station`. The station index is
+        shared with the underlying synchronous client, so stations are only
+        downloaded or revalidated after `station_index_ttl`.
+        """
+        loop = asyncio.get_running_loop()
+        index = await loop.run_in_executor(
+            self._executor, self._client.get_station_index
+        )
+        closest = index.nearest(latitude=latitude, longitude=longitude, k=1)
+        if len(closest) == 0:
+            return None
+        station, _ = closest[0]
+        return station
+
+    async def watch_observations(
+        self,
+        parameters: Optional[Sequence[Parameter]] = None,
+        station_ids: Optional[Sequence[str]] = None,
+        interval: float = 60,
+        lookback: timedelta = timedelta(hours=1),
+        max_seen: int = 100000,
+        page_size: int = 10000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Poll for new raw DMI observations forever.
+
+        See `DMIOpenDataClient.watch_observations`. The queries of a poll run
+        concurrently.
+        """
+        watcher = ObservationWatcher(lookback=lookback, max_seen=max_seen)
+        queries = plan_watch(station_ids=station_ids, parameters=parameters)
+
+        async def fetch(query, from_time, to_time):
+            features, offset = [], 0
+            while True:
+                page = await self.get_observations(
+                    parameter=query.parameter,
+                    station_id=query.station_id,
+                    from_time=from_time,
+                    to_time=to_time,
+                    limit=page_size,
+                    offset=offset,
+                )
+                features.extend(page)
+                if len(page) < page_size:
+                    return features
+                offset += len(page)
+
+        while True:
+            started_at = time.monotonic()
+            now = datetime.utcnow()
+            pages = await asyncio.gather(
+                *[
+                    fetch(query, watcher.window_start(query=query, now=now), now)
+                    for query in queries
+                ]
+            )
+            for features in pages:
+                for feature in watcher.accept(features):
+                    yield feature
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started_at)))
@@ -0,0 +1,287 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from dmi_open_data.enums import Parameter, ClimateDataParameter
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pq = None
+
+
+FORMATS = ("ndjson", "parquet")
+
+
+class WorkUnit(NamedTuple):
+    api: str
+    parameter: str
+    station_id: Optional[str]
+    from_time: datetime
+    to_time: datetime
+    time_resolution: Optional[str] = None
+    fmt: str = "ndjson"
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, used in the checkpoint file and as file path."""
+        resolution = f"{self.time_resolution}/" if self.time_resolution else ""
+        return (
+            f"{self.api}/{self.parameter}/{resolution}{self.station_id or 'all'}/"
+            f"{self.from_time:%Y%m%dT%H%M%S}-{self.to_time:%Y%m%dT%H%M%S}.{self.fmt}"
+        )
+
+
+class Progress(NamedTuple):
+    done: int
+    total: int
+    failed: int
+    rows: int
+    bytes: int
+    elapsed: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def plan_units(
+    api: str,
+    parameters: Sequence[str],
+    from_time: datetime,
+    to_time: datetime,
+    chunk: timedelta = timedelta(days=30),
+    station_ids: Optional[Sequence[str]] = None,
+    time_resolution: Optional[str] = None,
+    fmt: str = "ndjson",
+) -> List[WorkUnit]:
+    """Split a backfill job into parameter x station x time window work units.
+
+    Windows start at `from_time` and are `chunk` long, so the same arguments
+    always produce the same units and a resumed job skips completed ones.
+
+    Args:
+        api (str): "metObs" or "climateData".
+        parameters (Sequence[str]): Parameter ids.
+        from_time (datetime): Start of the job (inclusive).
+        to_time (datetime): End of the job (exclusive).
+        chunk (timedelta, optional): Length of the time windows. Defaults to 30 days.
+        station_ids (Optional[Sequence[str]], optional): Stations, one unit each.
+            Defaults to None (all stations in every unit).
+        time_resolution (Optional[str], optional): Time resolution of climate data,
+            eg. "day". Defaults to None.
+        fmt (str, optional): Output format, "ndjson" or "parquet". Defaults to "ndjson".
+
+    Returns:
+        List[WorkUnit]: Planned work units.
+    """
+    if api not in ("metObs", "climateData"):
+        raise ValueError(f"Unsupported api: {api}")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    if to_time <= from_time:
+        raise ValueError(
+            f"`to_time` ({to_time}) must be after `from_time` ({from_time})"
+        )
+    if chunk <= timedelta(0):
+        raise ValueError(f"Invalid chunk length: {chunk}")
+    windows = []
+    start = from_time
+    while start < to_time:
+        windows.append((start, min(start + chunk, to_time)))
+        start += chunk
+    return [
+        WorkUnit(
+            api=api,
+            parameter=parameter,
+            station_id=station_id,
+            from_time=start,
+            to_time=end,
+            time_resolution=time_resolution,
+            fmt=fmt,
+        )
+        for parameter in parameters
+        for station_id in (station_ids or [None])
+        for start, end in windows
+    ]
+
+
+class Checkpoint:
+    """Append-only file of the keys of completed work units."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done = set()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self._done = {line.strip() for line in f if line.strip()}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def add(self, key: str) -> None:
+        with open(self.path, "a") as f:
+            f.write(f"{key}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._done.add(key)
+
+
+def unit_path(output_dir: str, unit: WorkUnit) -> str:
+    """Path of the file with the results of a work unit."""
+    return os.path.join(output_dir, unit.key)
+
+
+def run_unit(client, unit: WorkUnit, output_dir: str):
+    """Fetch a work unit and write it to disk in the unit's format.
+
+    Results are written to a temporary file that is renamed when complete, so
+    an interrupted unit leaves no partial output behind.
+
+    Args:
+        client (DMIOpenDataClient): Client used to fetch data.
+        unit (WorkUnit): Work unit.
+        output_dir (str): Output directory.
+
+    Returns:
+        Tuple[int, int]: Number of rows and bytes written.
+    """
+    if unit.fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {unit.fmt}")
+    path = unit_path(output_dir=output_dir, unit=unit)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    query = dict(
+        parameter=(Parameter if unit.api == "metObs" else ClimateDataParameter)(
+            unit.parameter
+        ),
+        station_id=unit.station_id,
+        from_time=unit.from_time,
+        to_time=unit.to_time,
+    )
+    if unit.time_resolution is not None:
+        query["time_resolution"] = unit.time_resolution
+    if unit.fmt == "ndjson":
+        n_rows = 0
+        with open(tmp_path, "w") as f:
+            for feature in _iter_features(client, unit.api, query):
+                f.write(json.dumps(feature, separators=(",", ":")))
+                f.write("\n")
+                n_rows += 1
+    else:
+        if pq is None:
+            raise ImportError(
+                "pyarrow is required for Parquet output: pip install dmi-open-data[arrow]"
+            )
+        if unit.api == "metObs":
+            table = client.get_observations_table(backend="arrow", **query)
+        else:
+            table = client.get_climate_data_table(backend="arrow", **query)
+        pq.write_table(table, tmp_path)
+        n_rows = table.num_rows
+    os.replace(tmp_path, path)
+    return n_rows, os.path.getsize(path)
+
+
+def run_backfill(
+    api_key: str,
+    units: Sequence[WorkUnit],
+    output_dir: str,
+    workers: int = 4,
+    checkpoint_path: Optional[str] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+    on_error: Optional[Callable[[WorkUnit, BaseException], None]] = None,
+) -> Progress:
+    """Run work units on a process pool, skipping units completed before.
+
+    Every worker process holds its own pooled `DMIOpenDataClient`. Completed
+    units are recorded in the checkpoint file as they finish, so after a crash
+    the same job can simply be started again. Failed units are not recorded
+    and are retried by the next run. Units are keyed by their time resolution
+    and format too, so a run with other settings does not skip them.
+
+    Args:
+        api_key (str): DMI Open Data API key.
+        units (Sequence[WorkUnit]): Work units, see `plan_units`.
+        output_dir (str): Output directory.
+        workers (int, optional): Number of worker processes. Defaults to 4.
+        checkpoint_path (Optional[str], optional): Checkpoint file.
+            Defaults to None (`<output_dir>/_checkpoint`).
+        progress (Optional[Callable[[Progress], None]], optional): Called after
+            every finished unit. Defaults to None.
+        on_error (Optional[Callable[[WorkUnit, BaseException], None]], optional):
+            Called with every failed unit and its exception. Defaults to None.
+
+    Returns:
+        Progress: Final progress of the run.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = Checkpoint(checkpoint_path or os.path.join(output_dir, "_checkpoint"))
+    pending = [unit for unit in units if unit.key not in checkpoint]
+    done, failed, rows, n_bytes = len(units) - len(pending), 0, 0, 0
+    started_at = time.monotonic()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(api_key,)
+    ) as pool:
+        futures = {
+            pool.submit(_run_unit_in_worker, unit, output_dir): unit
+            for unit in pending
+        }
+        for future in as_completed(futures):
+            unit = futures[future]
+            try:
+                n_rows, size = future.result()
+            except Exception as exc:
+                failed += 1
+                if on_error is not None:
+                    on_error(unit, exc)
+            else:
+                checkpoint.add(unit.key)
+                done += 1
+                rows += n_rows
+                n_bytes += size
+            if progress is not None:
+                progress(
+                    Progress(
+                        done=done,
+                        total=len(units),
+                        failed=failed,
+                        rows=rows,
+                        bytes=n_bytes,
+                        elapsed=time.monotonic() - started_at,
+                    )
+                )
+    return Progress(
+        done=done,
+        total=len(units),
+        failed=failed,
+        rows=rows,
+        bytes=n_bytes,
+        elapsed=time.monotonic() - started_at,
+    )
+
+
+_worker_client = None
+
+
+def _init_worker(api_key: str) -> None:
+    global _worker_client
+    from dmi_open_data.client import DMIOpenDataClient
+
+    _worker_client = DMIOpenDataClient(api_key=api_key)
+
+
+def _run_unit_in_worker(unit: WorkUnit, output_dir: str):
+    return run_unit(_worker_client, unit, output_dir=output_dir)
+
+
+def _iter_features(client, api: str, query: Dict[str, Any]) -> Iterator[Dict]:
+    if api == "metObs":
+        return client.iter_observations(stream=True, **query)
+    return client.iter_climate_data(stream=True, **query)
@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class BatchQuery(NamedTuple):
+    station_id: Optional[str] = None
+    parameter: Optional[Any] = None
+
+
+def plan_batch(
+    station_ids: Sequence[str],
+    parameters: Sequence[Any],
+    total_parameters: int,
+    total_stations: Optional[int] = None,
+    max_overfetch: float = 2.0,
+) -> List[BatchQuery]:
+    """Plan the fewest upstream queries covering all (station, parameter) pairs.
+
+    Besides one query per pair, all parameters of a station, or all stations
+    of a parameter, can be fetched in one query and filtered locally. Those
+    plans are only used while they fetch at most `max_overfetch` times the
+    data actually requested.
+
+    Args:
+        station_ids (Sequence[str]): Requested stations.
+        parameters (Sequence[Any]): Requested parameters.
+        total_parameters (int): Number of parameters the API offers.
+        total_stations (Optional[int], optional): Number of stations the API offers.
+            Defaults to None (never query all stations).
+        max_overfetch (float, optional): Maximum ratio of fetched to requested data.
+            Defaults to 2.0.
+
+    Returns:
+        List[BatchQuery]: Queries to send.
+    """
+    station_ids, parameters = list(station_ids), list(parameters)
+    plans = [
+        (
+            len(station_ids) * len(parameters),
+            [
+                BatchQuery(station_id=station_id, parameter=parameter)
+                for station_id in station_ids
+                for parameter in parameters
+            ],
+        )
+    ]
+    if total_parameters <= max_overfetch * len(parameters):
+        plans.append(
+            (
+                len(station_ids),
+                [BatchQuery(station_id=station_id) for station_id in station_ids],
+            )
+        )
+    if total_stations is not None and total_stations <= max_overfetch * len(
+        station_ids
+    ):
+        plans.append(
+            (
+                len(parameters),
+                [BatchQuery(parameter=parameter) for parameter in parameters],
+            )
+        )
+    _, queries = min(plans, key=lambda plan: plan[0])
+    return queries
+
+
+def fetch_batch(
+    fetch: Callable[[BatchQuery], List[Dict[str, Any]]],
+    queries: Sequence[BatchQuery],
+    station_ids: Sequence[str],
+    parameters: Sequence[Any],
+    max_workers: int = 8,
+) -> Dict[Tuple[str, Any], List[Dict[str, Any]]]:
+    """Run queries concurrently and group the features by (station, parameter).
+
+    Features of stations or parameters that were not requested are dropped.
+
+    Args:
+        fetch (Callable[[BatchQuery], List[Dict[str, Any]]]): Fetches all features of a query.
+        queries (Sequence[BatchQuery]): Queries to run.
+        station_ids (Sequence[str]): Requested stations.
+        parameters (Sequence[Any]): Requested parameters.
+        max_workers (int, optional): Number of concurrent queries. Defaults to 8.
+
+    Returns:
+        Dict[Tuple[str, Any], List[Dict[str, Any]]]: Features per requested
+            (station, parameter) pair.
+    """
+    parameters_by_id = {parameter.value: parameter for parameter in parameters}
+    grouped = {
+        (station_id, parameter): []
+        for station_id in station_ids
+        for parameter in parameters
+    }
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for features in executor.map(fetch, queries):
+            for feature in features:
+                properties = feature.get("properties", {})
+                parameter = parameters_by_id.get(properties.get("parameterId"))
+                key = (properties.get("stationId"), parameter)
+                if key in grouped:
+                    grouped[key].append(feature)
+    return grouped
@@ -0,0 +1,201 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+
+# Default time-to-live in seconds per service. Queries for a closed time range
+# that ended more than `settle_time` ago are not expected to change anymore,
+# and are cached without expiry.
+DEFAULT_TTL = {
+    "collections/station/items": 24 * 60 * 60,
+    "collections/observation/items": 60,
+    "collections/stationValue/items": 60 * 60,
+}
+
+
+class ResponseCache:
+    """Persistent SQLite cache of API responses with TTL and LRU eviction.
+
+    Usage::
+
+        cache = ResponseCache(path="dmi-cache.sqlite", max_size=512 * 1024 ** 2)
+        client = DMIOpenDataClient(api_key=..., cache=cache)
+        ...
+        print(cache.hits, cache.misses)
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_size: int = 256 * 1024 ** 2,
+        ttl: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60,
+        settle_time: float = 6 * 60 * 60,
+    ):
+        """Initialize response cache.
+
+        Args:
+            path (str, optional): Path of the SQLite database file.
+                Defaults to ":memory:" (not persisted).
+            max_size (int, optional): Maximum total size in bytes of cached
+                responses. Least recently used entries are evicted first.
+                Defaults to 256 MiB.
+            ttl (Optional[Dict[str, float]], optional): Time-to-live in seconds
+                per service, eg. {"collections/observation/items": 60}.
+                Merged with `DEFAULT_TTL`. Defaults to None.
+            default_ttl (float, optional): Time-to-live in seconds of services
+                not found in `ttl`. Defaults to 60.
+            settle_time (float, optional): Seconds after the end of a queried time
+                range before its response is cached without expiry, leaving time
+                for late and quality-controlled observations. Defaults to 6 hours.
+        """
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self.max_size = max_size
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.default_ttl = default_ttl
+        self.settle_time = settle_time
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)"
+        )
+        self._connection.commit()
+        # Running total of the size column, so storing a response needs no scan
+        self._size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    def get(
+        self, api: str, service: str, params: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Get cached response, or None if missing or expired."""
+        key = cache_key(api=api, service=service, params=params)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(
+        self, api: str, service: str, params: Dict[str, Any], response: Dict[str, Any]
+    ) -> None:
+        """Store response and evict least recently used entries above `max_size`."""
+        key = cache_key(api=api, service=service, params=params)
+        body = json.dumps(response)
+        now = time.time()
+        ttl = self.ttl_for(service=service, params=params)
+        expires_at = None if ttl is None else now + ttl
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body), expires_at, now),
+            )
+            self._size += len(body) - (0 if row is None else row[0])
+            if self._size > self.max_size:
+                self._evict(now=now)
+            self._connection.commit()
+
+    def ttl_for(self, service: str, params: Dict[str, Any]) -> Optional[float]:
+        """Time-to-live in seconds of a query, or None if it never expires."""
+        if _is_closed_past_range(
+            params.get("datetime"), settle_time=timedelta(seconds=self.settle_time)
+        ):
+            return None
+        return self.ttl.get(service, self.default_ttl)
+
+    def size(self) -> int:
+        """Total size in bytes of cached responses."""
+        with self._lock:
+            return self._size
+
+    def clear(self) -> None:
+        """Remove all cached responses and reset counters."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._connection.close()
+
+    def _evict(self, now: float) -> None:
+        # Expired entries go first, then least recently used ones
+        queries = [
+            (
+                "SELECT key, size FROM responses "
+                "WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            ),
+            ("SELECT key, size FROM responses ORDER BY accessed_at", ()),
+        ]
+        for query, args in queries:
+            evicted = []
+            for key, size in self._connection.execute(query, args):
+                if self._size <= self.max_size:
+                    break
+                evicted.append((key,))
+                self._size -= size
+            self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            if self._size <= self.max_size:
+                return
+
+
+def cache_key(api: str, service: str, params: Dict[str, Any]) -> str:
+    """Normalized cache key of a query. The API key and unset parameters are ignored."""
+    normalized = sorted(
+        (key, str(value))
+        for key, value in params.items()
+        if key != "api-key" and value is not None
+    )
+    return json.dumps([api, service, normalized])
+
+
+def _is_closed_past_range(value: Optional[str], settle_time: timedelta) -> bool:
+    if value is None or "/" not in value:
+        return False
+    end = value.split("/")[-1]
+    if end in ("", ".."):
+        return False
+    try:
+        end_time = datetime.fromisoformat(end.rstrip("Z"))
+    except ValueError:
+        return False
+    if end_time.tzinfo is not None:
+        end_time = end_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return end_time < datetime.utcnow() - settle_time
@@ -0,0 +1,112 @@
+"""Command line interface of dmi-open-data.
+
+Usage::
+
+    $ dmi-open-data backfill --parameter temp_dry --station 06180 \\
+        --from 2011-01-01 --to 2021-01-01 --output dmi-backfill
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from dmi_open_data.backfill import FORMATS, Progress, plan_units, run_backfill
+from dmi_open_data.enums import Parameter, ClimateDataParameter
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="dmi-open-data")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    backfill = commands.add_parser(
+        "backfill",
+        help="Download historical data in parallel, resuming from a checkpoint",
+    )
+    backfill.add_argument(
+        "--api-key",
+        default=os.getenv("DMI_API_KEY"),
+        help="DMI Open Data API key. Defaults to $DMI_API_KEY",
+    )
+    backfill.add_argument("--api", choices=("metObs", "climateData"), default="metObs")
+    backfill.add_argument(
+        "--parameter",
+        dest="parameters",
+        action="append",
+        required=True,
+        help="Parameter id, can be repeated",
+    )
+    backfill.add_argument(
+        "--station",
+        dest="station_ids",
+        action="append",
+        help="Station id, can be repeated. Defaults to all stations",
+    )
+    backfill.add_argument("--from", dest="from_time", type=_parse_date, required=True)
+    backfill.add_argument("--to", dest="to_time", type=_parse_date, required=True)
+    backfill.add_argument(
+        "--chunk-days", type=float, default=30, help="Days per work unit"
+    )
+    backfill.add_argument(
+        "--time-resolution", help="Time resolution of climate data, eg. day"
+    )
+    backfill.add_argument("--output", required=True, help="Output directory")
+    backfill.add_argument("--format", choices=FORMATS, default="ndjson")
+    backfill.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    backfill.add_argument(
+        "--checkpoint", help="Checkpoint file. Defaults to <output>/_checkpoint"
+    )
+
+    args = parser.parse_args(argv)
+    if args.api_key is None:
+        parser.error("--api-key or $DMI_API_KEY is required")
+    enum = Parameter if args.api == "metObs" else ClimateDataParameter
+    for parameter in args.parameters:
+        try:
+            enum(parameter)
+        except ValueError:
+            parser.error(f"Unknown {args.api} parameter: {parameter}")
+
+    units = plan_units(
+        api=args.api,
+        parameters=args.parameters,
+        station_ids=args.station_ids,
+        from_time=args.from_time,
+        to_time=args.to_time,
+        chunk=timedelta(days=args.chunk_days),
+        time_resolution=args.time_resolution,
+        fmt=args.format,
+    )
+    result = run_backfill(
+        api_key=args.api_key,
+        units=units,
+        output_dir=args.output,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        progress=_print_progress,
+        on_error=lambda unit, exc: print(f"Failed {unit.key}: {exc}", file=sys.stderr),
+    )
+    print(f"Finished in {result.elapsed:.1f} s", file=sys.stderr)
+    return 1 if result.failed > 0 else 0
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid date: {value}")
+
+
+def _print_progress(progress: Progress) -> None:
+    print(
+        f"[{progress.done}/{progress.total}] {progress.failed} failed, "
+        f"{progress.rows} rows, {progress.bytes / 1024 ** 2:.1f} MiB, "
+        f"{progress.rows_per_second:.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
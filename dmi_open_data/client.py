@@ -1,17 +1,103 @@
-from datetime import datetime
-from typing import List, Dict, Optional, Any, Union
-
-import requests
-from tenacity import retry, stop_after_attempt, wait_random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterator,
+    List,
+    Dict,
+    Optional,
+    Any,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import parse_qsl
 
+from dmi_open_data.batch import BatchQuery, plan_batch, fetch_batch
+from dmi_open_data.cache import ResponseCache, cache_key
+from dmi_open_data.decoding import loads, iter_features
 from dmi_open_data.enums import Parameter, ClimateDataParameter
-from dmi_open_data.utils import distance
+from dmi_open_data.exceptions import HTTPError
+from dmi_open_data.instrumentation import Observer, RequestEvent
+from dmi_open_data.metadata import StationCatalog, StationSnapshot
+from dmi_open_data.records import (
+    ClimateValue,
+    Observation,
+    Station,
+    parse_climate_data,
+    parse_observations,
+    parse_stations,
+)
+from dmi_open_data.retry import CircuitBreaker, RetryPolicy, TokenBucket
+from dmi_open_data.singleflight import SingleFlight
+from dmi_open_data.station_index import StationIndex
+from dmi_open_data.watch import ObservationWatcher, plan_watch
+from dmi_open_data.sharding import Shard, plan_shards, fetch_shards
+
+if TYPE_CHECKING:  # pragma: no cover
+    import requests
 
 
 class DMIOpenDataClient:
     _base_url = "https://dmigw.govcloud.dk/{version}/{api}"
 
-    def __init__(self, api_key: str, version: str = "v2"):
+    def __init__(
+        self,
+        api_key: str,
+        version: str = "v2",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        session: Optional["requests.Session"] = None,
+        cache: Optional[ResponseCache] = None,
+        station_index_ttl: float = 3600,
+        station_snapshot: Optional[StationSnapshot] = None,
+        timeout: Optional[Union[float, Tuple[float, float]]] = (3.05, 30),
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        coalesce: bool = False,
+        observers: Optional[Sequence[Observer]] = None,
+    ):
+        """Initialize DMI Open Data client.
+
+        Args:
+            api_key (str): DMI Open Data API key.
+            version (str, optional): API version. Defaults to "v2".
+            pool_connections (int, optional): Number of per-host connection pools
+                to keep. Defaults to 10.
+            pool_maxsize (int, optional): Maximum number of keep-alive connections
+                per host. Defaults to 10.
+            pool_block (bool, optional): Block when all connections to a host are in use
+                instead of opening extra throwaway connections. Defaults to False.
+            session (Optional[requests.Session], optional): Use an existing session
+                instead of creating a pooled one. The client will not close a session
+                it did not create. Defaults to None.
+            cache (Optional[ResponseCache], optional): Cache responses of queries.
+                Defaults to None (no caching).
+            station_index_ttl (float, optional): Number of seconds before the stations
+                used by `get_station` and `get_closest_station` are revalidated.
+                Defaults to 3600.
+            station_snapshot (Optional[StationSnapshot], optional): Local snapshot of
+                the stations used instead of downloading them, as long as it is
+                younger than `station_index_ttl`. Defaults to None (not persisted).
+            timeout (Optional[Union[float, Tuple[float, float]]], optional): Request timeout
+                in seconds, or a (connect, read) tuple. Defaults to (3.05, 30).
+            retry_policy (Optional[RetryPolicy], optional): Retry policy for transient
+                failures. Defaults to None (`RetryPolicy()`).
+            rate_limiter (Optional[TokenBucket], optional): Rate limiter, which can be shared
+                between clients. Defaults to None (no rate limit).
+            circuit_breaker (Optional[CircuitBreaker], optional): Circuit breaker around
+                all requests of the client. Defaults to None (`CircuitBreaker()`).
+            coalesce (bool, optional): Share a single request between concurrent
+                identical queries from different threads. The number of coalesced
+                queries is counted in `single_flight.coalesced`. Defaults to False.
+            observers (Optional[Sequence[Observer]], optional): Instrumentation hooks
+                receiving request timings, retries and cache lookups.
+                Defaults to None (no instrumentation).
+        """
         if api_key is None:
             raise ValueError(f"Invalid value for `api_key`: {api_key}")
         if version == "v1":
@@ -21,36 +107,276 @@ class DMIOpenDataClient:
 
         self.api_key = api_key
         self.version = version
+        self.cache = cache
+        self.timeout = timeout
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = (
+            CircuitBreaker() if circuit_breaker is None else circuit_breaker
+        )
+        self.single_flight = SingleFlight() if coalesce else None
+        self.observers = list(observers or [])
+        self.station_index_ttl = station_index_ttl
+        self.station_snapshot = station_snapshot
+        self.station_catalog = StationCatalog()
+        self._stations_refreshed_at = 0.0
+        self._station_index = None
+        self._station_index_version = None
+        self._stations_lock = threading.Lock()
+        self._owns_session = session is None
+        self._session = session
+        self._session_lock = threading.Lock()
+        self._pool_options = dict(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def __enter__(self) -> "DMIOpenDataClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections held by the client."""
+        if self._owns_session and self._session is not None:
+            self._session.close()
+
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP session of the client, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = _create_session(**self._pool_options)
+        return self._session
 
     def base_url(self, api: str):
         if api not in ("climateData", "metObs"):
             raise NotImplementedError(f"Following api is not supported yet: {api}")
         return self._base_url.format(version=self.version, api=api)
 
-    @retry(stop=stop_after_attempt(10), wait=wait_random(min=0.1, max=1.00))
     def _query(self, api: str, service: str, params: Dict[str, Any], **kwargs):
-        res = requests.get(
-            url=f"{self.base_url(api=api)}/{service}",
-            params={
-                "api-key": self.api_key,
-                **params,
-            },
-            **kwargs,
-        )
-        data = res.json()
-        http_status_code = data.get("http_status_code", 200)
-        if http_status_code != 200:
-            message = data.get("message")
-            raise ValueError(
-                f"Failed HTTP request with HTTP status code {http_status_code} and message: {message}"
+        if self.cache is not None:
+            res = self.cache.get(api=api, service=service, params=params)
+            if self.observers:
+                self._notify("on_cache", api, service, res is not None)
+            if res is not None:
+                return res
+        url = f"{self.base_url(api=api)}/{service}"
+        if self.single_flight is None:
+            res = self._request(url=url, params=params, **kwargs)
+        else:
+            res = self.single_flight.do(
+                cache_key(api=api, service=service, params=params),
+                self._request,
+                url=url,
+                params=params,
+                **kwargs,
+            )
+        if self.cache is not None:
+            self.cache.set(api=api, service=service, params=params, response=res)
+        return res
+
+    def _request(self, url: str, params: Dict[str, Any], **kwargs):
+        return self._with_retry(self._send, url=url, params=params, **kwargs)
+
+    def _with_retry(self, func: Callable, *args, **kwargs):
+        attempt = 1
+        while True:
+            self.circuit_breaker.before_call()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                res = func(*args, **kwargs)
+            except Exception as exc:
+                if not self.retry_policy.is_retryable(exc):
+                    # The gateway answered, so the failure says nothing about its health
+                    self.circuit_breaker.record_success()
+                    raise
+                self.circuit_breaker.record_failure()
+                if attempt >= self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.delay(attempt=attempt, exc=exc)
+                if self.observers:
+                    self._notify("on_retry", kwargs.get("url"), attempt, delay, exc)
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.circuit_breaker.record_success()
+            return res
+
+    def _get(self, url: str, params: Dict[str, Any], **kwargs) -> "requests.Response":
+        if "api-key=" not in url:
+            params = {"api-key": self.api_key, **params}
+        kwargs.setdefault("timeout", self.timeout)
+        res = self.session.get(url=url, params=params, **kwargs)
+        if res.status_code >= 400:
+            try:
+                message = loads(res.content).get("message")
+            except (ValueError, AttributeError):
+                message = res.reason
+            raise HTTPError(
+                status_code=res.status_code,
+                message=message,
+                retry_after=_retry_after(res.headers.get("Retry-After")),
             )
-        return res.json()
+        return res
+
+    def _send(self, url: str, params: Dict[str, Any], **kwargs):
+        if self.observers:
+            return self._send_observed(url=url, params=params, **kwargs)
+        data = loads(self._get(url=url, params=params, **kwargs).content)
+        _check_status(data)
+        return data
+
+    def _send_observed(self, url: str, params: Dict[str, Any], **kwargs):
+        _, data = self._get_observed(url=url, params=params, **kwargs)
+        _check_status(data)
+        return data
+
+    def _get_observed(
+        self, url: str, params: Dict[str, Any], **kwargs
+    ) -> Tuple["requests.Response", Any]:
+        # Sends a request, decodes its body and reports a RequestEvent
+        started_at = time.perf_counter()
+        try:
+            res = self._get(url=url, params=params, **kwargs)
+        except Exception as exc:
+            self._notify(
+                "on_request",
+                RequestEvent(
+                    url=url,
+                    status_code=getattr(exc, "status_code", None),
+                    wait=time.perf_counter() - started_at,
+                    download=0.0,
+                    decode=0.0,
+                    bytes=0,
+                    error=exc,
+                ),
+            )
+            raise
+        received_at = time.perf_counter()
+        data = None if res.status_code == 304 else loads(res.content)
+        decoded_at = time.perf_counter()
+        # `elapsed` stops when the headers are parsed, before the body is read
+        wait = min(res.elapsed.total_seconds(), received_at - started_at)
+        self._notify(
+            "on_request",
+            RequestEvent(
+                url=url,
+                status_code=res.status_code,
+                wait=wait,
+                download=received_at - started_at - wait,
+                decode=decoded_at - received_at,
+                bytes=len(res.content),
+            ),
+        )
+        return res, data
+
+    def _query_link(self, url: str) -> Dict[str, Any]:
+        # Links into a known api are split back into a query, so the pages they
+        # chain are cached and coalesced like the first page
+        for api in ("metObs", "climateData"):
+            prefix = f"{self.base_url(api=api)}/"
+            if url.startswith(prefix):
+                service, _, query = url[len(prefix) :].partition("?")
+                params = {
+                    key: value
+                    for key, value in parse_qsl(query, keep_blank_values=True)
+                    if key != "api-key"
+                }
+                return self._query(api=api, service=service, params=params)
+        return self._request(url=url, params={})
+
+    def _notify(self, hook: str, *args) -> None:
+        for observer in self.observers:
+            getattr(observer, hook)(*args)
+
+    def _open_stream(self, url: str, params: Dict[str, Any], **kwargs):
+        res = self._with_retry(self._get, url=url, params=params, stream=True, **kwargs)
+        res.raw.decode_content = True
+        return res
+
+    def _iter_streamed_features(
+        self, api: str, service: str, params: Dict[str, Any], page_size: int
+    ) -> Iterator[Dict[str, Any]]:
+        url = f"{self.base_url(api=api)}/{service}"
+        params = {**params, "limit": page_size, "offset": 0}
+        linked = False
+        while True:
+            n_features, links = 0, []
+            started_at = time.perf_counter()
+            with self._open_stream(url=url, params=params) as res:
+                received_at = time.perf_counter()
+                for feature in iter_features(res.raw, links=links):
+                    n_features += 1
+                    yield feature
+                if self.observers:
+                    self._notify(
+                        "on_request",
+                        RequestEvent(
+                            url=url,
+                            status_code=res.status_code,
+                            wait=received_at - started_at,
+                            download=time.perf_counter() - received_at,
+                            decode=0.0,
+                            bytes=res.raw.tell(),
+                        ),
+                    )
+            next_url = _next_link({"links": links})
+            if next_url is not None:
+                url, params, linked = next_url, {}, True
+                continue
+            if linked:
+                return
+            params["offset"] += n_features
+            if _is_last_page(
+                n_features=n_features,
+                page_size=page_size,
+                offset=params["offset"],
+                number_matched=None,
+            ):
+                return
+
+    def _iter_pages(
+        self, api: str, service: str, params: Dict[str, Any], page_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        params = {**params, "limit": page_size, "offset": 0}
+        res = self._query(api=api, service=service, params=params)
+        linked = False
+        while True:
+            features = res.get("features", [])
+            if len(features) > 0:
+                yield features
+            next_url = _next_link(res)
+            if next_url is not None:
+                linked = True
+                res = self._query_link(url=next_url)
+                continue
+            if linked:
+                # The last of the pages chained by next links
+                return
+            params["offset"] += len(features)
+            if _is_last_page(
+                n_features=len(features),
+                page_size=page_size,
+                offset=params["offset"],
+                number_matched=res.get("numberMatched"),
+            ):
+                return
+            res = self._query(api=api, service=service, params=params)
 
     def get_stations(
         self, limit: Optional[int] = 10000, offset: Optional[int] = 0
     ) -> List[Dict[str, Any]]:
         """Get DMI stations.
 
+        The full station list, ie. the default `limit` and `offset`, is served
+        from `station_catalog`, which is only revalidated when older than
+        `station_index_ttl`. Other pages are requested from the API.
+
         Args:
             limit (Optional[int], optional): Specify a maximum number of stations
                 you want to be returned. Defaults to 10000.
@@ -60,6 +386,10 @@ class DMIOpenDataClient:
         Returns:
             List[Dict[str, Any]]: List of DMI stations.
         """
+        if limit == 10000 and offset == 0:
+            with self._stations_lock:
+                self._ensure_stations()
+                return self.station_catalog.stations
         res = self._query(
             api="metObs",
             service="collections/station/items",
@@ -160,6 +490,651 @@ class DMIOpenDataClient:
         )
         return res.get("features", [])
 
+    def iter_observations(
+        self,
+        parameter: Optional[Parameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        page_size: int = 10000,
+        stream: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over all raw DMI observations matching the given filters.
+
+        Pages are fetched lazily, following the API's `next` links when present
+        and falling back to offset pagination, so only one page is held in memory.
+
+        Args:
+            parameter (Optional[Parameter], optional): Returns observations for a specific parameter.
+                Defaults to None.
+            station_id (Optional[int], optional): Search for a specific station using the stationID.
+                Defaults to None.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            page_size (int, optional): Number of observations fetched per request.
+                Defaults to 10000.
+            stream (bool, optional): Decode each response incrementally instead of
+                holding a full page in memory. Requires ijson to be effective, and
+                bypasses the response cache. Defaults to False.
+
+        Yields:
+            Dict[str, Any]: Raw DMI observation.
+        """
+        params = {
+            "parameterId": None if parameter is None else parameter.value,
+            "stationId": station_id,
+            "datetime": _construct_datetime_argument(
+                from_time=from_time, to_time=to_time
+            ),
+        }
+        if stream:
+            yield from self._iter_streamed_features(
+                api="metObs",
+                service="collections/observation/items",
+                params=params,
+                page_size=page_size,
+            )
+            return
+        for page in self._iter_pages(
+            api="metObs",
+            service="collections/observation/items",
+            params=params,
+            page_size=page_size,
+        ):
+            yield from page
+
+    def iter_climate_data(
+        self,
+        parameter: Optional[ClimateDataParameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        time_resolution: Optional[str] = None,
+        page_size: int = 10000,
+        stream: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over all raw DMI climate data matching the given filters.
+
+        Pages are fetched lazily, following the API's `next` links when present
+        and falling back to offset pagination, so only one page is held in memory.
+
+        Args:
+            parameter (Optional[ClimateDataParameter], optional): Returns observations for a specific parameter.
+                Defaults to None.
+            station_id (Optional[int], optional): Search for a specific station using the stationID.
+                Defaults to None.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            time_resolution (Optional[str], optional): Filter by time resolution (hour/day/month/year),
+                ie. what type of time interval the station value represents
+            page_size (int, optional): Number of observations fetched per request.
+                Defaults to 10000.
+            stream (bool, optional): Decode each response incrementally instead of
+                holding a full page in memory. Requires ijson to be effective, and
+                bypasses the response cache. Defaults to False.
+
+        Yields:
+            Dict[str, Any]: Raw DMI climate data observation.
+        """
+        params = {
+            "parameterId": None if parameter is None else parameter.value,
+            "stationId": station_id,
+            "datetime": _construct_datetime_argument(
+                from_time=from_time, to_time=to_time
+            ),
+            "timeResolution": time_resolution,
+        }
+        if stream:
+            yield from self._iter_streamed_features(
+                api="climateData",
+                service="collections/stationValue/items",
+                params=params,
+                page_size=page_size,
+            )
+            return
+        for page in self._iter_pages(
+            api="climateData",
+            service="collections/stationValue/items",
+            params=params,
+            page_size=page_size,
+        ):
+            yield from page
+
+    def watch_observations(
+        self,
+        parameters: Optional[Sequence[Parameter]] = None,
+        station_ids: Optional[Sequence[str]] = None,
+        interval: float = 60,
+        lookback: timedelta = timedelta(hours=1),
+        max_seen: int = 100000,
+    ) -> Iterator[Dict[str, Any]]:
+        """Poll for new raw DMI observations forever.
+
+        Each poll only asks for observations after the latest one seen per
+        (station, parameter), and observations already yielded are skipped,
+        so the cost of a poll does not grow with `lookback`.
+
+        Args:
+            parameters (Optional[Sequence[Parameter]], optional): Parameters to watch.
+                Defaults to None (all parameters).
+            station_ids (Optional[Sequence[str]], optional): Stations to watch.
+                Defaults to None (all stations).
+            interval (float, optional): Seconds between the start of two polls.
+                Defaults to 60.
+            lookback (timedelta, optional): Time window of the first poll, and the
+                widest window of any later poll. Defaults to 1 hour.
+            max_seen (int, optional): Number of observation ids remembered for
+                deduplication. Defaults to 100000.
+
+        Yields:
+            Dict[str, Any]: New raw DMI observation.
+        """
+        watcher = ObservationWatcher(lookback=lookback, max_seen=max_seen)
+        queries = plan_watch(station_ids=station_ids, parameters=parameters)
+        while True:
+            started_at = time.monotonic()
+            now = datetime.utcnow()
+            for query in queries:
+                features = list(
+                    self.iter_observations(
+                        parameter=query.parameter,
+                        station_id=query.station_id,
+                        from_time=watcher.window_start(query=query, now=now),
+                        to_time=now,
+                    )
+                )
+                yield from watcher.accept(features)
+            time.sleep(max(0.0, interval - (time.monotonic() - started_at)))
+
+    def get_observations_table(
+        self,
+        parameter: Optional[Parameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        page_size: int = 10000,
+        backend: str = "numpy",
+    ):
+        """Get all DMI observations matching the given filters as typed columns.
+
+        Pages are decoded into columns as they arrive, so the raw GeoJSON of at
+        most one page is held in memory. Requires NumPy (and pyarrow for the
+        "arrow" backend).
+
+        Args:
+            parameter (Optional[Parameter], optional): Returns observations for a specific parameter.
+                Defaults to None.
+            station_id (Optional[int], optional): Search for a specific station using the stationID.
+                Defaults to None.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            page_size (int, optional): Number of observations fetched per request.
+                Defaults to 10000.
+            backend (str, optional): "numpy" for a dictionary of NumPy arrays or
+                "arrow" for a pyarrow Table. Defaults to "numpy".
+
+        Returns:
+            Union[Dict[str, np.ndarray], pa.Table]: Columns `observed` (datetime64),
+                `value`, `latitude`, `longitude` (float64) and categorical
+                `stationId`, `parameterId`.
+        """
+        from dmi_open_data.columnar import build_columns
+
+        return build_columns(
+            pages=self._iter_pages(
+                api="metObs",
+                service="collections/observation/items",
+                params={
+                    "parameterId": None if parameter is None else parameter.value,
+                    "stationId": station_id,
+                    "datetime": _construct_datetime_argument(
+                        from_time=from_time, to_time=to_time
+                    ),
+                },
+                page_size=page_size,
+            ),
+            backend=backend,
+        )
+
+    def get_climate_data_table(
+        self,
+        parameter: Optional[ClimateDataParameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        time_resolution: Optional[str] = None,
+        page_size: int = 10000,
+        backend: str = "numpy",
+    ):
+        """Get all DMI climate data matching the given filters as typed columns.
+
+        See `get_observations_table`.
+
+        Args:
+            parameter (Optional[ClimateDataParameter], optional): Returns observations for a specific parameter.
+                Defaults to None.
+            station_id (Optional[int], optional): Search for a specific station using the stationID.
+                Defaults to None.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            time_resolution (Optional[str], optional): Filter by time resolution (hour/day/month/year),
+                ie. what type of time interval the station value represents
+            page_size (int, optional): Number of observations fetched per request.
+                Defaults to 10000.
+            backend (str, optional): "numpy" for a dictionary of NumPy arrays or
+                "arrow" for a pyarrow Table. Defaults to "numpy".
+
+        Returns:
+            Union[Dict[str, np.ndarray], pa.Table]: Columns `from`, `to` (datetime64),
+                `value`, `latitude`, `longitude` (float64) and categorical
+                `stationId`, `parameterId`, `timeResolution`.
+        """
+        from dmi_open_data.columnar import (
+            build_columns,
+            CLIMATE_DATA_CATEGORICAL_COLUMNS,
+            CLIMATE_DATA_TIME_COLUMNS,
+        )
+
+        return build_columns(
+            pages=self._iter_pages(
+                api="climateData",
+                service="collections/stationValue/items",
+                params={
+                    "parameterId": None if parameter is None else parameter.value,
+                    "stationId": station_id,
+                    "datetime": _construct_datetime_argument(
+                        from_time=from_time, to_time=to_time
+                    ),
+                    "timeResolution": time_resolution,
+                },
+                page_size=page_size,
+            ),
+            backend=backend,
+            time_columns=CLIMATE_DATA_TIME_COLUMNS,
+            categorical_columns=CLIMATE_DATA_CATEGORICAL_COLUMNS,
+        )
+
+    def get_station_records(self) -> List[Station]:
+        """Get all DMI stations as compact `Station` records.
+
+        Stations are taken from `station_catalog`, see `get_stations`.
+
+        Returns:
+            List[Station]: DMI stations.
+        """
+        return parse_stations(self.get_stations())
+
+    def get_observation_records(
+        self,
+        parameter: Optional[Parameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        page_size: int = 10000,
+        stream: bool = False,
+    ) -> List[Observation]:
+        """Get all DMI observations matching the given filters as compact records.
+
+        Each page is converted to `Observation` records as it arrives, which
+        take a fraction of the memory of the raw GeoJSON features.
+
+        Args:
+            parameter (Optional[Parameter], optional): Returns observations for a specific parameter.
+                Defaults to None.
+            station_id (Optional[int], optional): Search for a specific station using the stationID.
+                Defaults to None.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            page_size (int, optional): Number of observations fetched per request.
+                Defaults to 10000.
+            stream (bool, optional): Decode responses incrementally, see
+                `iter_observations`. Defaults to False.
+
+        Returns:
+            List[Observation]: DMI observations.
+        """
+        return parse_observations(
+            self.iter_observations(
+                parameter=parameter,
+                station_id=station_id,
+                from_time=from_time,
+                to_time=to_time,
+                page_size=page_size,
+                stream=stream,
+            )
+        )
+
+    def get_climate_data_records(
+        self,
+        parameter: Optional[ClimateDataParameter] = None,
+        station_id: Optional[int] = None,
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        time_resolution: Optional[str] = None,
+        page_size: int = 10000,
+        stream: bool = False,
+    ) -> List[ClimateValue]:
+        """Get all DMI climate data matching the given filters as compact records.
+
+        See `get_observation_records`.
+
+        Args:
+            parameter (Optional[ClimateDataParameter], optional): Returns observations for a specific parameter.
+                Defaults to None.
+            station_id (Optional[int], optional): Search for a specific station using the stationID.
+                Defaults to None.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            time_resolution (Optional[str], optional): Filter by time resolution (hour/day/month/year),
+                ie. what type of time interval the station value represents
+            page_size (int, optional): Number of observations fetched per request.
+                Defaults to 10000.
+            stream (bool, optional): Decode responses incrementally, see
+                `iter_climate_data`. Defaults to False.
+
+        Returns:
+            List[ClimateValue]: DMI climate data values.
+        """
+        return parse_climate_data(
+            self.iter_climate_data(
+                parameter=parameter,
+                station_id=station_id,
+                from_time=from_time,
+                to_time=to_time,
+                time_resolution=time_resolution,
+                page_size=page_size,
+                stream=stream,
+            )
+        )
+
+    def get_observations_batch(
+        self,
+        station_ids: Sequence[str],
+        parameters: Sequence[Parameter],
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        max_workers: int = 8,
+        max_overfetch: float = 2.0,
+    ) -> Dict[Tuple[str, Parameter], List[Dict[str, Any]]]:
+        """Get raw DMI observations for several stations and parameters.
+
+        The fewest upstream queries are planned, eg. one query per station
+        without a parameter filter when most parameters are requested, and run
+        concurrently. Each query is fully paginated.
+
+        Args:
+            station_ids (Sequence[str]): Station ids, eg. ["06180", "06181"].
+            parameters (Sequence[Parameter]): Parameters to fetch.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            max_workers (int, optional): Number of concurrent queries. Defaults to 8.
+            max_overfetch (float, optional): Maximum ratio of fetched to requested data
+                when merging queries. Defaults to 2.0.
+
+        Returns:
+            Dict[Tuple[str, Parameter], List[Dict[str, Any]]]: Raw DMI observations
+                per (station id, parameter).
+        """
+
+        def fetch(query: BatchQuery) -> List[Dict[str, Any]]:
+            return list(
+                self.iter_observations(
+                    parameter=query.parameter,
+                    station_id=query.station_id,
+                    from_time=from_time,
+                    to_time=to_time,
+                )
+            )
+
+        queries = plan_batch(
+            station_ids=station_ids,
+            parameters=parameters,
+            total_parameters=len(Parameter),
+            total_stations=self._count_stations_for_batch(
+                station_ids=station_ids,
+                parameters=parameters,
+                max_overfetch=max_overfetch,
+            ),
+            max_overfetch=max_overfetch,
+        )
+        return fetch_batch(
+            fetch=fetch,
+            queries=queries,
+            station_ids=station_ids,
+            parameters=parameters,
+            max_workers=max_workers,
+        )
+
+    def _count_stations_for_batch(
+        self,
+        station_ids: Sequence[str],
+        parameters: Sequence[Parameter],
+        max_overfetch: float,
+    ) -> Optional[int]:
+        # The stations are only counted when querying all stations per parameter
+        # could be planned, ie. when it would win even on the smallest network
+        # and the stations held, if any, do not already rule it out
+        best_case = plan_batch(
+            station_ids=station_ids,
+            parameters=parameters,
+            total_parameters=len(Parameter),
+            total_stations=len(set(station_ids)),
+            max_overfetch=max_overfetch,
+        )
+        if not best_case or any(query.station_id is not None for query in best_case):
+            return None
+        with self._stations_lock:
+            known = len(self.station_catalog.station_ids())
+            if known > max_overfetch * len(station_ids):
+                return known
+            self._ensure_stations()
+            return len(self.station_catalog.station_ids())
+
+    def get_climate_data_batch(
+        self,
+        station_ids: Sequence[str],
+        parameters: Sequence[ClimateDataParameter],
+        from_time: Optional[datetime] = None,
+        to_time: Optional[datetime] = None,
+        time_resolution: Optional[str] = None,
+        max_workers: int = 8,
+        max_overfetch: float = 2.0,
+    ) -> Dict[Tuple[str, ClimateDataParameter], List[Dict[str, Any]]]:
+        """Get raw DMI climate data for several stations and parameters.
+
+        See `get_observations_batch`. Queries are never merged across stations,
+        as the climate data API has no cheap way of counting its stations.
+
+        Args:
+            station_ids (Sequence[str]): Station ids, eg. ["06180", "06181"].
+            parameters (Sequence[ClimateDataParameter]): Parameters to fetch.
+            from_time (Optional[datetime], optional): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp. Defaults to None.
+            to_time (Optional[datetime], optional): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp. Defaults to None.
+            time_resolution (Optional[str], optional): Filter by time resolution (hour/day/month/year),
+                ie. what type of time interval the station value represents
+            max_workers (int, optional): Number of concurrent queries. Defaults to 8.
+            max_overfetch (float, optional): Maximum ratio of fetched to requested data
+                when merging queries. Defaults to 2.0.
+
+        Returns:
+            Dict[Tuple[str, ClimateDataParameter], List[Dict[str, Any]]]: Raw DMI
+                climate data per (station id, parameter).
+        """
+
+        def fetch(query: BatchQuery) -> List[Dict[str, Any]]:
+            return list(
+                self.iter_climate_data(
+                    parameter=query.parameter,
+                    station_id=query.station_id,
+                    from_time=from_time,
+                    to_time=to_time,
+                    time_resolution=time_resolution,
+                )
+            )
+
+        queries = plan_batch(
+            station_ids=station_ids,
+            parameters=parameters,
+            total_parameters=len(ClimateDataParameter),
+            max_overfetch=max_overfetch,
+        )
+        return fetch_batch(
+            fetch=fetch,
+            queries=queries,
+            station_ids=station_ids,
+            parameters=parameters,
+            max_workers=max_workers,
+        )
+
+    def get_observations_sharded(
+        self,
+        from_time: datetime,
+        to_time: datetime,
+        parameters: Optional[Sequence[Parameter]] = None,
+        station_ids: Optional[Sequence[int]] = None,
+        n_time_shards: int = 8,
+        max_workers: int = 8,
+        limit: int = 10000,
+    ) -> List[Dict[str, Any]]:
+        """Get all raw DMI observations in a time period using parallel sub-requests.
+
+        The time period is split into non-overlapping windows (and optionally
+        by parameter and station) that are fetched concurrently. Windows whose
+        response is truncated are split again, or paged through when they
+        cannot be split further, until every result is complete.
+
+        Args:
+            from_time (datetime): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp.
+            to_time (datetime): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp.
+            parameters (Optional[Sequence[Parameter]], optional): Parameters to fetch,
+                one sub-request each. Defaults to None (all parameters).
+            station_ids (Optional[Sequence[int]], optional): Stations to fetch,
+                one sub-request each. Defaults to None (all stations).
+            n_time_shards (int, optional): Initial number of time windows. Defaults to 8.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 8.
+            limit (int, optional): Maximum number of observations per sub-request.
+                Defaults to 10000.
+
+        Returns:
+            List[Dict[str, Any]]: List of raw DMI observations ordered by observation time.
+        """
+
+        def fetch(shard: Shard, limit: int, offset: int) -> Dict[str, Any]:
+            return self._query(
+                api="metObs",
+                service="collections/observation/items",
+                params={
+                    "parameterId": (
+                        None if shard.parameter is None else shard.parameter.value
+                    ),
+                    "stationId": shard.station_id,
+                    "datetime": _construct_datetime_argument(
+                        from_time=shard.from_time, to_time=shard.to_time
+                    ),
+                    "limit": limit,
+                    "offset": offset,
+                },
+            )
+
+        return fetch_shards(
+            fetch=fetch,
+            shards=plan_shards(
+                from_time=from_time,
+                to_time=to_time,
+                n_time_shards=n_time_shards,
+                parameters=parameters,
+                station_ids=station_ids,
+            ),
+            limit=limit,
+            max_workers=max_workers,
+            time_key="observed",
+        )
+
+    def get_climate_data_sharded(
+        self,
+        from_time: datetime,
+        to_time: datetime,
+        parameters: Optional[Sequence[ClimateDataParameter]] = None,
+        station_ids: Optional[Sequence[int]] = None,
+        time_resolution: Optional[str] = None,
+        n_time_shards: int = 8,
+        max_workers: int = 8,
+        limit: int = 10000,
+    ) -> List[Dict[str, Any]]:
+        """Get all raw DMI climate data in a time period using parallel sub-requests.
+
+        See `get_observations_sharded`.
+
+        Args:
+            from_time (datetime): Returns only objects with a "timeObserved" equal
+                to or after a given timestamp.
+            to_time (datetime): Returns only objects with a "timeObserved" before
+                (not including) a given timestamp.
+            parameters (Optional[Sequence[ClimateDataParameter]], optional): Parameters to fetch,
+                one sub-request each. Defaults to None (all parameters).
+            station_ids (Optional[Sequence[int]], optional): Stations to fetch,
+                one sub-request each. Defaults to None (all stations).
+            time_resolution (Optional[str], optional): Filter by time resolution (hour/day/month/year),
+                ie. what type of time interval the station value represents
+            n_time_shards (int, optional): Initial number of time windows. Defaults to 8.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 8.
+            limit (int, optional): Maximum number of observations per sub-request.
+                Defaults to 10000.
+
+        Returns:
+            List[Dict[str, Any]]: List of raw DMI climate data ordered by start of interval.
+        """
+
+        def fetch(shard: Shard, limit: int, offset: int) -> Dict[str, Any]:
+            return self._query(
+                api="climateData",
+                service="collections/stationValue/items",
+                params={
+                    "parameterId": (
+                        None if shard.parameter is None else shard.parameter.value
+                    ),
+                    "stationId": shard.station_id,
+                    "datetime": _construct_datetime_argument(
+                        from_time=shard.from_time, to_time=shard.to_time
+                    ),
+                    "timeResolution": time_resolution,
+                    "limit": limit,
+                    "offset": offset,
+                },
+            )
+
+        return fetch_shards(
+            fetch=fetch,
+            shards=plan_shards(
+                from_time=from_time,
+                to_time=to_time,
+                n_time_shards=n_time_shards,
+                parameters=parameters,
+                station_ids=station_ids,
+            ),
+            limit=limit,
+            max_workers=max_workers,
+            time_key="from",
+        )
+
     def list_parameters(self) -> List[Dict[str, Union[str, Parameter]]]:
         """List available observation parameters.
 
@@ -189,6 +1164,104 @@ class DMIOpenDataClient:
         """
         return Parameter(parameter_id)
 
+    def refresh_stations(self) -> Dict[str, int]:
+        """Revalidate `station_catalog` against the API.
+
+        The request is conditional on the ETag and Last-Modified of the stations
+        held, so an unchanged collection costs an empty 304 response. Otherwise
+        only records that changed are merged into the catalog.
+
+        Returns:
+            Dict[str, int]: Number of `added`, `updated` and `removed` station records.
+        """
+        catalog = self.station_catalog
+        headers = {}
+        if len(catalog) > 0 and catalog.etag is not None:
+            headers["If-None-Match"] = catalog.etag
+        if len(catalog) > 0 and catalog.last_modified is not None:
+            headers["If-Modified-Since"] = catalog.last_modified
+        url = f"{self.base_url(api='metObs')}/collections/station/items"
+        params = {"limit": 10000, "offset": 0}
+        if self.observers:
+            res, data = self._with_retry(
+                self._get_observed, url=url, params=params, headers=headers
+            )
+        else:
+            res = self._with_retry(self._get, url=url, params=params, headers=headers)
+            data = None if res.status_code == 304 else loads(res.content)
+        if res.status_code == 304:
+            changes = {"added": 0, "updated": 0, "removed": 0}
+        else:
+            _check_status(data)
+            changes = catalog.merge(data.get("features", []), complete=True)
+            catalog.etag = res.headers.get("ETag")
+            catalog.last_modified = res.headers.get("Last-Modified")
+        if self.station_snapshot is not None:
+            self.station_snapshot.save(
+                catalog.stations, etag=catalog.etag, last_modified=catalog.last_modified
+            )
+        self._stations_refreshed_at = time.monotonic()
+        return changes
+
+    def _ensure_stations(self, refresh: bool = False) -> None:
+        age = time.monotonic() - self._stations_refreshed_at
+        if not refresh and len(self.station_catalog) > 0:
+            if age <= self.station_index_ttl:
+                return
+        if len(self.station_catalog) == 0 and self.station_snapshot is not None:
+            snapshot_age = self.station_snapshot.age
+            snapshot = self.station_snapshot.load_catalog()
+            if snapshot is not None:
+                # Even a stale snapshot provides validators for a conditional refresh
+                self.station_catalog.merge(snapshot.stations)
+                self.station_catalog.etag = snapshot.etag
+                self.station_catalog.last_modified = snapshot.last_modified
+                if not refresh and snapshot_age <= self.station_index_ttl:
+                    self._stations_refreshed_at = time.monotonic() - snapshot_age
+                    return
+        self.refresh_stations()
+
+    def get_station(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """Get a DMI station by its stationId.
+
+        Stations are looked up in `station_catalog`, which is refreshed when
+        older than `station_index_ttl`.
+
+        Args:
+            station_id (str): DMI stationId, eg. "06180".
+
+        Returns:
+            Optional[Dict[str, Any]]: Latest record of the station, or None if
+                the station is unknown.
+        """
+        with self._stations_lock:
+            self._ensure_stations()
+            return self.station_catalog.get(station_id)
+
+    def get_station_index(self, refresh: bool = False) -> StationIndex:
+        """Get spatial index over all DMI stations.
+
+        Stations are kept in `station_catalog`, and revalidated with a conditional
+        request when older than `station_index_ttl`. They are loaded from
+        `station_snapshot` when it is fresh enough. The index is only rebuilt
+        when the stations changed.
+
+        Args:
+            refresh (bool, optional): Force revalidating the stations. Defaults to False.
+
+        Returns:
+            StationIndex: Spatial index over DMI stations.
+        """
+        with self._stations_lock:
+            self._ensure_stations(refresh=refresh)
+            if (
+                self._station_index is None
+                or self._station_index_version != self.station_catalog.version
+            ):
+                self._station_index = StationIndex(self.station_catalog.stations)
+                self._station_index_version = self.station_catalog.version
+            return self._station_index
+
     def get_closest_station(
         self, latitude: float, longitude: float
     ) -> List[Dict[str, Any]]:
@@ -201,27 +1274,80 @@ class DMIOpenDataClient:
         Returns:
             List[Dict[str, Any]]: Closest weather station.
         """
-        stations = self.get_stations()
-        closest_station, closests_dist = None, 1e10
-        for station in stations:
-            coordinates = station.get("geometry", {}).get("coordinates")
-            if coordinates is None or len(coordinates) < 2:
-                continue
-            lat, lon = coordinates[1], coordinates[0]
-            if lat is None or lon is None:
-                continue
+        closest = self.get_station_index().nearest(
+            latitude=latitude, longitude=longitude, k=1
+        )
+        if len(closest) == 0:
+            return None
+        station, _ = closest[0]
+        return station
+
+
+def _create_session(
+    pool_connections: int, pool_maxsize: int, pool_block: bool
+) -> "requests.Session":
+    # requests is slow to import, so it is only imported once a request is sent
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(
+        {
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+    )
+    return session
+
+
+def _check_status(data: Dict[str, Any]) -> None:
+    http_status_code = data.get("http_status_code", 200)
+    if http_status_code != 200:
+        raise HTTPError(status_code=http_status_code, message=data.get("message"))
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+
+def _next_link(res: Dict[str, Any]) -> Optional[str]:
+    for link in res.get("links", []):
+        if link.get("rel") == "next" and link.get("href"):
+            return link["href"]
+    return None
 
-            # Calculate distance
-            dist = distance(
-                lat1=latitude,
-                lon1=longitude,
-                lat2=lat,
-                lon2=lon,
-            )
 
-            if dist < closests_dist:
-                closests_dist, closest_station = dist, station
-        return closest_station
+def _is_last_page(
+    n_features: int, page_size: int, offset: int, number_matched: Optional[int]
+) -> bool:
+    # Without a next link a short page ends the collection, unless it reports
+    # more matches, as when the server caps the page size below `page_size`
+    if n_features == 0:
+        return True
+    if number_matched is not None:
+        return offset >= number_matched
+    return n_features < page_size
 
 
 def _construct_datetime_argument(
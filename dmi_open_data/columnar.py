@@ -0,0 +1,174 @@
+from typing import Any, Dict, Iterable, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+OBSERVATION_TIME_COLUMNS = ("observed",)
+OBSERVATION_CATEGORICAL_COLUMNS = ("stationId", "parameterId")
+CLIMATE_DATA_TIME_COLUMNS = ("from", "to")
+CLIMATE_DATA_CATEGORICAL_COLUMNS = ("stationId", "parameterId", "timeResolution")
+
+
+class ColumnBuilder:
+    """Decode pages of GeoJSON features into typed columns.
+
+    Each page is converted to NumPy arrays as soon as it is added, so only the
+    compact columns are kept around, never the full list of feature dicts.
+
+    Columns:
+        - time columns (eg. `observed`) as `datetime64[us]` in UTC.
+        - `value`, `latitude` and `longitude` as `float64` (NaN when missing).
+        - categorical columns (eg. `stationId`, `parameterId`) as `int32` codes
+          into `<name>_categories`.
+    """
+
+    def __init__(
+        self,
+        time_columns: Sequence[str] = OBSERVATION_TIME_COLUMNS,
+        categorical_columns: Sequence[str] = OBSERVATION_CATEGORICAL_COLUMNS,
+    ):
+        if np is None:
+            raise ImportError(
+                "NumPy is required for columnar results: pip install dmi-open-data[numpy]"
+            )
+        self.time_columns = tuple(time_columns)
+        self.categorical_columns = tuple(categorical_columns)
+        self._chunks = {
+            name: []
+            for name in self.time_columns
+            + self.categorical_columns
+            + ("value", "latitude", "longitude")
+        }
+        self._categories = {name: {} for name in self.categorical_columns}
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks["value"])
+
+    def extend(self, features: Iterable[Dict[str, Any]]) -> None:
+        """Add a page of raw DMI features."""
+        properties = []
+        coordinates = []
+        for feature in features:
+            properties.append(feature.get("properties", {}))
+            point = (feature.get("geometry") or {}).get("coordinates") or ()
+            coordinates.append(
+                (point[1], point[0]) if len(point) >= 2 else (None, None)
+            )
+        if len(properties) == 0:
+            return
+
+        for name in self.time_columns:
+            self._chunks[name].append(
+                np.array(
+                    [_strip_timezone(p.get(name)) for p in properties],
+                    dtype="datetime64[us]",
+                )
+            )
+        for name in self.categorical_columns:
+            categories = self._categories[name]
+            self._chunks[name].append(
+                np.fromiter(
+                    (
+                        categories.setdefault(p.get(name), len(categories))
+                        for p in properties
+                    ),
+                    dtype=np.int32,
+                    count=len(properties),
+                )
+            )
+        self._chunks["value"].append(
+            np.array([p.get("value") for p in properties], dtype=np.float64)
+        )
+        self._chunks["latitude"].append(
+            np.array([lat for lat, _ in coordinates], dtype=np.float64)
+        )
+        self._chunks["longitude"].append(
+            np.array([lon for _, lon in coordinates], dtype=np.float64)
+        )
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """Get columns as a dictionary of NumPy arrays."""
+        empty = {
+            **{
+                name: np.array([], dtype="datetime64[us]") for name in self.time_columns
+            },
+            **{name: np.array([], dtype=np.int32) for name in self.categorical_columns},
+        }
+        columns = {
+            name: (
+                np.concatenate(chunks)
+                if len(chunks) > 0
+                else empty.get(name, np.array([], dtype=np.float64))
+            )
+            for name, chunks in self._chunks.items()
+        }
+        for name, categories in self._categories.items():
+            columns[f"{name}_categories"] = np.array(
+                [category for category in categories], dtype=object
+            )
+        return columns
+
+    def to_arrow(self) -> "pa.Table":
+        """Get columns as a pyarrow Table with dictionary encoded categorical columns."""
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required for Arrow results: pip install dmi-open-data[arrow]"
+            )
+        columns = self.to_numpy()
+        arrays = {}
+        for name in self._chunks:
+            if name in self.time_columns:
+                arrays[name] = pa.array(
+                    columns[name], type=pa.timestamp("us", tz="UTC")
+                )
+            elif name in self.categorical_columns:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(columns[name], type=pa.int32()),
+                    pa.array(list(columns[f"{name}_categories"]), type=pa.string()),
+                )
+            else:
+                arrays[name] = pa.array(columns[name], type=pa.float64())
+        return pa.table(arrays)
+
+
+def build_columns(
+    pages: Iterable[List[Dict[str, Any]]],
+    backend: str = "numpy",
+    time_columns: Sequence[str] = OBSERVATION_TIME_COLUMNS,
+    categorical_columns: Sequence[str] = OBSERVATION_CATEGORICAL_COLUMNS,
+):
+    """Decode pages of raw DMI features into columns.
+
+    Args:
+        pages (Iterable[List[Dict[str, Any]]]): Pages of raw DMI features.
+        backend (str, optional): "numpy" for a dictionary of NumPy arrays or
+            "arrow" for a pyarrow Table. Defaults to "numpy".
+        time_columns (Sequence[str], optional): Properties holding timestamps.
+        categorical_columns (Sequence[str], optional): Properties to dictionary encode.
+
+    Returns:
+        Union[Dict[str, np.ndarray], pa.Table]: Decoded columns.
+    """
+    if backend not in ("numpy", "arrow"):
+        raise ValueError(f"Unsupported backend: {backend}")
+    builder = ColumnBuilder(
+        time_columns=time_columns, categorical_columns=categorical_columns
+    )
+    for page in pages:
+        builder.extend(page)
+    return builder.to_numpy() if backend == "numpy" else builder.to_arrow()
+
+
+def _strip_timezone(value: Any) -> Any:
+    # NumPy parses UTC timestamps, but warns about an explicit "Z" suffix
+    if isinstance(value, str) and value.endswith("Z"):
+        return value[:-1]
+    return "NaT" if value is None else value
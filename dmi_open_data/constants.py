@@ -0,0 +1,3 @@
+# Constants
+CONST_EARTH_RADIUS = 6371       # km
+CONST_EARTH_DIAMETER = 12742    # km
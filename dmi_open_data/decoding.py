@@ -0,0 +1,80 @@
+import json
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the fastest installed decoder: orjson,
+    simdjson or the standard library.
+
+    Args:
+        data (Union[bytes, str]): JSON document.
+
+    Returns:
+        Any: Decoded document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if simdjson is not None:
+        return simdjson.loads(data)
+    return json.loads(data)
+
+
+def iter_features(
+    stream: BinaryIO, links: Optional[List[Dict[str, Any]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Decode the `features` of a GeoJSON FeatureCollection one at a time.
+
+    With ijson installed the response body is parsed incrementally, so only
+    a single feature is held in memory. Otherwise the whole body is decoded
+    first.
+
+    Args:
+        stream (BinaryIO): File-like object with the JSON document.
+        links (Optional[List[Dict[str, Any]]], optional): If given, the `links`
+            of the collection are appended to it. They are complete once all
+            features have been consumed. Defaults to None.
+
+    Yields:
+        Dict[str, Any]: GeoJSON feature.
+    """
+    if ijson is None:
+        data = loads(stream.read())
+        if links is not None:
+            links.extend(data.get("links", []))
+        yield from data.get("features", [])
+    elif links is None:
+        yield from ijson.items(stream, "features.item", use_float=True)
+    else:
+        # Single pass over the parser events building features and links, as
+        # the links may come after the features
+        builder = target = None
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == target and event in ("end_map", "end_array"):
+                    if target == "links":
+                        links.extend(builder.value)
+                    else:
+                        yield builder.value
+                    builder = None
+            elif (prefix, event) in _BUILT_VALUES:
+                builder, target = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+
+
+_BUILT_VALUES = {("features.item", "start_map"), ("links", "start_array")}
@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+class HTTPError(ValueError):
+    """Failed request to the DMI Open Data API."""
+
+    def __init__(
+        self,
+        status_code: int,
+        message: Optional[str] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(
+            f"Failed HTTP request with HTTP status code {status_code} and message: {message}"
+        )
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending requests while the circuit breaker is open."""
@@ -0,0 +1,260 @@
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+
+PHASES = ("wait", "download", "decode")
+
+
+class RequestEvent(NamedTuple):
+    """Timings of a single HTTP request attempt.
+
+    `wait` is the time from sending the request until the response headers
+    arrived, ie. DNS lookup, connecting and server time. `download` is the time
+    spent reading the response body and `decode` the time spent decoding JSON.
+    For streamed responses decoding is interleaved with reading the body and
+    counted as `download`.
+    """
+
+    url: str
+    status_code: Optional[int]
+    wait: float
+    download: float
+    decode: float
+    bytes: int
+    error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> float:
+        return self.wait + self.download + self.decode
+
+
+class Observer:
+    """Instrumentation hooks of the client.
+
+    Subclass and override the hooks of interest, and pass instances with the
+    `observers` argument of `DMIOpenDataClient`. Hooks are called from the thread
+    sending the request. Without observers the client skips all timing.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called after every HTTP request attempt, including failed ones."""
+
+    def on_retry(
+        self, url: str, attempt: int, delay: float, error: BaseException
+    ) -> None:
+        """Called before sleeping `delay` seconds after failed attempt number `attempt`."""
+
+    def on_cache(self, api: str, service: str, hit: bool) -> None:
+        """Called on every lookup in the response cache."""
+
+
+class StatsObserver(Observer):
+    """Accumulate request statistics in memory.
+
+    Usage::
+
+        stats = StatsObserver()
+        client = DMIOpenDataClient(api_key=..., observers=[stats])
+        ...
+        print(stats.requests, stats.bytes, stats.seconds["download"])
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.retry_seconds = 0.0
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += event.error is not None
+            self.bytes += event.bytes
+            for phase in PHASES:
+                self.seconds[phase] += getattr(event, phase)
+
+    def on_retry(
+        self, url: str, attempt: int, delay: float, error: BaseException
+    ) -> None:
+        with self._lock:
+            self.retries += 1
+            self.retry_seconds += delay
+
+    def on_cache(self, api: str, service: str, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the statistics as a dict, eg. for logging."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "bytes": self.bytes,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "retry_seconds": self.retry_seconds,
+                **{f"{phase}_seconds": self.seconds[phase] for phase in PHASES},
+            }
+
+
+class OpenTelemetryObserver(Observer):
+    """Report requests as OpenTelemetry spans and metrics.
+
+    Every request attempt becomes a `dmi_open_data.request` span, and timings,
+    bytes, retries and cache lookups are recorded on the
+    `dmi_open_data.request.duration`, `dmi_open_data.response.size`,
+    `dmi_open_data.retries` and `dmi_open_data.cache.lookups` instruments.
+    Requires `opentelemetry-api`.
+    """
+
+    def __init__(self, tracer_provider=None, meter_provider=None):
+        """Initialize OpenTelemetry observer.
+
+        Args:
+            tracer_provider (optional): Tracer provider. Defaults to None (global provider).
+            meter_provider (optional): Meter provider. Defaults to None (global provider).
+        """
+        try:
+            from opentelemetry import metrics as otel_metrics, trace as otel_trace
+        except ImportError:  # pragma: no cover
+            raise ImportError(
+                "opentelemetry-api is required: pip install dmi-open-data[otel]"
+            )
+        self._trace = otel_trace
+        self.tracer = otel_trace.get_tracer(
+            "dmi_open_data", tracer_provider=tracer_provider
+        )
+        meter = otel_metrics.get_meter("dmi_open_data", meter_provider=meter_provider)
+        self.duration = meter.create_histogram(
+            "dmi_open_data.request.duration",
+            unit="s",
+            description="Duration of DMI Open Data API requests per phase",
+        )
+        self.size = meter.create_counter(
+            "dmi_open_data.response.size",
+            unit="By",
+            description="Bytes received from the DMI Open Data API",
+        )
+        self.retries = meter.create_counter(
+            "dmi_open_data.retries", description="Retried requests"
+        )
+        self.cache_lookups = meter.create_counter(
+            "dmi_open_data.cache.lookups", description="Response cache lookups"
+        )
+
+    def on_request(self, event: RequestEvent) -> None:
+        status = "error" if event.status_code is None else str(event.status_code)
+        for phase in PHASES:
+            self.duration.record(
+                getattr(event, phase), {"phase": phase, "status_code": status}
+            )
+        self.size.add(event.bytes)
+        end_time = time.time_ns()
+        span = self.tracer.start_span(
+            "dmi_open_data.request",
+            start_time=end_time - int(event.duration * 1e9),
+            attributes={
+                "url.full": event.url.split("?", 1)[0],
+                "http.response.status_code": event.status_code or 0,
+                "dmi_open_data.wait": event.wait,
+                "dmi_open_data.download": event.download,
+                "dmi_open_data.decode": event.decode,
+                "dmi_open_data.bytes": event.bytes,
+            },
+        )
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end(end_time=end_time)
+
+    def on_retry(
+        self, url: str, attempt: int, delay: float, error: BaseException
+    ) -> None:
+        self.retries.add(1, {"error": type(error).__name__})
+
+    def on_cache(self, api: str, service: str, hit: bool) -> None:
+        self.cache_lookups.add(
+            1, {"service": service, "result": "hit" if hit else "miss"}
+        )
+
+
+class PrometheusObserver(Observer):
+    """Export request metrics with `prometheus_client`.
+
+    Exposes `<namespace>_request_seconds` (per phase), `<namespace>_requests_total`
+    (per status code), `<namespace>_response_bytes_total`,
+    `<namespace>_retries_total` and `<namespace>_cache_lookups_total`.
+    """
+
+    def __init__(self, registry=None, namespace: str = "dmi_open_data"):
+        """Initialize Prometheus observer.
+
+        Args:
+            registry (optional): Collector registry. Defaults to None (default registry).
+            namespace (str, optional): Metric name prefix. Defaults to "dmi_open_data".
+        """
+        try:
+            import prometheus_client
+        except ImportError:  # pragma: no cover
+            raise ImportError(
+                "prometheus_client is required: pip install dmi-open-data[prometheus]"
+            )
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        self.request_seconds = prometheus_client.Histogram(
+            "request_seconds",
+            "Duration of DMI Open Data API requests per phase",
+            ["phase"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.requests = prometheus_client.Counter(
+            "requests",
+            "DMI Open Data API requests",
+            ["status_code"],
+            namespace=namespace,
+            registry=registry,
+        )
+        self.response_bytes = prometheus_client.Counter(
+            "response_bytes",
+            "Bytes received from the DMI Open Data API",
+            namespace=namespace,
+            registry=registry,
+        )
+        self.retries = prometheus_client.Counter(
+            "retries", "Retried requests", namespace=namespace, registry=registry
+        )
+        self.cache_lookups = prometheus_client.Counter(
+            "cache_lookups",
+            "Response cache lookups",
+            ["result"],
+            namespace=namespace,
+            registry=registry,
+        )
+
+    def on_request(self, event: RequestEvent) -> None:
+        for phase in PHASES:
+            self.request_seconds.labels(phase).observe(getattr(event, phase))
+        self.requests.labels(
+            "error" if event.status_code is None else str(event.status_code)
+        ).inc()
+        self.response_bytes.inc(event.bytes)
+
+    def on_retry(
+        self, url: str, attempt: int, delay: float, error: BaseException
+    ) -> None:
+        self.retries.inc()
+
+    def on_cache(self, api: str, service: str, hit: bool) -> None:
+        self.cache_lookups.labels("hit" if hit else "miss").inc()
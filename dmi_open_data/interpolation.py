@@ -0,0 +1,246 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from dmi_open_data.enums import Parameter
+from dmi_open_data.station_index import _station_filter
+from dmi_open_data.utils import nearest_unit_vectors, unit_vectors
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class Interpolator:
+    """Estimate values at arbitrary points from a snapshot of station values.
+
+    The `k` nearest stations of every query point, and their distances, are
+    found once when the interpolator is built. Interpolating a snapshot then
+    only gathers and weights station values, so the same interpolator can be
+    reused for every new snapshot of a parameter. Stations without a value in
+    a snapshot are skipped, and the next nearest of the `k` neighbours are used.
+
+    Neighbours are searched with SciPy's k-d tree when SciPy is installed, and
+    by brute force over all stations in chunks otherwise.
+
+    Usage::
+
+        stations = client.get_stations()
+        interpolator = Interpolator.grid(
+            stations, latitudes=(54.5, 57.8), longitudes=(8.0, 15.2), step=0.05,
+            parameter=Parameter.TempDry)
+        observations = client.get_observations(
+            parameter=Parameter.TempDry, from_time=datetime.utcnow() - timedelta(minutes=10))
+        temperatures = interpolator.idw(observations)  # shape (n_latitudes, n_longitudes)
+    """
+
+    def __init__(
+        self,
+        stations: Sequence[Dict[str, Any]],
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        k: int = 8,
+        active_at: Optional[datetime] = None,
+        parameter: Optional[Parameter] = None,
+        chunk_size: int = 16384,
+    ):
+        """Find the nearest stations of the query points.
+
+        Args:
+            stations (Sequence[Dict[str, Any]]): Raw DMI stations as returned by
+                `DMIOpenDataClient.get_stations`.
+            latitudes (Sequence[float]): Latitudes of the query points.
+            longitudes (Sequence[float]): Longitudes of the query points.
+            k (int, optional): Number of neighbouring stations per point. Defaults to 8.
+            active_at (Optional[datetime], optional): Only use stations in operation
+                at this time. Defaults to None.
+            parameter (Optional[Parameter], optional): Only use stations reporting
+                this parameter. Defaults to None.
+            chunk_size (int, optional): Number of query points processed at a time,
+                bounding memory to `chunk_size` x number of stations distances.
+                Defaults to 16384.
+        """
+        if np is None:
+            raise ImportError(
+                "NumPy is required for interpolation: pip install dmi-open-data[numpy]"
+            )
+        if k < 1:
+            raise ValueError(f"Invalid number of neighbours: {k}")
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        if latitudes.shape != longitudes.shape:
+            raise ValueError("`latitudes` and `longitudes` must have the same shape")
+
+        self.station_ids, station_lats, station_lons = _stations(
+            stations, active_at=active_at, parameter=parameter
+        )
+        if len(self.station_ids) == 0:
+            raise ValueError("No stations with coordinates to interpolate from")
+        self.shape = latitudes.shape
+        self.grid_latitudes = self.grid_longitudes = None
+        self.k = min(k, len(self.station_ids))
+        self._weights = {}
+        self._station_positions = {
+            station_id: i for i, station_id in enumerate(self.station_ids)
+        }
+        self.indices, self.distances = nearest_unit_vectors(
+            unit_vectors(station_lats, station_lons),
+            unit_vectors(latitudes.ravel(), longitudes.ravel()),
+            k=self.k,
+            chunk_size=chunk_size,
+        )
+
+    @classmethod
+    def grid(
+        cls,
+        stations: Sequence[Dict[str, Any]],
+        latitudes: Tuple[float, float],
+        longitudes: Tuple[float, float],
+        step: float,
+        **kwargs,
+    ) -> "Interpolator":
+        """Build an interpolator over a regular latitude/longitude grid.
+
+        Args:
+            stations (Sequence[Dict[str, Any]]): Raw DMI stations.
+            latitudes (Tuple[float, float]): First and last latitude of the grid.
+            longitudes (Tuple[float, float]): First and last longitude of the grid.
+            step (float): Grid spacing in degrees.
+            **kwargs: Passed on to `Interpolator`.
+
+        Returns:
+            Interpolator: Interpolator whose estimates have shape
+                (number of latitudes, number of longitudes).
+        """
+        if np is None:
+            raise ImportError(
+                "NumPy is required for interpolation: pip install dmi-open-data[numpy]"
+            )
+        grid_lats = np.arange(latitudes[0], latitudes[1] + step / 2, step)
+        grid_lons = np.arange(longitudes[0], longitudes[1] + step / 2, step)
+        lats, lons = np.meshgrid(grid_lats, grid_lons, indexing="ij")
+        interpolator = cls(stations, latitudes=lats, longitudes=lons, **kwargs)
+        interpolator.grid_latitudes = grid_lats
+        interpolator.grid_longitudes = grid_lons
+        return interpolator
+
+    def station_values(self, observations: Sequence[Dict[str, Any]]) -> "np.ndarray":
+        """Arrange a snapshot of raw observations by station.
+
+        Args:
+            observations (Sequence[Dict[str, Any]]): Raw DMI observations of a
+                single parameter. The latest observation of each station is used.
+
+        Returns:
+            np.ndarray: Value of each station in `station_ids`, NaN where missing.
+        """
+        values = np.full(len(self.station_ids), np.nan)
+        observed = [None] * len(self.station_ids)
+        for observation in observations:
+            properties = observation["properties"]
+            i = self._station_positions.get(properties.get("stationId"))
+            value = properties.get("value")
+            if i is None or value is None:
+                continue
+            time = properties.get("observed") or properties.get("from") or ""
+            if observed[i] is None or time >= observed[i]:
+                values[i], observed[i] = value, time
+        return values
+
+    def idw(
+        self,
+        snapshot,
+        power: float = 2.0,
+        max_distance: Optional[float] = None,
+    ) -> "np.ndarray":
+        """Inverse distance weighted estimates.
+
+        Args:
+            snapshot (Union[Sequence[Dict[str, Any]], np.ndarray]): Raw DMI
+                observations, or station values as returned by `station_values`.
+            power (float, optional): Power of the inverse distance. Defaults to 2.
+            max_distance (Optional[float], optional): Ignore stations farther away
+                in km. Defaults to None (use all `k` neighbours).
+
+        Returns:
+            np.ndarray: Estimates with the shape of the query points, NaN where
+                no neighbouring station has a value.
+        """
+        values, valid = self._neighbour_values(snapshot, max_distance=max_distance)
+        weights = np.where(valid, self._inverse_distance_weights(power), 0.0)
+        total = weights.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            estimates = (weights * np.where(valid, values, 0.0)).sum(axis=1) / total
+        estimates[total == 0] = np.nan
+        return estimates.reshape(self.shape)
+
+    def nearest(self, snapshot, max_distance: Optional[float] = None) -> "np.ndarray":
+        """Value of the nearest station with a value.
+
+        Args:
+            snapshot (Union[Sequence[Dict[str, Any]], np.ndarray]): Raw DMI
+                observations, or station values as returned by `station_values`.
+            max_distance (Optional[float], optional): Ignore stations farther away
+                in km. Defaults to None.
+
+        Returns:
+            np.ndarray: Estimates with the shape of the query points, NaN where
+                no neighbouring station has a value.
+        """
+        values, valid = self._neighbour_values(snapshot, max_distance=max_distance)
+        first = valid.argmax(axis=1)
+        estimates = values[np.arange(len(values)), first]
+        estimates[~valid.any(axis=1)] = np.nan
+        return estimates.reshape(self.shape)
+
+    def _inverse_distance_weights(self, power: float) -> "np.ndarray":
+        weights = self._weights.get(power)
+        if weights is None:
+            # Points within a meter of a station take its value, through a
+            # weight that dwarfs all others without overflowing products
+            exact = self.distances < 1e-3
+            with np.errstate(divide="ignore"):
+                weights = np.where(exact, 1e150, self.distances**-power)
+            self._weights[power] = weights
+        return weights
+
+    def _neighbour_values(self, snapshot, max_distance: Optional[float]):
+        if isinstance(snapshot, np.ndarray):
+            station_values = snapshot
+        else:
+            station_values = self.station_values(snapshot)
+        if station_values.shape != (len(self.station_ids),):
+            raise ValueError(
+                f"Expected {len(self.station_ids)} station values, "
+                f"got shape {station_values.shape}"
+            )
+        values = station_values[self.indices]
+        valid = ~np.isnan(values)
+        if max_distance is not None:
+            valid &= self.distances <= max_distance
+        return values, valid
+
+
+def _stations(
+    stations: Sequence[Dict[str, Any]],
+    active_at: Optional[datetime],
+    parameter: Optional[Parameter],
+):
+    # Stations are listed once per validity period, keep the latest per station
+    predicate = _station_filter(active_at=active_at, parameter=parameter)
+    latest = {}
+    for station in stations:
+        coordinates = (station.get("geometry") or {}).get("coordinates")
+        if coordinates is None or len(coordinates) < 2 or None in coordinates[:2]:
+            continue
+        if predicate is not None and not predicate(station):
+            continue
+        properties = station.get("properties", {})
+        station_id = properties.get("stationId")
+        valid_from = properties.get("validFrom") or ""
+        if station_id not in latest or valid_from >= latest[station_id][0]:
+            latest[station_id] = (valid_from, coordinates[1], coordinates[0])
+    station_ids = list(latest)
+    lats = np.array([latest[i][1] for i in station_ids], dtype=np.float64)
+    lons = np.array([latest[i][2] for i in station_ids], dtype=np.float64)
+    return station_ids, lats, lons
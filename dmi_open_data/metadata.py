@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from dmi_open_data.decoding import loads
+
+
+class StationCatalog:
+    """DMI stations indexed by feature id and `stationId`.
+
+    The station collection lists a station once per validity period, so a
+    `stationId` can have several records. Refreshed collections are merged by
+    feature id, and `version` is only incremented when a record was added,
+    changed or removed. The HTTP validators of the response the stations came
+    from are kept for conditional requests.
+    """
+
+    def __init__(
+        self,
+        stations: Iterable[Dict[str, Any]] = (),
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """Initialize station catalog.
+
+        Args:
+            stations (Iterable[Dict[str, Any]], optional): Raw DMI stations.
+                Defaults to () (empty).
+            etag (Optional[str], optional): ETag of the stations. Defaults to None.
+            last_modified (Optional[str], optional): Last-Modified of the stations.
+                Defaults to None.
+        """
+        self.etag = etag
+        self.last_modified = last_modified
+        self.version = 0
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_station_id: Dict[str, List[Dict[str, Any]]] = {}
+        self.merge(stations)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, station_id: str) -> bool:
+        return station_id in self._by_station_id
+
+    @property
+    def stations(self) -> List[Dict[str, Any]]:
+        """All raw DMI station records."""
+        return list(self._records.values())
+
+    def station_ids(self) -> List[str]:
+        """All distinct `stationId`s."""
+        return list(self._by_station_id)
+
+    def get(self, station_id: str) -> Optional[Dict[str, Any]]:
+        """Get the latest record of a station.
+
+        Args:
+            station_id (str): DMI `stationId`.
+
+        Returns:
+            Optional[Dict[str, Any]]: Record with the latest `validFrom`, or None
+                if the station is unknown.
+        """
+        history = self._by_station_id.get(station_id)
+        return None if not history else history[-1]
+
+    def history(self, station_id: str) -> List[Dict[str, Any]]:
+        """Get all records of a station, ordered by `validFrom`."""
+        return list(self._by_station_id.get(station_id, []))
+
+    def merge(
+        self, stations: Iterable[Dict[str, Any]], complete: bool = False
+    ) -> Dict[str, int]:
+        """Merge station records, keeping unchanged records as they are.
+
+        Args:
+            stations (Iterable[Dict[str, Any]]): Raw DMI stations.
+            complete (bool, optional): The stations are the full collection, so
+                records missing from it are removed. Defaults to False.
+
+        Returns:
+            Dict[str, int]: Number of `added`, `updated` and `removed` records.
+        """
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        seen = set()
+        for station in stations:
+            key = _record_key(station)
+            seen.add(key)
+            current = self._records.get(key)
+            if current is None:
+                changes["added"] += 1
+            elif current != station:
+                changes["updated"] += 1
+            else:
+                continue
+            self._records[key] = station
+        if complete:
+            for key in [key for key in self._records if key not in seen]:
+                del self._records[key]
+                changes["removed"] += 1
+        if any(changes.values()):
+            self.version += 1
+            self._index()
+        return changes
+
+    def _index(self) -> None:
+        by_station_id = {}
+        for station in self._records.values():
+            station_id = station.get("properties", {}).get("stationId")
+            by_station_id.setdefault(station_id, []).append(station)
+        for history in by_station_id.values():
+            history.sort(key=lambda s: s.get("properties", {}).get("validFrom") or "")
+        self._by_station_id = by_station_id
+
+
+class StationSnapshot:
+    """Station metadata persisted to a local JSON file.
+
+    Loading the snapshot takes milliseconds instead of downloading the full
+    station collection, which matters for short-lived processes that look up
+    stations on every start. The file stores a SHA-256 checksum of the
+    stations, which is verified on load and compared on refresh: when the
+    downloaded stations did not change, only the file's modification time,
+    which serves as the time of the last refresh, is updated. The HTTP
+    validators of the stations are stored along with them, so refreshing a
+    snapshot can be a conditional request.
+
+    Usage::
+
+        snapshot = StationSnapshot(path="dmi-stations.json")
+        client = DMIOpenDataClient(api_key=..., station_snapshot=snapshot)
+        client.get_closest_station(latitude=55.7, longitude=12.5)
+    """
+
+    def __init__(self, path: str):
+        """Initialize station snapshot.
+
+        Args:
+            path (str): Path of the snapshot file.
+        """
+        self.path = path
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the snapshot was last refreshed, or None if missing."""
+        try:
+            return time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def load(self, max_age: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """Load stations from the snapshot.
+
+        Args:
+            max_age (Optional[float], optional): Maximum age in seconds.
+                Defaults to None (any age).
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Raw DMI stations, or None if the
+                snapshot is missing, too old or corrupt.
+        """
+        catalog = self.load_catalog(max_age=max_age)
+        return None if catalog is None else catalog.stations
+
+    def load_catalog(self, max_age: Optional[float] = None) -> Optional[StationCatalog]:
+        """Load stations and their HTTP validators from the snapshot.
+
+        Args:
+            max_age (Optional[float], optional): Maximum age in seconds.
+                Defaults to None (any age).
+
+        Returns:
+            Optional[StationCatalog]: Stations, or None if the snapshot is
+                missing, too old or corrupt.
+        """
+        age = self.age
+        if age is None or (max_age is not None and age > max_age):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                data = loads(f.read())
+            stations = data["stations"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if stations_checksum(stations) != data.get("checksum"):
+            return None
+        return StationCatalog(
+            stations, etag=data.get("etag"), last_modified=data.get("last_modified")
+        )
+
+    def checksum(self) -> Optional[str]:
+        """Checksum stored in the snapshot, or None if missing or unreadable."""
+        header = self._header()
+        return None if header is None else header.get("checksum")
+
+    def save(
+        self,
+        stations: Sequence[Dict[str, Any]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> bool:
+        """Store stations, rewriting the file only if they changed.
+
+        Args:
+            stations (Sequence[Dict[str, Any]]): Raw DMI stations.
+            etag (Optional[str], optional): ETag of the stations. Defaults to None.
+            last_modified (Optional[str], optional): Last-Modified of the stations.
+                Defaults to None.
+
+        Returns:
+            bool: Whether the stations differed from the stored ones.
+        """
+        header = {
+            "checksum": stations_checksum(stations),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        current = self._header()
+        if current is not None and all(
+            current.get(key) == value for key, value in header.items()
+        ):
+            os.utime(self.path)
+            return False
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**header, "stations": list(stations)}, f)
+        os.replace(tmp_path, self.path)
+        return current is None or current.get("checksum") != header["checksum"]
+
+    def _header(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                data = loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        return {key: value for key, value in data.items() if key != "stations"}
+
+
+def _record_key(station: Dict[str, Any]) -> str:
+    properties = station.get("properties", {})
+    return station.get("id") or (
+        f"{properties.get('stationId')}/{properties.get('validFrom')}"
+    )
+
+
+def stations_checksum(stations: Sequence[Dict[str, Any]]) -> str:
+    """SHA-256 checksum of stations, independent of dictionary key order."""
+    data = json.dumps(list(stations), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
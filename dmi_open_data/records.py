@@ -0,0 +1,240 @@
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from dmi_open_data.enums import Parameter, ClimateDataParameter
+
+_PARAMETERS = {parameter.value: parameter for parameter in Parameter}
+_CLIMATE_DATA_PARAMETERS = {
+    parameter.value: parameter for parameter in ClimateDataParameter
+}
+
+Coordinates = Optional[Tuple[float, ...]]
+
+
+class _Record:
+    """Base class of compact records parsed from GeoJSON features.
+
+    Records use `__slots__` instead of a per-instance `__dict__`, station ids
+    and other repeated strings are interned, parameter ids are mapped to their
+    enum member and timestamps are parsed to naive UTC datetimes.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @property
+    def longitude(self) -> Optional[float]:
+        return None if self.coordinates is None else self.coordinates[0]
+
+    @property
+    def latitude(self) -> Optional[float]:
+        return None if self.coordinates is None else self.coordinates[1]
+
+
+class Observation(_Record):
+    """Single DMI observation."""
+
+    __slots__ = ("id", "station_id", "parameter", "observed", "value", "coordinates")
+
+    @classmethod
+    def from_feature(
+        cls, feature: Dict[str, Any], coordinates_cache: Optional[Dict] = None
+    ) -> "Observation":
+        """Parse a raw observation.
+
+        Args:
+            feature (Dict[str, Any]): Raw DMI observation.
+            coordinates_cache (Optional[Dict], optional): Dictionary used to share
+                coordinates between records. Defaults to None (not shared).
+
+        Returns:
+            Observation: Parsed observation.
+        """
+        properties = feature["properties"]
+        return cls(
+            id=feature.get("id"),
+            station_id=_intern(properties.get("stationId")),
+            parameter=_parameter(_PARAMETERS, properties.get("parameterId")),
+            observed=_parse_time(properties.get("observed")),
+            value=properties.get("value"),
+            coordinates=_coordinates(feature, coordinates_cache),
+        )
+
+
+class ClimateValue(_Record):
+    """Single DMI climate data value."""
+
+    __slots__ = (
+        "id",
+        "station_id",
+        "parameter",
+        "from_time",
+        "to_time",
+        "time_resolution",
+        "value",
+        "coordinates",
+    )
+
+    @classmethod
+    def from_feature(
+        cls, feature: Dict[str, Any], coordinates_cache: Optional[Dict] = None
+    ) -> "ClimateValue":
+        """Parse a raw climate data value.
+
+        Args:
+            feature (Dict[str, Any]): Raw DMI climate data value.
+            coordinates_cache (Optional[Dict], optional): Dictionary used to share
+                coordinates between records. Defaults to None (not shared).
+
+        Returns:
+            ClimateValue: Parsed climate data value.
+        """
+        properties = feature["properties"]
+        return cls(
+            id=feature.get("id"),
+            station_id=_intern(properties.get("stationId")),
+            parameter=_parameter(
+                _CLIMATE_DATA_PARAMETERS, properties.get("parameterId")
+            ),
+            from_time=_parse_time(properties.get("from")),
+            to_time=_parse_time(properties.get("to")),
+            time_resolution=_intern(properties.get("timeResolution")),
+            value=properties.get("value"),
+            coordinates=_coordinates(feature, coordinates_cache),
+        )
+
+
+class Station(_Record):
+    """DMI station."""
+
+    __slots__ = (
+        "id",
+        "station_id",
+        "name",
+        "country",
+        "type",
+        "status",
+        "owner",
+        "parameters",
+        "station_height",
+        "valid_from",
+        "valid_to",
+        "operation_from",
+        "operation_to",
+        "coordinates",
+    )
+
+    @classmethod
+    def from_feature(
+        cls, feature: Dict[str, Any], coordinates_cache: Optional[Dict] = None
+    ) -> "Station":
+        """Parse a raw station.
+
+        Args:
+            feature (Dict[str, Any]): Raw DMI station.
+            coordinates_cache (Optional[Dict], optional): Dictionary used to share
+                coordinates between records. Defaults to None (not shared).
+
+        Returns:
+            Station: Parsed station.
+        """
+        properties = feature["properties"]
+        return cls(
+            id=feature.get("id"),
+            station_id=_intern(properties.get("stationId")),
+            name=properties.get("name"),
+            country=_intern(properties.get("country")),
+            type=_intern(properties.get("type")),
+            status=_intern(properties.get("status")),
+            owner=_intern(properties.get("owner")),
+            parameters=tuple(
+                _parameter(_PARAMETERS, parameter_id)
+                for parameter_id in properties.get("parameterId") or []
+            ),
+            station_height=properties.get("stationHeight"),
+            valid_from=_parse_time(properties.get("validFrom")),
+            valid_to=_parse_time(properties.get("validTo")),
+            operation_from=_parse_time(properties.get("operationFrom")),
+            operation_to=_parse_time(properties.get("operationTo")),
+            coordinates=_coordinates(feature, coordinates_cache),
+        )
+
+
+def parse_observations(features: Iterable[Dict[str, Any]]) -> List[Observation]:
+    """Parse raw observations, sharing coordinates between records.
+
+    Args:
+        features (Iterable[Dict[str, Any]]): Raw DMI observations. Can be a lazy
+            iterator, so the raw features need not be held in memory.
+
+    Returns:
+        List[Observation]: Parsed observations.
+    """
+    cache = {}
+    return [Observation.from_feature(feature, cache) for feature in features]
+
+
+def parse_climate_data(features: Iterable[Dict[str, Any]]) -> List[ClimateValue]:
+    """Parse raw climate data values, sharing coordinates between records.
+
+    Args:
+        features (Iterable[Dict[str, Any]]): Raw DMI climate data values.
+
+    Returns:
+        List[ClimateValue]: Parsed climate data values.
+    """
+    cache = {}
+    return [ClimateValue.from_feature(feature, cache) for feature in features]
+
+
+def parse_stations(features: Iterable[Dict[str, Any]]) -> List[Station]:
+    """Parse raw stations.
+
+    Args:
+        features (Iterable[Dict[str, Any]]): Raw DMI stations.
+
+    Returns:
+        List[Station]: Parsed stations.
+    """
+    cache = {}
+    return [Station.from_feature(feature, cache) for feature in features]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+def _parameter(
+    parameters: Dict[str, Any], parameter_id: Optional[str]
+) -> Union[Parameter, ClimateDataParameter, str, None]:
+    # Parameters added to the API after this release are kept as strings
+    return parameters.get(parameter_id) or _intern(parameter_id)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return datetime.fromisoformat(value.rstrip("Z"))
+
+
+def _coordinates(feature: Dict[str, Any], cache: Optional[Dict]) -> Coordinates:
+    geometry = feature.get("geometry")
+    if geometry is None:
+        return None
+    coordinates = tuple(geometry["coordinates"])
+    if cache is None:
+        return coordinates
+    return cache.setdefault(coordinates, coordinates)
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from typing import Optional, Sequence
+
+from dmi_open_data.exceptions import HTTPError, CircuitOpenError
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared by threads and coroutines.
+
+    Callers reserve a token under a lock and then sleep outside of it, so
+    waiting callers are served in order without holding the lock.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize token bucket.
+
+        Args:
+            rate (float): Number of requests allowed per second.
+            burst (int, optional): Number of requests allowed back to back. Defaults to 1.
+        """
+        if rate <= 0:
+            raise ValueError(f"Invalid value for `rate`: {rate}")
+        if burst < 1:
+            raise ValueError(f"Invalid value for `burst`: {burst}")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        """Block until a request is allowed."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait without blocking the event loop until a request is allowed."""
+        import asyncio
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RetryPolicy:
+    """Retry transient failures with exponential backoff and full jitter.
+
+    Transient failures are connection errors, timeouts and responses with a
+    status code in `retry_statuses`. Other errors, eg. 4xx responses caused
+    by invalid arguments, are raised immediately. A `Retry-After` header
+    overrides the computed backoff, but never beyond `backoff_max`.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses: Sequence[int] = (429, 500, 502, 503, 504),
+    ):
+        """Initialize retry policy.
+
+        Args:
+            max_attempts (int, optional): Maximum number of attempts per request. Defaults to 5.
+            backoff_base (float, optional): Backoff in seconds before the first retry.
+                Doubled for every following retry. Defaults to 0.5.
+            backoff_max (float, optional): Maximum backoff in seconds. Defaults to 30.
+            retry_statuses (Sequence[int], optional): HTTP status codes considered
+                transient. Defaults to (429, 500, 502, 503, 504).
+        """
+        if max_attempts < 1:
+            raise ValueError(f"Invalid value for `max_attempts`: {max_attempts}")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = tuple(retry_statuses)
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Whether the failure is transient."""
+        if isinstance(exc, HTTPError):
+            return exc.status_code in self.retry_statuses
+        import requests
+
+        return isinstance(
+            exc,
+            (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError,
+            ),
+        )
+
+    def delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (starting at 1)."""
+        retry_after = getattr(exc, "retry_after", None)
+        if retry_after is not None:
+            return min(self.backoff_max, max(0.0, retry_after))
+        backoff = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+class CircuitBreaker:
+    """Stop sending requests after repeated transient failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests fail fast with `CircuitOpenError`. After `recovery_time` seconds
+    a single trial request is let through; success closes the circuit again.
+    """
+
+    def __init__(self, failure_threshold: int = 10, recovery_time: float = 30.0):
+        """Initialize circuit breaker.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures before opening. Defaults to 10.
+            recovery_time (float, optional): Seconds before a trial request is allowed. Defaults to 30.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """Raise `CircuitOpenError` if requests are currently not allowed."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.recovery_time - time.monotonic()
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"Circuit breaker open after {self._failures} consecutive failures"
+                )
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
@@ -0,0 +1,155 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+
+class Shard(NamedTuple):
+    from_time: datetime
+    to_time: datetime
+    parameter: Optional[Any] = None
+    station_id: Optional[Any] = None
+
+
+def split_time_range(
+    from_time: datetime, to_time: datetime, n: int
+) -> List[Shard]:
+    """Split a time range into `n` adjacent, non-overlapping windows.
+
+    Args:
+        from_time (datetime): Start of the range (inclusive).
+        to_time (datetime): End of the range (exclusive).
+        n (int): Number of windows.
+
+    Returns:
+        List[Shard]: Time windows covering the range in order.
+    """
+    if to_time <= from_time:
+        raise ValueError(
+            f"`to_time` ({to_time}) must be after `from_time` ({from_time})"
+        )
+    if n < 1:
+        raise ValueError(f"Invalid number of shards: {n}")
+    step = (to_time - from_time) / n
+    bounds = [from_time + step * i for i in range(n)] + [to_time]
+    return [
+        Shard(from_time=start, to_time=end)
+        for start, end in zip(bounds[:-1], bounds[1:])
+        if end > start
+    ]
+
+
+def plan_shards(
+    from_time: datetime,
+    to_time: datetime,
+    n_time_shards: int = 8,
+    parameters: Optional[Sequence[Any]] = None,
+    station_ids: Optional[Sequence[Any]] = None,
+) -> List[Shard]:
+    """Plan sub-requests covering a time range, and optionally a set of
+    parameters and stations.
+
+    Args:
+        from_time (datetime): Start of the range (inclusive).
+        to_time (datetime): End of the range (exclusive).
+        n_time_shards (int, optional): Number of time windows. Defaults to 8.
+        parameters (Optional[Sequence[Any]], optional): Parameters to shard by.
+            Defaults to None (all parameters in every shard).
+        station_ids (Optional[Sequence[Any]], optional): Stations to shard by.
+            Defaults to None (all stations in every shard).
+
+    Returns:
+        List[Shard]: Planned shards.
+    """
+    return [
+        window._replace(parameter=parameter, station_id=station_id)
+        for parameter in (parameters or [None])
+        for station_id in (station_ids or [None])
+        for window in split_time_range(from_time, to_time, n_time_shards)
+    ]
+
+
+def fetch_shards(
+    fetch: Callable[[Shard, int, int], Dict[str, Any]],
+    shards: Sequence[Shard],
+    limit: int = 10000,
+    max_workers: int = 8,
+    time_key: str = "observed",
+    min_window: timedelta = timedelta(seconds=1),
+) -> List[Dict[str, Any]]:
+    """Fetch shards on a thread pool and merge the results.
+
+    A response is truncated when it has a `next` link, reports more matches in
+    `numberMatched`, or comes back full (`limit` features). A truncated shard
+    is split in half and both halves are fetched again. Shards that cannot be
+    split usefully, because they are already `min_window` long or all features
+    of the page share a single time, are paged through by offset instead.
+
+    Args:
+        fetch (Callable[[Shard, int, int], Dict[str, Any]]): Fetches the
+            FeatureCollection of a single shard given the shard, a limit and an
+            offset.
+        shards (Sequence[Shard]): Shards to fetch.
+        limit (int, optional): Maximum number of features per request. Defaults to 10000.
+        max_workers (int, optional): Number of worker threads. Defaults to 8.
+        time_key (str, optional): Feature property to order results by.
+            Defaults to "observed".
+        min_window (timedelta, optional): Shards are never split below this
+            duration. Defaults to 1 second.
+
+    Returns:
+        List[Dict[str, Any]]: Features ordered by time, without duplicates.
+    """
+    features_by_id = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(fetch, shard, limit, 0): (shard, 0) for shard in shards
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                shard, offset = pending.pop(future)
+                res = future.result()
+                features = res.get("features", [])
+                for feature in features:
+                    features_by_id[_feature_key(feature)] = feature
+                if len(features) == 0 or not _is_truncated(res, limit=limit):
+                    continue
+                times = {
+                    feature.get("properties", {}).get(time_key) for feature in features
+                }
+                if (
+                    offset > 0
+                    or len(times) == 1
+                    or shard.to_time - shard.from_time <= min_window
+                ):
+                    offset += len(features)
+                    pending[executor.submit(fetch, shard, limit, offset)] = (
+                        shard,
+                        offset,
+                    )
+                    continue
+                for half in split_time_range(shard.from_time, shard.to_time, 2):
+                    half = half._replace(
+                        parameter=shard.parameter, station_id=shard.station_id
+                    )
+                    pending[executor.submit(fetch, half, limit, 0)] = (half, 0)
+    return sorted(
+        features_by_id.values(),
+        key=lambda feature: feature.get("properties", {}).get(time_key) or "",
+    )
+
+
+def _is_truncated(res: Dict[str, Any], limit: int) -> bool:
+    features = res.get("features", [])
+    if any(link.get("rel") == "next" for link in res.get("links", [])):
+        return True
+    if res.get("numberMatched") is not None:
+        return res["numberMatched"] > len(features)
+    return len(features) >= limit
+
+
+def _feature_key(feature: Dict[str, Any]) -> Any:
+    if feature.get("id") is not None:
+        return feature["id"]
+    properties = feature.get("properties", {})
+    return tuple(sorted((key, str(value)) for key, value in properties.items()))
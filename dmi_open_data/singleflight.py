@@ -0,0 +1,110 @@
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into a single call.
+
+    While a call for a key is in flight, other callers with the same key wait
+    for it and receive the same result (or exception) instead of starting
+    their own call. Results are shared, so callers should not mutate them.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call `func(*args, **kwargs)` unless a call with the same key is in flight.
+
+        Args:
+            key (Hashable): Key identifying identical calls.
+            func (Callable[..., Any]): Function to call.
+
+        Returns:
+            Any: Result of the call.
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent identical coroutine calls into a single call.
+
+    See `SingleFlight`.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, "asyncio.Future"] = {}
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """Await `func(*args, **kwargs)` unless a call with the same key is in flight.
+
+        Args:
+            key (Hashable): Key identifying identical calls.
+            func (Callable[..., Awaitable[Any]]): Coroutine function to call.
+
+        Returns:
+            Any: Result of the call.
+        """
+        import asyncio
+
+        self.calls += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_event_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else is waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
@@ -0,0 +1,255 @@
+import heapq
+from datetime import datetime, timezone
+from math import asin, cos, radians, sin
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dmi_open_data.enums import Parameter
+from dmi_open_data.constants import CONST_EARTH_RADIUS
+from dmi_open_data.utils import nearest_unit_vectors, unit_vectors
+
+
+class StationIndex:
+    """Spatial index over DMI stations.
+
+    Stations are stored in a k-d tree over 3D unit vectors, where straight-line
+    (chord) distance is monotonic in great-circle distance. Queries therefore
+    touch only a handful of stations instead of the full station list.
+
+    Usage::
+
+        index = StationIndex(client.get_stations())
+        [(station, distance)] = index.nearest(latitude=55.71, longitude=12.56)
+    """
+
+    def __init__(self, stations: List[Dict[str, Any]]):
+        """Build index from raw DMI stations.
+
+        Args:
+            stations (List[Dict[str, Any]]): Raw DMI stations as returned by
+                `DMIOpenDataClient.get_stations`. Stations without coordinates are ignored.
+        """
+        self.stations = []
+        self._points = []
+        for station in stations:
+            coordinates = station.get("geometry", {}).get("coordinates")
+            if coordinates is None or len(coordinates) < 2:
+                continue
+            lat, lon = coordinates[1], coordinates[0]
+            if lat is None or lon is None:
+                continue
+            self.stations.append(station)
+            self._points.append(_unit_vector(lat, lon))
+        self._tree = _build(list(range(len(self._points))), self._points, depth=0)
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        active_at: Optional[datetime] = None,
+        parameter: Optional[Parameter] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Get the `k` stations closest to given coordinates.
+
+        Args:
+            latitude (float): Latitude coordinate.
+            longitude (float): Longitude coordinate.
+            k (int, optional): Number of stations. Defaults to 1.
+            active_at (Optional[datetime], optional): Only consider stations in operation
+                at this time. Defaults to None.
+            parameter (Optional[Parameter], optional): Only consider stations reporting
+                this parameter. Defaults to None.
+
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: Stations and their distance in km,
+                closest first.
+        """
+        predicate = _station_filter(active_at=active_at, parameter=parameter)
+        query = _unit_vector(latitude, longitude)
+        heap = []
+        self._search_nearest(self._tree, query, k, heap, predicate)
+        return [
+            (self.stations[i], _chord2km(-negative_dist2))
+            for negative_dist2, i in sorted(heap, reverse=True)
+        ]
+
+    def within_radius(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        active_at: Optional[datetime] = None,
+        parameter: Optional[Parameter] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Get all stations within a radius of given coordinates.
+
+        Args:
+            latitude (float): Latitude coordinate.
+            longitude (float): Longitude coordinate.
+            radius (float): Radius in km.
+            active_at (Optional[datetime], optional): Only consider stations in operation
+                at this time. Defaults to None.
+            parameter (Optional[Parameter], optional): Only consider stations reporting
+                this parameter. Defaults to None.
+
+        Returns:
+            List[Tuple[Dict[str, Any], float]]: Stations and their distance in km,
+                closest first.
+        """
+        predicate = _station_filter(active_at=active_at, parameter=parameter)
+        query = _unit_vector(latitude, longitude)
+        max_dist2 = _km2chord(radius) ** 2
+        found = []
+        self._search_radius(self._tree, query, max_dist2, found, predicate)
+        return [(self.stations[i], _chord2km(dist2)) for dist2, i in sorted(found)]
+
+    def nearest_many(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        k: int = 1,
+        active_at: Optional[datetime] = None,
+        parameter: Optional[Parameter] = None,
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """Get the `k` closest stations for each pair of coordinates.
+
+        With NumPy installed all coordinates are queried at once, over arrays
+        (with SciPy's k-d tree when SciPy is installed). Otherwise each pair of
+        coordinates is looked up in the index in turn. See `nearest`.
+        """
+        if len(latitudes) != len(longitudes):
+            raise ValueError("`latitudes` and `longitudes` must have the same length")
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover
+            return [
+                self.nearest(
+                    latitude=latitude,
+                    longitude=longitude,
+                    k=k,
+                    active_at=active_at,
+                    parameter=parameter,
+                )
+                for latitude, longitude in zip(latitudes, longitudes)
+            ]
+        predicate = _station_filter(active_at=active_at, parameter=parameter)
+        candidates = [
+            i
+            for i, station in enumerate(self.stations)
+            if predicate is None or predicate(station)
+        ]
+        if len(candidates) == 0 or k < 1:
+            return [[] for _ in latitudes]
+        indices, distances = nearest_unit_vectors(
+            np.asarray(self._points, dtype=np.float64)[candidates],
+            unit_vectors(
+                np.asarray(latitudes, dtype=np.float64),
+                np.asarray(longitudes, dtype=np.float64),
+            ),
+            k=min(k, len(candidates)),
+            chunk_size=16384,
+        )
+        return [
+            [
+                (self.stations[candidates[i]], float(distance))
+                for i, distance in zip(row, row_distances)
+            ]
+            for row, row_distances in zip(indices.tolist(), distances.tolist())
+        ]
+
+    def _search_nearest(self, node, query, k, heap, predicate) -> None:
+        if node is None:
+            return
+        i, axis, left, right = node
+        point = self._points[i]
+        if predicate is None or predicate(self.stations[i]):
+            dist2 = _dist2(point, query)
+            if len(heap) < k:
+                heapq.heappush(heap, (-dist2, i))
+            elif dist2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-dist2, i))
+        delta = query[axis] - point[axis]
+        near, far = (left, right) if delta < 0 else (right, left)
+        self._search_nearest(near, query, k, heap, predicate)
+        if len(heap) < k or delta * delta < -heap[0][0]:
+            self._search_nearest(far, query, k, heap, predicate)
+
+    def _search_radius(self, node, query, max_dist2, found, predicate) -> None:
+        if node is None:
+            return
+        i, axis, left, right = node
+        point = self._points[i]
+        dist2 = _dist2(point, query)
+        if dist2 <= max_dist2 and (predicate is None or predicate(self.stations[i])):
+            found.append((dist2, i))
+        delta = query[axis] - point[axis]
+        near, far = (left, right) if delta < 0 else (right, left)
+        self._search_radius(near, query, max_dist2, found, predicate)
+        if delta * delta <= max_dist2:
+            self._search_radius(far, query, max_dist2, found, predicate)
+
+
+def _build(indices: List[int], points: List[Tuple[float, float, float]], depth: int):
+    if len(indices) == 0:
+        return None
+    axis = depth % 3
+    indices.sort(key=lambda i: points[i][axis])
+    median = len(indices) // 2
+    return (
+        indices[median],
+        axis,
+        _build(indices[:median], points, depth + 1),
+        _build(indices[median + 1 :], points, depth + 1),
+    )
+
+
+def _unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    lat, lon = radians(lat), radians(lon)
+    return (cos(lat) * cos(lon), cos(lat) * sin(lon), sin(lat))
+
+
+def _dist2(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+def _chord2km(dist2: float) -> float:
+    return 2 * CONST_EARTH_RADIUS * asin(min(1.0, dist2**0.5 / 2))
+
+
+def _km2chord(km: float) -> float:
+    return 2 * sin(min(km / CONST_EARTH_RADIUS, 3.141592653589793) / 2)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    time = datetime.fromisoformat(value.rstrip("Z"))
+    if time.tzinfo is not None:
+        time = time.astimezone(timezone.utc).replace(tzinfo=None)
+    return time
+
+
+def _station_filter(
+    active_at: Optional[datetime] = None, parameter: Optional[Parameter] = None
+) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    if active_at is None and parameter is None:
+        return None
+
+    def predicate(station: Dict[str, Any]) -> bool:
+        properties = station.get("properties", {})
+        if active_at is not None:
+            operation_from = _parse_time(properties.get("operationFrom"))
+            operation_to = _parse_time(properties.get("operationTo"))
+            if operation_from is not None and active_at < operation_from:
+                return False
+            if operation_to is not None and active_at >= operation_to:
+                return False
+        if parameter is not None:
+            if parameter.value not in (properties.get("parameterId") or []):
+                return False
+        return True
+
+    return predicate
@@ -0,0 +1,281 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dmi_open_data.enums import Parameter, ClimateDataParameter
+
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    np = pa = pq = None
+
+
+class ParquetStore:
+    """Local Parquet mirror of DMI observations and climate data.
+
+    Data is partitioned as
+    `<root>/api=<api>/parameter=<parameter>/station=<stationId>/month=<YYYY-MM>/`.
+    Every partition keeps a high-water mark of the latest timestamp written,
+    and every synced query the time it is synced up to. Later runs only fetch
+    data from shortly before that time, `overlap`, so observations of a station
+    that arrive late are still picked up, while rows at or before the
+    watermark of their partition are skipped.
+
+    Data is fetched and written one calendar month at a time, and the
+    watermarks are checkpointed after each month. Files and watermarks are
+    written to a temporary file and atomically renamed, and a month that was
+    interrupted before its checkpoint rewrites the same part files, so an
+    interrupted sync can simply be rerun.
+
+    Usage::
+
+        store = ParquetStore(root="dmi-lake", client=client)
+        store.sync_observations(
+            parameters=[Parameter.TempDry], since=datetime(2011, 1, 1))
+    """
+
+    def __init__(self, root: str, client, overlap: timedelta = timedelta(days=1)):
+        """Initialize Parquet store.
+
+        Args:
+            root (str): Root directory of the store.
+            client (DMIOpenDataClient): Client used to fetch data.
+            overlap (timedelta, optional): How far before the end of the previous
+                run a sync starts, to pick up late data. Defaults to 1 day.
+        """
+        if pa is None:
+            raise ImportError(
+                "pyarrow is required for Parquet sync: pip install dmi-open-data[arrow]"
+            )
+        self.root = root
+        self.client = client
+        self.overlap = overlap
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def watermarks_path(self) -> str:
+        return os.path.join(self.root, "_watermarks.json")
+
+    def watermarks(self) -> Dict[str, str]:
+        """Get high-water marks of partitions, keyed by
+        `<api>/<parameter>/<stationId>/<YYYY-MM>`."""
+        return self._load_state()["partitions"]
+
+    def synced_through(self) -> Dict[str, str]:
+        """Get the time each synced query is synced up to (exclusive), keyed by
+        `<api>/<parameter>/<stationId or *>`."""
+        return self._load_state()["queries"]
+
+    def _load_state(self) -> Dict[str, Any]:
+        state = {"sequence": 0, "queries": {}, "partitions": {}}
+        if os.path.exists(self.watermarks_path):
+            with open(self.watermarks_path, "r") as f:
+                state.update(json.load(f))
+        return state
+
+    def sync_observations(
+        self,
+        parameters: Sequence[Parameter],
+        since: datetime,
+        station_ids: Optional[Sequence[str]] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """Fetch observations newer than the stored watermarks.
+
+        Args:
+            parameters (Sequence[Parameter]): Parameters to sync.
+            since (datetime): Start of data for queries never synced before.
+            station_ids (Optional[Sequence[str]], optional): Stations to sync.
+                Defaults to None (all stations).
+            until (Optional[datetime], optional): End of data to sync.
+                Defaults to None (now).
+
+        Returns:
+            Dict[str, int]: Number of new rows per synced query.
+        """
+        rows = {}
+        for parameter in parameters:
+            for station_id in station_ids or [None]:
+                key, n_rows = self._sync(
+                    api="metObs",
+                    parameter=parameter,
+                    station_id=station_id,
+                    since=since,
+                    until=until,
+                    time_column="observed",
+                    fetch=self.client.get_observations_table,
+                )
+                rows[key] = n_rows
+        return rows
+
+    def sync_climate_data(
+        self,
+        parameters: Sequence[ClimateDataParameter],
+        since: datetime,
+        station_ids: Optional[Sequence[str]] = None,
+        until: Optional[datetime] = None,
+        time_resolution: str = "day",
+    ) -> Dict[str, int]:
+        """Fetch climate data newer than the stored watermarks.
+
+        Args:
+            parameters (Sequence[ClimateDataParameter]): Parameters to sync.
+            since (datetime): Start of data for queries never synced before.
+            station_ids (Optional[Sequence[str]], optional): Stations to sync.
+                Defaults to None (all stations).
+            until (Optional[datetime], optional): End of data to sync.
+                Defaults to None (now).
+            time_resolution (str, optional): Time resolution (hour/day/month/year).
+                Defaults to "day".
+
+        Returns:
+            Dict[str, int]: Number of new rows per synced query.
+        """
+
+        def fetch(**kwargs):
+            return self.client.get_climate_data_table(
+                time_resolution=time_resolution, **kwargs
+            )
+
+        rows = {}
+        for parameter in parameters:
+            for station_id in station_ids or [None]:
+                key, n_rows = self._sync(
+                    api=f"climateData-{time_resolution}",
+                    parameter=parameter,
+                    station_id=station_id,
+                    since=since,
+                    until=until,
+                    time_column="from",
+                    fetch=fetch,
+                )
+                rows[key] = n_rows
+        return rows
+
+    def _sync(
+        self,
+        api: str,
+        parameter: Any,
+        station_id: Optional[str],
+        since: datetime,
+        until: Optional[datetime],
+        time_column: str,
+        fetch,
+    ):
+        key = f"{api}/{parameter.value}/{station_id or '*'}"
+        state = self._load_state()
+        # Part files of a month interrupted before its checkpoint
+        for path in state.pop("pending", []):
+            if os.path.exists(path):
+                os.remove(path)
+        from_time = since
+        if key in state["queries"]:
+            from_time = max(since, _parse_time(state["queries"][key]) - self.overlap)
+        to_time = until or datetime.utcnow()
+
+        n_rows = 0
+        for window_start, window_end in _month_windows(from_time, to_time):
+            table = fetch(
+                parameter=parameter,
+                station_id=station_id,
+                from_time=window_start,
+                to_time=window_end,
+                backend="arrow",
+            )
+            parts = self._new_partitions(
+                api=api,
+                parameter=parameter,
+                table=table,
+                time_column=time_column,
+                part_name=f"part-{state['sequence']:08d}.parquet",
+                watermarks=state["partitions"],
+            )
+            if parts:
+                state["pending"] = [path for _, path, _, _ in parts]
+                _atomic_write(
+                    self.watermarks_path, json.dumps(state, indent=2).encode()
+                )
+            for partition_key, path, rows, latest in parts:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                pq.write_table(rows, tmp_path)
+                os.replace(tmp_path, path)
+                state["partitions"][partition_key] = latest
+                n_rows += rows.num_rows
+            state.pop("pending", None)
+            state["queries"][key] = window_end.isoformat()
+            state["sequence"] += 1
+            _atomic_write(self.watermarks_path, json.dumps(state, indent=2).encode())
+        return key, n_rows
+
+    def _new_partitions(
+        self,
+        api: str,
+        parameter: Any,
+        table: "pa.Table",
+        time_column: str,
+        part_name: str,
+        watermarks: Dict[str, str],
+    ) -> List[Tuple[str, str, "pa.Table", str]]:
+        """Split the rows of `table` newer than their partition's watermark
+        into (partition key, part file path, rows, new watermark)."""
+        if table.num_rows == 0:
+            return []
+        stations = np.array(table.column("stationId").to_pylist(), dtype=object)
+        times = table.column(time_column).to_numpy().astype("datetime64[us]")
+        months = times.astype("datetime64[M]").astype(str)
+        keys = np.array(
+            [f"{station}/{month}" for station, month in zip(stations, months)]
+        )
+        parts = []
+        for partition in np.unique(keys):
+            partition_key = f"{api}/{parameter.value}/{partition}"
+            mask = keys == partition
+            watermark = watermarks.get(partition_key)
+            if watermark is not None:
+                mask &= times > np.datetime64(watermark)
+            if not mask.any():
+                continue
+            station, month = partition.split("/")
+            path = os.path.join(
+                self.root,
+                f"api={api}",
+                f"parameter={parameter.value}",
+                f"station={station}",
+                f"month={month}",
+                part_name,
+            )
+            latest = times[mask].max().item().isoformat()
+            parts.append((partition_key, path, table.filter(pa.array(mask)), latest))
+        return parts
+
+
+def _month_windows(
+    from_time: datetime, to_time: datetime
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Split a time range at the start of every calendar month."""
+    start = from_time
+    while start < to_time:
+        if start.month == 12:
+            next_month = datetime(start.year + 1, 1, 1)
+        else:
+            next_month = datetime(start.year, start.month + 1, 1)
+        end = min(next_month, to_time)
+        yield start, end
+        start = end
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.rstrip("Z"))
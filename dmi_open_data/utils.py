@@ -1,10 +1,9 @@
 from datetime import datetime
 from math import cos, asin, sqrt, pi
+from typing import List, Sequence, Tuple, Union
 
+from dmi_open_data.constants import CONST_EARTH_RADIUS, CONST_EARTH_DIAMETER
 
-# Constants
-CONST_EARTH_RADIUS = 6371       # km
-CONST_EARTH_DIAMETER = 12742    # km
 EPOCH = datetime.utcfromtimestamp(0)
 
 
@@ -33,3 +32,167 @@ def distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     p = pi / 180.0
     a = 0.5 - cos((lat2 - lat1) * p) / 2.0 + cos(lat1 * p) * cos(lat2 * p) * (1.0 - cos((lon2 - lon1) * p)) / 2
     return CONST_EARTH_DIAMETER * asin(sqrt(a))  # 2*R*asin...
+
+
+def distances_to(
+    lat: float,
+    lon: float,
+    lats: Sequence[float],
+    lons: Sequence[float],
+    float32: bool = False,
+) -> Union["np.ndarray", List[float]]:
+    """Calculate distances in km from one geographical point to many points.
+
+    Vectorized with NumPy when it is installed, otherwise falls back to
+    calling `distance` for each point.
+
+    Args:
+        lat (float): Latitude of the point.
+        lon (float): Longitude of the point.
+        lats (Sequence[float]): Latitudes of the other points.
+        lons (Sequence[float]): Longitudes of the other points.
+        float32 (bool, optional): Compute in single precision to halve memory usage.
+            Only used with NumPy. Defaults to False.
+
+    Returns:
+        Union[np.ndarray, List[float]]: Haversine distances in km, shape (len(lats),).
+    """
+    if len(lats) != len(lons):
+        raise ValueError("`lats` and `lons` must have the same length")
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        return [distance(lat, lon, lat2, lon2) for lat2, lon2 in zip(lats, lons)]
+    dtype = np.float32 if float32 else np.float64
+    return _haversine(
+        np.asarray(lat, dtype=dtype),
+        np.asarray(lon, dtype=dtype),
+        np.asarray(lats, dtype=dtype),
+        np.asarray(lons, dtype=dtype),
+    )
+
+
+def distance_matrix(
+    lats1: Sequence[float],
+    lons1: Sequence[float],
+    lats2: Sequence[float],
+    lons2: Sequence[float],
+    float32: bool = False,
+) -> Union["np.ndarray", List[List[float]]]:
+    """Calculate distances in km between every pair of two sets of geographical points.
+
+    Vectorized with NumPy when it is installed, otherwise falls back to
+    calling `distance` for each pair.
+
+    Args:
+        lats1 (Sequence[float]): Latitudes of the first set of points.
+        lons1 (Sequence[float]): Longitudes of the first set of points.
+        lats2 (Sequence[float]): Latitudes of the second set of points.
+        lons2 (Sequence[float]): Longitudes of the second set of points.
+        float32 (bool, optional): Compute in single precision to halve memory usage.
+            Only used with NumPy. Defaults to False.
+
+    Returns:
+        Union[np.ndarray, List[List[float]]]: Haversine distances in km,
+            shape (len(lats1), len(lats2)).
+    """
+    if len(lats1) != len(lons1) or len(lats2) != len(lons2):
+        raise ValueError("Latitudes and longitudes must have the same length")
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        return [
+            [distance(lat1, lon1, lat2, lon2) for lat2, lon2 in zip(lats2, lons2)]
+            for lat1, lon1 in zip(lats1, lons1)
+        ]
+    dtype = np.float32 if float32 else np.float64
+    return _haversine(
+        np.asarray(lats1, dtype=dtype)[:, np.newaxis],
+        np.asarray(lons1, dtype=dtype)[:, np.newaxis],
+        np.asarray(lats2, dtype=dtype)[np.newaxis, :],
+        np.asarray(lons2, dtype=dtype)[np.newaxis, :],
+    )
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    import numpy as np
+
+    dtype = np.result_type(lat1, lat2)
+    p = dtype.type(pi / 180.0)
+    a = 0.5 - np.cos((lat2 - lat1) * p) / 2.0 + np.cos(lat1 * p) * np.cos(lat2 * p) * (1.0 - np.cos((lon2 - lon1) * p)) / 2
+    return (dtype.type(CONST_EARTH_DIAMETER) * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))).astype(dtype, copy=False)
+
+
+def unit_vectors(lats: "np.ndarray", lons: "np.ndarray") -> "np.ndarray":
+    """Convert geographical points to 3D unit vectors. Requires NumPy.
+
+    Args:
+        lats (np.ndarray): Latitudes of the points.
+        lons (np.ndarray): Longitudes of the points.
+
+    Returns:
+        np.ndarray: Unit vectors, shape (len(lats), 3).
+    """
+    import numpy as np
+
+    lats, lons = np.radians(lats), np.radians(lons)
+    cos_lats = np.cos(lats)
+    return np.stack(
+        [cos_lats * np.cos(lons), cos_lats * np.sin(lons), np.sin(lats)], axis=1
+    )
+
+
+def nearest_unit_vectors(
+    candidates: "np.ndarray", points: "np.ndarray", k: int, chunk_size: int = 16384
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Find the `k` nearest candidates of every point. Requires NumPy.
+
+    Uses SciPy's k-d tree when it is installed, otherwise compares `chunk_size`
+    points at a time with all candidates.
+
+    Args:
+        candidates (np.ndarray): Unit vectors of the candidates, see `unit_vectors`.
+        points (np.ndarray): Unit vectors of the points.
+        k (int): Number of candidates per point, at most len(candidates).
+        chunk_size (int, optional): Points compared at a time without SciPy.
+            Defaults to 16384.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices into `candidates` and haversine
+            distances in km, both of shape (len(points), k), nearest first.
+    """
+    import numpy as np
+
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:  # pragma: no cover
+        cKDTree = None
+
+    # Nearest by chord length, ie. largest dot product of unit vectors
+    if cKDTree is not None:
+        chords, indices = cKDTree(candidates).query(points, k=k)
+        return indices.reshape(len(points), k), _chord2km(
+            chords.reshape(len(points), k)
+        )
+    indices = np.empty((len(points), k), dtype=np.intp)
+    distances = np.empty((len(points), k), dtype=np.float64)
+    for start in range(0, len(points), chunk_size):
+        dots = points[start : start + chunk_size] @ candidates.T
+        if k < len(candidates):
+            nearest = np.argpartition(dots, -k, axis=1)[:, -k:]
+        else:
+            nearest = np.broadcast_to(np.arange(len(candidates)), dots.shape)
+        nearest_dots = np.take_along_axis(dots, nearest, axis=1)
+        order = np.argsort(-nearest_dots, axis=1)
+        indices[start : start + chunk_size] = np.take_along_axis(nearest, order, axis=1)
+        chords = np.sqrt(
+            np.clip(2 - 2 * np.take_along_axis(nearest_dots, order, axis=1), 0, 4)
+        )
+        distances[start : start + chunk_size] = _chord2km(chords)
+    return indices, distances
+
+
+def _chord2km(chords: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    return 2 * CONST_EARTH_RADIUS * np.arcsin(np.minimum(chords, 2) / 2)
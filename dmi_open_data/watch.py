@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from dmi_open_data.batch import BatchQuery, plan_batch
+from dmi_open_data.enums import Parameter
+
+
+class ObservationWatcher:
+    """Bookkeeping for polling the newest observations.
+
+    Keeps the latest `observed` timestamp per (station, parameter) to narrow
+    the time window of the next poll, and a bounded LRU of feature ids to
+    drop observations that were already yielded.
+    """
+
+    def __init__(
+        self, lookback: timedelta = timedelta(hours=1), max_seen: int = 100000
+    ):
+        """Initialize observation watcher.
+
+        Args:
+            lookback (timedelta, optional): Time window of the first poll, and the
+                widest window of any later poll. Defaults to 1 hour.
+            max_seen (int, optional): Number of feature ids remembered for
+                deduplication. Defaults to 100000.
+        """
+        self.lookback = lookback
+        self.max_seen = max_seen
+        self.last_observed: Dict[tuple, datetime] = {}
+        self._seen = OrderedDict()
+
+    def window_start(self, query: BatchQuery, now: datetime) -> datetime:
+        """Start of the time window to poll for a query.
+
+        Series that have not reported within `lookback` are forgotten, so a
+        station that stopped reporting does not hold the window back.
+        """
+        floor = now - self.lookback
+        for key in [
+            key for key, observed in self.last_observed.items() if observed < floor
+        ]:
+            del self.last_observed[key]
+        last_observed = [
+            observed
+            for (station_id, parameter_id), observed in self.last_observed.items()
+            if (query.station_id is None or station_id == query.station_id)
+            and (query.parameter is None or parameter_id == query.parameter.value)
+        ]
+        if len(last_observed) == 0:
+            return floor
+        return max(floor, min(last_observed))
+
+    def accept(self, features: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filter out features seen before and record the new ones.
+
+        Returns:
+            List[Dict[str, Any]]: New features ordered by observation time.
+        """
+        new = []
+        for feature in features:
+            feature_id = feature.get("id")
+            if feature_id in self._seen:
+                self._seen.move_to_end(feature_id)
+                continue
+            if feature_id is not None:
+                self._seen[feature_id] = None
+                if len(self._seen) > self.max_seen:
+                    self._seen.popitem(last=False)
+            new.append(feature)
+
+            properties = feature.get("properties", {})
+            observed = properties.get("observed")
+            if observed is None:
+                continue
+            observed = datetime.fromisoformat(observed.rstrip("Z"))
+            key = (properties.get("stationId"), properties.get("parameterId"))
+            if key not in self.last_observed or observed > self.last_observed[key]:
+                self.last_observed[key] = observed
+        return sorted(
+            new, key=lambda feature: feature.get("properties", {}).get("observed") or ""
+        )
+
+
+def plan_watch(
+    station_ids: Optional[Sequence[str]] = None,
+    parameters: Optional[Sequence[Parameter]] = None,
+) -> List[BatchQuery]:
+    """Plan the queries of a poll. Unset filters are left out of the queries."""
+    if station_ids is None and parameters is None:
+        return [BatchQuery()]
+    if station_ids is None:
+        return [BatchQuery(parameter=parameter) for parameter in parameters]
+    if parameters is None:
+        return [BatchQuery(station_id=station_id) for station_id in station_ids]
+    return plan_batch(
+        station_ids=station_ids,
+        parameters=parameters,
+        total_parameters=len(Parameter),
+    )
@@ -24,12 +24,22 @@ setuptools.setup(
     url="https://github.com/LasseRegin/dmi-open-data",
     packages=setuptools.find_packages(),
     install_requires=packages,
+    extras_require={
+        "numpy": ["numpy"],
+        "arrow": ["numpy", "pyarrow"],
+        "fast": ["orjson", "ijson"],
+        "otel": ["opentelemetry-api"],
+        "prometheus": ["prometheus-client"],
+    },
+    entry_points={
+        "console_scripts": ["dmi-open-data=dmi_open_data.cli:main"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     package_data={"": ["LICENSE", "requirements.txt"]},
     include_package_data=True,
 )
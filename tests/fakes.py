@@ -0,0 +1,134 @@
+"""Fake HTTP session, responses and GeoJSON features shared by the offline tests."""
+
+import io
+import json
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from dmi_open_data import DMIOpenDataClient
+from dmi_open_data.retry import RetryPolicy
+
+
+class FakeResponse:
+    """Stand-in for `requests.Response` with a JSON body."""
+
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.content = b"" if body is None else json.dumps(body).encode()
+        self.headers = headers or {}
+        self.reason = ""
+        self.elapsed = timedelta(milliseconds=1)
+        self.raw = io.BytesIO(self.content)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.raw.close()
+
+
+class FakeSession:
+    """Stand-in for `requests.Session`.
+
+    Answers with the given responses in order, or with the response computed
+    by `handler(url, params, **kwargs)`. Every request is recorded.
+    """
+
+    def __init__(self, responses=(), handler=None):
+        self.responses = list(responses)
+        self.handler = handler
+        self.requests = []
+
+    @property
+    def calls(self):
+        return len(self.requests)
+
+    def get(self, url, params, **kwargs):
+        self.requests.append((url, params, kwargs))
+        if self.handler is not None:
+            return self.handler(url, params, **kwargs)
+        return self.responses.pop(0)
+
+
+def make_client(responses=(), handler=None, client_class=DMIOpenDataClient, **kwargs):
+    """Client on a `FakeSession`, retrying without noticeable backoff.
+
+    Pass `client_class=AsyncDMIOpenDataClient` for the asyncio client.
+    """
+    session = FakeSession(responses=responses, handler=handler)
+    kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=3, backoff_base=0.001))
+    client = client_class(api_key="test", session=session, **kwargs)
+    return client, session
+
+
+class PagingServer:
+    """Handler serving `n_features` observations a page at a time.
+
+    Pages are capped at `max_page_size` regardless of the requested `limit`,
+    like the DMI API. `next` links and `numberMatched` can be left out to
+    exercise offset pagination.
+    """
+
+    base_url = "https://dmigw.govcloud.dk/v2/metObs/collections/observation/items"
+
+    def __init__(
+        self, n_features, max_page_size=10000, links=True, number_matched=False
+    ):
+        self.features = [
+            {"id": str(i), "properties": {"value": float(i)}} for i in range(n_features)
+        ]
+        self.max_page_size = max_page_size
+        self.links = links
+        self.number_matched = number_matched
+
+    def __call__(self, url, params, **kwargs):
+        query = {
+            key: values[0] for key, values in parse_qs(urlparse(url).query).items()
+        }
+        query.update({key: value for key, value in params.items() if value is not None})
+        offset = int(query.get("offset", 0))
+        limit = min(int(query.get("limit", 1000)), self.max_page_size)
+        features = self.features[offset : offset + limit]
+        body = {"features": features, "numberReturned": len(features), "links": []}
+        if self.number_matched:
+            body["numberMatched"] = len(self.features)
+        if self.links and offset + len(features) < len(self.features):
+            next_query = {
+                **{key: value for key, value in query.items() if key != "api-key"},
+                "offset": offset + len(features),
+            }
+            body["links"].append(
+                {"rel": "next", "href": f"{self.base_url}?{urlencode(next_query)}"}
+            )
+        return FakeResponse(200, body)
+
+
+def make_station(station_id, latitude, longitude, feature_id=None, **properties):
+    """Raw DMI station record. The feature id defaults to the `station_id`."""
+    return {
+        "id": station_id if feature_id is None else feature_id,
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+        "properties": {"stationId": station_id, **properties},
+    }
+
+
+def make_observation(
+    station_id, parameter_id, observed, value=1.0, coordinates=(12.5, 55.7)
+):
+    """Raw DMI observation. `observed` is a naive UTC datetime or an ISO string.
+
+    The feature id is derived from the station, parameter and time, so equal
+    observations have equal ids.
+    """
+    if isinstance(observed, datetime):
+        observed = f"{observed.isoformat()}Z"
+    return {
+        "id": f"{station_id}-{parameter_id}-{observed}",
+        "geometry": {"type": "Point", "coordinates": list(coordinates)},
+        "properties": {
+            "observed": observed,
+            "stationId": station_id,
+            "parameterId": parameter_id,
+            "value": value,
+        },
+    }
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timedelta
+
+from dmi_open_data import ClimateDataParameter, aggregate, columnar
+from tests.fakes import make_observation
+
+
+def at(minute):
+    return datetime(2021, 7, 20) + timedelta(minutes=minute)
+
+
+@unittest.skipIf(aggregate.np is None, "NumPy not installed")
+class TestAggregate(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        features = [
+            make_observation(station, "temp_dry", at(minute), float(minute))
+            for station in ("06180", "06181")
+            for minute in range(0, 180, 10)
+            if not (station == "06181" and 60 <= minute < 120)
+        ] + [
+            make_observation("06180", "precip_past1h", at(minute), 1.0)
+            for minute in range(0, 180, 60)
+        ]
+        cls.columns = columnar.build_columns([features])
+
+    def test_resample(self):
+        np = aggregate.np
+        hourly = aggregate.resample(self.columns, freq="h", how="mean")
+        stations = hourly["stationId_categories"][hourly["stationId"]]
+        parameters = hourly["parameterId_categories"][hourly["parameterId"]]
+        rows = (stations == "06180") & (parameters == "temp_dry")
+        self.assertEqual(list(hourly["value"][rows]), [25.0, 85.0, 145.0])
+        self.assertEqual(list(hourly["count"][rows]), [6, 6, 6])
+        self.assertEqual(
+            hourly["observed"][rows][1], np.datetime64("2021-07-20T01", "h")
+        )
+        last = aggregate.resample(self.columns, freq="h", how="last")
+        self.assertEqual(list(last["value"][rows]), [50.0, 110.0, 170.0])
+
+    def test_align_and_fill(self):
+        aligned = aggregate.align(self.columns, freq="h", how="max")
+        self.assertEqual(aligned["values"].shape, (3, 3))
+        series = list(zip(aligned["stationId"], aligned["parameterId"]))
+        column = series.index(("06181", "temp_dry"))
+        self.assertTrue(aggregate.np.isnan(aligned["values"][1, column]))
+        filled = aggregate.align(self.columns, freq="h", how="max", fill="linear")
+        self.assertEqual(filled["values"][1, column], 110.0)
+        ffilled = aggregate.fill_gaps([float("nan"), 1.0, float("nan"), 3.0])
+        self.assertEqual(list(ffilled[1:]), [1.0, 1.0, 3.0])
+
+    def test_daily_aggregates(self):
+        daily = aggregate.daily_aggregates(
+            self.columns,
+            parameters=[ClimateDataParameter.MeanTemp, ClimateDataParameter.AccPrecip],
+        )
+        # The 00:00 precipitation covers 23:00-24:00 of the previous day
+        precip = daily[ClimateDataParameter.AccPrecip]
+        self.assertEqual(list(precip["value"]), [1.0, 2.0])
+        self.assertEqual(
+            list(precip["observed"].astype(str)), ["2021-07-19", "2021-07-20"]
+        )
+        self.assertEqual(len(daily[ClimateDataParameter.MeanTemp]["value"]), 2)
+
+    def test_daily_sunshine_in_hours(self):
+        columns = columnar.build_columns(
+            [
+                [
+                    make_observation("06180", "sun_last1h_glob", at(60), 60.0),
+                    make_observation("06180", "sun_last1h_glob", at(120), 30.0),
+                ]
+            ]
+        )
+        daily = aggregate.daily_aggregates(
+            columns, parameters=[ClimateDataParameter.BrightSunshine]
+        )
+        self.assertEqual(
+            list(daily[ClimateDataParameter.BrightSunshine]["value"]), [1.5]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
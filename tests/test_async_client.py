@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from dmi_open_data import AsyncDMIOpenDataClient
+from tests.fakes import FakeResponse, make_client, make_station
+
+
+class SlowServer:
+    """Answers after a short delay, counting requests in flight."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, url, params, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return FakeResponse(200, {"features": [{"id": params["offset"]}]})
+
+
+class TestAsyncClient(unittest.TestCase):
+    def test_concurrency_is_capped(self):
+        server = SlowServer()
+        client, session = make_client(
+            handler=server, max_concurrency=2, client_class=AsyncDMIOpenDataClient
+        )
+
+        async def fetch():
+            async with client:
+                return await asyncio.gather(
+                    *[client.get_observations(offset=i) for i in range(6)]
+                )
+
+        pages = asyncio.run(fetch())
+        self.assertEqual(pages, [[{"id": i}] for i in range(6)])
+        self.assertEqual(session.calls, 6)
+        self.assertEqual(server.max_in_flight, 2)
+
+    def test_transient_errors_are_retried(self):
+        client, session = make_client(
+            [
+                FakeResponse(503, {"message": "Unavailable"}),
+                FakeResponse(200, {"features": [{"id": "a"}]}),
+            ],
+            client_class=AsyncDMIOpenDataClient,
+        )
+        self.assertEqual(asyncio.run(client.get_observations()), [{"id": "a"}])
+        self.assertEqual(session.calls, 2)
+        client.close()
+
+    def test_backoff_releases_concurrency_slot(self):
+        served = []
+
+        def handler(url, params, **kwargs):
+            if params["offset"] == 0 and 0 not in served:
+                served.append(0)
+                return FakeResponse(503, {}, headers={"Retry-After": "0.2"})
+            served.append(params["offset"])
+            return FakeResponse(200, {"features": [{"id": params["offset"]}]})
+
+        client, session = make_client(
+            handler=handler, max_concurrency=1, client_class=AsyncDMIOpenDataClient
+        )
+
+        async def fetch():
+            async with client:
+                return await asyncio.gather(
+                    client.get_observations(offset=0),
+                    client.get_observations(offset=1),
+                )
+
+        pages = asyncio.run(fetch())
+        self.assertEqual(pages, [[{"id": 0}], [{"id": 1}]])
+        self.assertEqual(served, [0, 1, 0], "Slot held while backing off")
+
+    def test_closest_station_reuses_station_index(self):
+        stations = [make_station("06180", 55.6, 12.6), make_station("06030", 57.1, 9.8)]
+        client, session = make_client(
+            handler=lambda url, params, **kwargs: FakeResponse(
+                200, {"features": stations}
+            ),
+            client_class=AsyncDMIOpenDataClient,
+        )
+
+        async def closest():
+            return [
+                await client.get_closest_station(latitude=55.7, longitude=12.5),
+                await client.get_closest_station(latitude=57.0, longitude=9.9),
+            ]
+
+        self.assertEqual(asyncio.run(closest()), stations)
+        self.assertEqual(session.calls, 1)
+        client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
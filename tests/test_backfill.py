@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from dmi_open_data import Parameter
+from dmi_open_data.backfill import Checkpoint, plan_units, run_unit, unit_path
+
+
+class FakeClient:
+    def __init__(self, features):
+        self.features = features
+        self.queries = []
+
+    def iter_observations(self, **query):
+        self.queries.append(query)
+        return iter(self.features)
+
+    def iter_climate_data(self, **query):
+        self.queries.append(query)
+        return iter(self.features)
+
+
+class TestBackfill(unittest.TestCase):
+    def test_plan_units(self):
+        units = plan_units(
+            api="metObs",
+            parameters=["temp_dry", "humidity"],
+            station_ids=["06180"],
+            from_time=datetime(2021, 1, 1),
+            to_time=datetime(2021, 1, 10),
+            chunk=timedelta(days=4),
+        )
+        self.assertEqual(len(units), 6)
+        self.assertEqual(
+            [(unit.from_time.day, unit.to_time.day) for unit in units[:3]],
+            [(1, 5), (5, 9), (9, 10)],
+        )
+        self.assertEqual(len({unit.key for unit in units}), len(units))
+        with self.assertRaises(ValueError):
+            plan_units(
+                api="metObs",
+                parameters=["temp_dry"],
+                from_time=datetime(2021, 1, 2),
+                to_time=datetime(2021, 1, 1),
+            )
+
+    def test_checkpoint_is_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "_checkpoint")
+            checkpoint = Checkpoint(path)
+            checkpoint.add("a")
+            checkpoint.add("b")
+            resumed = Checkpoint(path)
+            self.assertIn("a", resumed)
+            self.assertNotIn("c", resumed)
+            self.assertEqual(len(resumed), 2)
+
+    def test_run_unit_writes_ndjson(self):
+        features = [{"id": str(i), "properties": {"value": i}} for i in range(3)]
+        client = FakeClient(features)
+        (unit,) = plan_units(
+            api="metObs",
+            parameters=["temp_dry"],
+            from_time=datetime(2021, 1, 1),
+            to_time=datetime(2021, 1, 2),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            n_rows, n_bytes = run_unit(client, unit, output_dir=directory)
+            path = unit_path(output_dir=directory, unit=unit)
+            with open(path, "r") as f:
+                self.assertEqual([json.loads(line) for line in f], features)
+            self.assertEqual(n_rows, 3)
+            self.assertEqual(n_bytes, os.path.getsize(path))
+            self.assertFalse(os.path.exists(f"{path}.tmp"))
+        self.assertIs(client.queries[0]["parameter"], Parameter.TempDry)
+
+    def test_units_are_keyed_by_resolution_and_format(self):
+        def plan(**kwargs):
+            (unit,) = plan_units(
+                api="climateData",
+                parameters=["mean_temp"],
+                station_ids=["06180"],
+                from_time=datetime(2021, 1, 1),
+                to_time=datetime(2021, 1, 2),
+                **kwargs,
+            )
+            return unit
+
+        daily = plan(time_resolution="day")
+        hourly = plan(time_resolution="hour")
+        client = FakeClient([{"id": "a"}])
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Checkpoint(os.path.join(directory, "_checkpoint"))
+            run_unit(client, daily, output_dir=directory)
+            checkpoint.add(daily.key)
+            self.assertNotIn(hourly.key, checkpoint)
+            self.assertNotIn(plan(time_resolution="day", fmt="parquet").key, checkpoint)
+            run_unit(client, hourly, output_dir=directory)
+            for unit in (daily, hourly):
+                self.assertTrue(os.path.exists(unit_path(directory, unit)))
+        self.assertEqual(
+            [query["time_resolution"] for query in client.queries], ["day", "hour"]
+        )
@@ -0,0 +1,102 @@
+import unittest
+
+from dmi_open_data import Parameter
+from dmi_open_data.batch import BatchQuery, plan_batch, fetch_batch
+from tests.fakes import FakeResponse, make_client, make_station
+
+STATIONS = [f"{6180 + i:05d}" for i in range(50)]
+
+
+class TestBatch(unittest.TestCase):
+    def test_plan_per_pair(self):
+        queries = plan_batch(
+            station_ids=STATIONS[:2],
+            parameters=[Parameter.TempDry],
+            total_parameters=len(Parameter),
+        )
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(all(query.parameter is not None for query in queries))
+
+    def test_plan_per_station(self):
+        parameters = list(Parameter)[:30]
+        queries = plan_batch(
+            station_ids=STATIONS, parameters=parameters, total_parameters=len(Parameter)
+        )
+        self.assertEqual(queries, [BatchQuery(station_id=s) for s in STATIONS])
+
+    def test_plan_per_parameter(self):
+        queries = plan_batch(
+            station_ids=STATIONS,
+            parameters=[Parameter.TempDry, Parameter.Humidity],
+            total_parameters=len(Parameter),
+            total_stations=80,
+        )
+        self.assertEqual(
+            queries,
+            [
+                BatchQuery(parameter=Parameter.TempDry),
+                BatchQuery(parameter=Parameter.Humidity),
+            ],
+        )
+
+    def test_fetch_batch_groups_and_filters(self):
+        def fetch(query):
+            return [
+                {"properties": {"stationId": station, "parameterId": parameter}}
+                for station in ("06180", "06181", "09999")
+                for parameter in ("temp_dry", "humidity", "wind_dir")
+            ]
+
+        grouped = fetch_batch(
+            fetch=fetch,
+            queries=[BatchQuery(parameter=Parameter.TempDry)],
+            station_ids=["06180", "06181"],
+            parameters=[Parameter.TempDry, Parameter.Humidity],
+        )
+        self.assertEqual(len(grouped), 4)
+        self.assertTrue(all(len(features) == 1 for features in grouped.values()))
+
+    def test_client_counts_distinct_stations(self):
+        # Every station is listed once per validity period
+        stations = [
+            make_station(
+                station_id,
+                55.6,
+                12.6,
+                feature_id=f"{station_id}-{period}",
+                validFrom=f"{2000 + period}",
+            )
+            for station_id in STATIONS[:4]
+            for period in range(3)
+        ]
+
+        def handler(url, params, **kwargs):
+            if "collections/station" in url:
+                return FakeResponse(200, {"features": stations})
+            return FakeResponse(200, {"features": []})
+
+        client, session = make_client(handler=handler)
+        client.get_observations_batch(
+            station_ids=STATIONS[:2], parameters=[Parameter.TempDry]
+        )
+        observation_requests = [
+            url for url, _, _ in session.requests if "collections/observation" in url
+        ]
+        self.assertEqual(len(observation_requests), 1)
+
+    def test_client_does_not_count_stations_for_per_pair_plans(self):
+        client, session = make_client(
+            handler=lambda url, params, **kwargs: FakeResponse(200, {"features": []})
+        )
+        client.get_observations_batch(
+            station_ids=STATIONS[:1], parameters=[Parameter.TempDry, Parameter.Humidity]
+        )
+        self.assertFalse(
+            any("collections/station" in url for url, _, _ in session.requests),
+            "Stations were downloaded",
+        )
+        self.assertEqual(session.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
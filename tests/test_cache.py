@@ -0,0 +1,70 @@
+import unittest
+from datetime import datetime, timedelta
+
+from dmi_open_data import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache()
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_hit_ignores_api_key(self):
+        service = "collections/observation/items"
+        self.cache.set(
+            "metObs", service, {"api-key": "a", "limit": 10}, {"features": [1]}
+        )
+        res = self.cache.get("metObs", service, {"api-key": "b", "limit": 10})
+        self.assertEqual(res, {"features": [1]}, "Cached response not returned")
+        self.assertIsNone(
+            self.cache.get("metObs", service, {"limit": 20}), "Wrong response returned"
+        )
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_ttl(self):
+        service = "collections/observation/items"
+        closed = {"datetime": "2021-07-20T00:00:00Z/2021-07-24T00:00:00Z"}
+        latest = {"datetime": "2021-07-20T00:00:00Z/.."}
+        self.assertIsNone(self.cache.ttl_for(service, closed), "Closed range expires")
+        self.assertEqual(self.cache.ttl_for(service, latest), 60)
+        self.assertEqual(self.cache.ttl_for(service, {}), 60)
+
+    def test_recent_range_is_not_cached_forever(self):
+        service = "collections/observation/items"
+        now = datetime.utcnow()
+        for ended, expected in [
+            (now - timedelta(seconds=1), 60),
+            (now - timedelta(hours=5), 60),
+            (now - timedelta(hours=7), None),
+        ]:
+            params = {"datetime": f"2021-07-20T00:00:00Z/{ended.isoformat()}Z"}
+            self.assertEqual(self.cache.ttl_for(service, params), expected)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_size=100)
+        for i in range(10):
+            cache.set("metObs", "service", {"offset": i}, {"value": "x" * 20})
+        self.assertLessEqual(cache.size(), 100, "Cache exceeded max size")
+        self.assertIsNotNone(cache.get("metObs", "service", {"offset": 9}))
+        self.assertIsNone(cache.get("metObs", "service", {"offset": 0}))
+        cache.close()
+
+    def test_size_is_tracked(self):
+        cache = ResponseCache(max_size=100)
+        cache.set("metObs", "service", {"offset": 0}, {"value": "x" * 20})
+        cache.set("metObs", "service", {"offset": 0}, {"value": "x" * 30})
+        cache.set("metObs", "service", {"offset": 1}, {"value": "x" * 30})
+        self.assertEqual(cache.size(), 2 * len('{"value": ""}') + 60)
+        cache.set("metObs", "service", {"offset": 2}, {"value": "x" * 60})
+        total = cache._connection.execute("SELECT SUM(size) FROM responses")
+        self.assertEqual(cache.size(), total.fetchone()[0])
+        self.assertLessEqual(cache.size(), 100)
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
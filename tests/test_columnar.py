@@ -0,0 +1,42 @@
+import unittest
+
+from dmi_open_data import columnar
+from tests.fakes import make_observation
+
+PAGES = [
+    [
+        make_observation("06180", "temp_dry", "2021-07-20T00:00:00Z", 20.1),
+        make_observation("06181", "temp_dry", "2021-07-20T00:01:00Z", None),
+    ],
+    [make_observation("06180", "humidity", "2021-07-20T00:02:00Z", 80.0)],
+]
+
+
+@unittest.skipIf(columnar.np is None, "NumPy not installed")
+class TestColumnar(unittest.TestCase):
+    def test_numpy(self):
+        np = columnar.np
+        columns = columnar.build_columns(PAGES)
+        self.assertEqual(columns["observed"].dtype, np.dtype("datetime64[us]"))
+        self.assertEqual(
+            columns["observed"][2], np.datetime64("2021-07-20T00:02:00", "us")
+        )
+        self.assertTrue(np.isnan(columns["value"][1]), "Missing value not NaN")
+        self.assertEqual(
+            list(columns["stationId_categories"][columns["stationId"]]),
+            ["06180", "06181", "06180"],
+        )
+        self.assertEqual(list(columns["latitude"]), [55.7] * 3)
+
+    @unittest.skipIf(columnar.pa is None, "pyarrow not installed")
+    def test_arrow(self):
+        table = columnar.build_columns(PAGES, backend="arrow")
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(
+            table.column("parameterId").to_pylist(),
+            ["temp_dry", "temp_dry", "humidity"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
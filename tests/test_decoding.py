@@ -0,0 +1,81 @@
+import contextlib
+import io
+import json
+import unittest
+from unittest import mock
+
+from dmi_open_data import decoding
+from tests.fakes import PagingServer, make_client
+
+COLLECTION = {
+    "type": "FeatureCollection",
+    "features": [{"id": str(i), "properties": {"value": i + 0.5}} for i in range(5)],
+    "links": [{"rel": "next", "href": "https://example.com?offset=5"}],
+}
+
+
+class ChunkedStream(io.BytesIO):
+    """Raw response body that arrives a few bytes at a time."""
+
+    def read(self, size=-1):
+        return super().read(size if size is None or size < 0 else min(size, 7))
+
+
+def decoders():
+    """Decode with ijson, when installed, and without."""
+    return [contextlib.nullcontext(), mock.patch.object(decoding, "ijson", None)]
+
+
+class TestDecoding(unittest.TestCase):
+    def test_loads(self):
+        body = json.dumps(COLLECTION)
+        self.assertEqual(decoding.loads(body), COLLECTION)
+        self.assertEqual(decoding.loads(body.encode()), COLLECTION)
+
+    def test_iter_features(self):
+        for patch in decoders():
+            with patch:
+                stream = ChunkedStream(json.dumps(COLLECTION).encode())
+                self.assertEqual(
+                    list(decoding.iter_features(stream)), COLLECTION["features"]
+                )
+
+    def test_iter_features_collects_links(self):
+        # Links placed before and after the features
+        for collection in [COLLECTION, dict(reversed(list(COLLECTION.items())))]:
+            for patch in decoders():
+                with patch:
+                    links = []
+                    stream = ChunkedStream(json.dumps(collection).encode())
+                    features = list(decoding.iter_features(stream, links=links))
+                    self.assertEqual(features, collection["features"])
+                    self.assertEqual(links, collection["links"])
+
+
+class TestStreamedPagination(unittest.TestCase):
+    def iter_values(self, server, page_size):
+        client, session = make_client(handler=server)
+        values = [
+            feature["properties"]["value"]
+            for feature in client.iter_observations(page_size=page_size, stream=True)
+        ]
+        return values, session
+
+    def test_next_links(self):
+        for patch in decoders():
+            with patch:
+                server = PagingServer(250, max_page_size=100)
+                values, session = self.iter_values(server, page_size=500)
+                self.assertEqual(values, [float(i) for i in range(250)])
+                self.assertEqual(session.calls, 3)
+
+    def test_offset_fallback(self):
+        values, session = self.iter_values(
+            PagingServer(250, links=False), page_size=100
+        )
+        self.assertEqual(values, [float(i) for i in range(250)])
+        self.assertEqual(session.calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
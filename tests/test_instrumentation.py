@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from dmi_open_data import ResponseCache
+from dmi_open_data.exceptions import HTTPError
+from dmi_open_data.instrumentation import Observer, StatsObserver
+from tests.fakes import FakeResponse, make_client
+
+
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.events = []
+        self.retries = []
+
+    def on_request(self, event):
+        self.events.append(event)
+
+    def on_retry(self, url, attempt, delay, error):
+        self.retries.append((attempt, error))
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_request_events(self):
+        observer = RecordingObserver()
+        body = {"features": [{"id": "a"}]}
+        client, _ = make_client(
+            [FakeResponse(503, {"message": "Unavailable"}), FakeResponse(200, body)],
+            observers=[observer],
+        )
+        client.get_observations()
+
+        self.assertEqual(len(observer.events), 2)
+        failed, succeeded = observer.events
+        self.assertEqual(failed.status_code, 503)
+        self.assertIsInstance(failed.error, HTTPError)
+        self.assertEqual(succeeded.status_code, 200)
+        self.assertIsNone(succeeded.error)
+        self.assertEqual(succeeded.bytes, len(json.dumps(body)))
+        self.assertGreaterEqual(succeeded.decode, 0)
+        self.assertEqual([attempt for attempt, _ in observer.retries], [1])
+
+    def test_stats_observer(self):
+        stats = StatsObserver()
+        cache = ResponseCache()
+        client, _ = make_client(
+            [FakeResponse(429, {}, {"Retry-After": "0"}), FakeResponse(200, {})],
+            observers=[stats],
+            cache=cache,
+        )
+        client.get_observations()
+        client.get_observations()
+
+        summary = stats.as_dict()
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["retries"], 1)
+        self.assertEqual(summary["cache_hits"], 1)
+        self.assertEqual(summary["cache_misses"], 1)
+        self.assertEqual(summary["bytes"], 2)
@@ -0,0 +1,73 @@
+import unittest
+
+from dmi_open_data import StationIndex
+from dmi_open_data.interpolation import Interpolator, np
+from tests.fakes import make_observation, make_station
+
+STATIONS = [
+    make_station("A", 55.0, 10.0, validFrom="2010-01-01T00:00:00Z"),
+    make_station("B", 55.0, 12.0, validFrom="2010-01-01T00:00:00Z"),
+    make_station("C", 57.0, 10.0, validFrom="2010-01-01T00:00:00Z"),
+    # Older validity period of station A
+    make_station("A", 50.0, 0.0, feature_id="A-2000", validFrom="2000-01-01T00:00:00Z"),
+]
+NOON = "2021-07-20T12:00:00Z"
+
+
+@unittest.skipIf(np is None, "NumPy not installed")
+class TestInterpolator(unittest.TestCase):
+    def test_idw(self):
+        interpolator = Interpolator(
+            STATIONS, latitudes=[55.0, 55.0, 56.0], longitudes=[10.0, 11.0, 10.0], k=2
+        )
+        self.assertEqual(interpolator.station_ids, ["A", "B", "C"])
+        estimates = interpolator.idw(
+            [
+                make_observation("A", "temp_dry", NOON, 10.0),
+                make_observation("B", "temp_dry", NOON, 20.0),
+                make_observation("C", "temp_dry", NOON, 30.0),
+                make_observation("A", "temp_dry", "2021-07-20T11:50:00Z", 0.0),
+            ]
+        )
+        self.assertAlmostEqual(estimates[0], 10.0)
+        self.assertAlmostEqual(estimates[1], 15.0, places=1)
+        self.assertTrue(10.0 < estimates[2] < 30.0)
+
+    def test_missing_values_use_next_neighbour(self):
+        interpolator = Interpolator(STATIONS, latitudes=[55.1], longitudes=[10.0], k=3)
+        values = np.array([np.nan, 20.0, 30.0])
+        self.assertEqual(interpolator.nearest(values)[0], 20.0)
+        self.assertTrue(20.0 < interpolator.idw(values)[0] < 30.0)
+        self.assertTrue(np.isnan(interpolator.idw(values, max_distance=50)[0]))
+
+    def test_neighbours_match_station_index(self):
+        rng = np.random.default_rng(0)
+        stations = [
+            make_station(str(i), lat, lon)
+            for i, (lat, lon) in enumerate(
+                zip(rng.uniform(54, 58, 100), rng.uniform(8, 15, 100))
+            )
+        ]
+        lats, lons = rng.uniform(54, 58, 50), rng.uniform(8, 15, 50)
+        interpolator = Interpolator(stations, latitudes=lats, longitudes=lons, k=4)
+        index = StationIndex(stations)
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            expected = index.nearest(latitude=lat, longitude=lon, k=4)
+            self.assertEqual(
+                [interpolator.station_ids[j] for j in interpolator.indices[i]],
+                [station["properties"]["stationId"] for station, _ in expected],
+            )
+            np.testing.assert_allclose(
+                interpolator.distances[i], [distance for _, distance in expected]
+            )
+
+    def test_grid(self):
+        interpolator = Interpolator.grid(
+            STATIONS, latitudes=(55.0, 57.0), longitudes=(10.0, 12.0), step=0.5
+        )
+        self.assertEqual(interpolator.shape, (5, 5))
+        estimates = interpolator.nearest(np.array([1.0, 2.0, 3.0]))
+        self.assertEqual(estimates.shape, (5, 5))
+        self.assertEqual(estimates[0, 0], 1.0)
+        self.assertEqual(estimates[0, -1], 2.0)
+        self.assertEqual(estimates[-1, 0], 3.0)
@@ -0,0 +1,182 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from dmi_open_data import StationCatalog, StationSnapshot, StatsObserver
+from tests.fakes import FakeResponse, make_client, make_station
+
+STATIONS = [make_station("06180", 55.6, 12.6), make_station("06030", 57.1, 9.8)]
+
+
+class StationServer:
+    """Serves stations with an ETag, and answers revalidations with 304."""
+
+    def __init__(self, stations=STATIONS, etag='"v1"'):
+        self.stations = stations
+        self.etag = etag
+
+    def __call__(self, url, params, headers=None, **kwargs):
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, {"features": self.stations}, {"ETag": self.etag})
+
+
+def request_headers(session):
+    return [kwargs.get("headers") or {} for _, _, kwargs in session.requests]
+
+
+class TestStationSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "stations.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_client(self):
+        return make_client(
+            handler=StationServer(), station_snapshot=StationSnapshot(self.path)
+        )
+
+    def test_closest_station_from_snapshot(self):
+        client, session = self.make_client()
+        self.assertEqual(
+            client.get_closest_station(latitude=55.7, longitude=12.5)["id"], "06180"
+        )
+        self.assertEqual(session.calls, 1)
+
+        client, session = self.make_client()
+        self.assertEqual(
+            client.get_closest_station(latitude=57.0, longitude=9.9)["id"], "06030"
+        )
+        self.assertEqual(session.calls, 0)
+
+    def test_unchanged_stations_are_not_rewritten(self):
+        snapshot = StationSnapshot(self.path)
+        self.assertTrue(snapshot.save(STATIONS))
+        self.assertFalse(snapshot.save([dict(station) for station in STATIONS]))
+        self.assertTrue(snapshot.save(STATIONS[:1]))
+        self.assertEqual(snapshot.load(), STATIONS[:1])
+
+    def test_corrupt_or_stale_snapshot_is_ignored(self):
+        snapshot = StationSnapshot(self.path)
+        snapshot.save(STATIONS)
+        self.assertIsNone(snapshot.load(max_age=-1))
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        data["stations"][0]["properties"]["stationId"] = "99999"
+        with open(self.path, "w") as f:
+            json.dump(data, f)
+        self.assertIsNone(snapshot.load())
+
+
+class TestStationCatalog(unittest.TestCase):
+    def test_merge_counts_changes(self):
+        catalog = StationCatalog(STATIONS)
+        self.assertEqual(catalog.version, 1)
+        self.assertEqual(
+            catalog.merge([dict(station) for station in STATIONS], complete=True),
+            {"added": 0, "updated": 0, "removed": 0},
+        )
+        self.assertEqual(catalog.version, 1)
+        moved = make_station("06180", 55.5, 12.5)
+        changes = catalog.merge(
+            [moved, make_station("06041", 57.7, 10.6)], complete=True
+        )
+        self.assertEqual(changes, {"added": 1, "updated": 1, "removed": 1})
+        self.assertEqual(catalog.version, 2)
+        self.assertEqual(catalog.get("06180"), moved)
+        self.assertNotIn("06030", catalog)
+
+    def test_history_is_ordered_by_valid_from(self):
+        old = {
+            "id": "a",
+            "properties": {"stationId": "06180", "validFrom": "2000-01-01T00:00:00Z"},
+        }
+        new = {
+            "id": "b",
+            "properties": {"stationId": "06180", "validFrom": "2010-01-01T00:00:00Z"},
+        }
+        catalog = StationCatalog([new, old])
+        self.assertEqual(catalog.history("06180"), [old, new])
+        self.assertEqual(catalog.get("06180"), new)
+        self.assertEqual(catalog.station_ids(), ["06180"])
+
+
+class TestConditionalRefresh(unittest.TestCase):
+    def test_unchanged_stations_are_revalidated(self):
+        client, session = make_client(handler=StationServer())
+        index = client.get_station_index()
+        self.assertEqual(request_headers(session)[0], {})
+
+        self.assertIs(client.get_station_index(refresh=True), index)
+        self.assertEqual(request_headers(session)[1], {"If-None-Match": '"v1"'})
+        self.assertEqual(
+            client.refresh_stations(), {"added": 0, "updated": 0, "removed": 0}
+        )
+
+    def test_station_list_is_served_from_catalog(self):
+        client, session = make_client(handler=StationServer())
+        self.assertEqual(client.get_stations(), STATIONS)
+        self.assertEqual(
+            [record.station_id for record in client.get_station_records()],
+            ["06180", "06030"],
+        )
+        self.assertEqual(session.calls, 1)
+        client.get_stations(limit=1)
+        self.assertEqual(session.calls, 2)
+
+    def test_station_requests_are_observed(self):
+        stats = StatsObserver()
+        client, session = make_client(handler=StationServer(), observers=[stats])
+        client.get_stations()
+        client.get_closest_station(latitude=55.7, longitude=12.5)
+        client.refresh_stations()
+        self.assertEqual(session.calls, 2)
+        summary = stats.as_dict()
+        self.assertEqual(summary["requests"], 2)
+        self.assertEqual(summary["bytes"], len(json.dumps({"features": STATIONS})))
+
+    def test_changed_stations_are_merged(self):
+        server = StationServer()
+        client, _ = make_client(handler=server)
+        index = client.get_station_index()
+        server.stations, server.etag = STATIONS[:1], '"v2"'
+        self.assertEqual(
+            client.refresh_stations(), {"added": 0, "updated": 0, "removed": 1}
+        )
+        self.assertIsNot(client.get_station_index(), index)
+        self.assertEqual(client.station_catalog.etag, '"v2"')
+        self.assertIsNone(client.get_station("06030"))
+        self.assertEqual(client.get_station("06180"), STATIONS[0])
+
+    def test_stale_snapshot_is_revalidated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stations.json")
+            StationSnapshot(path).save(STATIONS, etag='"v1"')
+            os.utime(path, (0, 0))
+            client, session = make_client(
+                handler=StationServer(), station_snapshot=StationSnapshot(path)
+            )
+            self.assertEqual(client.get_station("06030"), STATIONS[1])
+            self.assertEqual(request_headers(session), [{"If-None-Match": '"v1"'}])
+            self.assertLess(StationSnapshot(path).age, 60)
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_import_does_not_load_heavy_dependencies(self):
+        code = (
+            "import sys, dmi_open_data; "
+            "dmi_open_data.DMIOpenDataClient(api_key='test'); "
+            "dmi_open_data.AsyncDMIOpenDataClient(api_key='test'); "
+            "heavy = {'requests', 'numpy', 'pyarrow', 'opentelemetry', "
+            "'prometheus_client'}; "
+            "print(sorted(heavy & set(sys.modules)))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "[]")
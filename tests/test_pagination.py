@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime
+
+from dmi_open_data import ResponseCache
+from tests.fakes import PagingServer, make_client
+
+
+class TestPagination(unittest.TestCase):
+    def iter_values(self, server, page_size):
+        client, session = make_client(handler=server)
+        values = [
+            feature["properties"]["value"]
+            for feature in client.iter_observations(page_size=page_size)
+        ]
+        return values, session
+
+    def test_next_links(self):
+        values, session = self.iter_values(PagingServer(250), page_size=100)
+        self.assertEqual(values, [float(i) for i in range(250)])
+        self.assertEqual(session.calls, 3)
+
+        values, session = self.iter_values(PagingServer(200), page_size=100)
+        self.assertEqual(values, [float(i) for i in range(200)])
+        self.assertEqual(session.calls, 2)
+
+    def test_server_capped_page_size(self):
+        server = PagingServer(250, max_page_size=100)
+        values, session = self.iter_values(server, page_size=500)
+        self.assertEqual(values, [float(i) for i in range(250)])
+        self.assertEqual(session.calls, 3)
+
+    def test_offset_fallback(self):
+        values, session = self.iter_values(
+            PagingServer(250, links=False), page_size=100
+        )
+        self.assertEqual(values, [float(i) for i in range(250)])
+        self.assertEqual(session.calls, 3)
+
+        values, session = self.iter_values(
+            PagingServer(200, links=False), page_size=100
+        )
+        self.assertEqual(len(values), 200)
+        self.assertEqual(session.calls, 3)
+
+    def test_offset_fallback_with_server_capped_page_size(self):
+        server = PagingServer(250, max_page_size=100, links=False, number_matched=True)
+        values, session = self.iter_values(server, page_size=500)
+        self.assertEqual(values, [float(i) for i in range(250)])
+        self.assertEqual(session.calls, 3)
+
+    def test_linked_pages_are_cached(self):
+        cache = ResponseCache()
+        client, session = make_client(handler=PagingServer(250), cache=cache)
+        for _ in range(2):
+            values = [
+                feature["properties"]["value"]
+                for feature in client.iter_observations(
+                    from_time=datetime(2021, 1, 1),
+                    to_time=datetime(2021, 1, 2),
+                    page_size=100,
+                )
+            ]
+            self.assertEqual(values, [float(i) for i in range(250)])
+        self.assertEqual(session.calls, 3, "Linked pages were downloaded again")
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from datetime import datetime
+
+from dmi_open_data import ClimateDataParameter, Parameter
+from dmi_open_data.records import (
+    ClimateValue,
+    Observation,
+    Station,
+    parse_observations,
+)
+from tests.fakes import make_observation
+
+
+def observation(station_id="06180", parameter_id="temp_dry"):
+    return make_observation(station_id, parameter_id, "2021-07-20T00:10:00Z", 12.3)
+
+
+class TestRecords(unittest.TestCase):
+    def test_observation(self):
+        record = Observation.from_feature(observation())
+        self.assertEqual(record.station_id, "06180")
+        self.assertIs(record.parameter, Parameter.TempDry)
+        self.assertEqual(record.observed, datetime(2021, 7, 20, 0, 10))
+        self.assertEqual(record.value, 12.3)
+        self.assertEqual((record.latitude, record.longitude), (55.7, 12.5))
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_unknown_parameter_is_kept(self):
+        record = Observation.from_feature(observation(parameter_id="new_parameter"))
+        self.assertEqual(record.parameter, "new_parameter")
+
+    def test_parse_observations_shares_strings_and_coordinates(self):
+        first, second = parse_observations(
+            [observation(station_id="".join(["0", "6180"])), observation()]
+        )
+        self.assertIs(first.station_id, second.station_id)
+        self.assertIs(first.coordinates, second.coordinates)
+        self.assertEqual(first, second)
+
+    def test_climate_value(self):
+        record = ClimateValue.from_feature(
+            {
+                "id": "c1",
+                "geometry": None,
+                "properties": {
+                    "stationId": "06180",
+                    "parameterId": "mean_temp",
+                    "from": "2021-07-20T00:00:00Z",
+                    "to": "2021-07-21T00:00:00Z",
+                    "timeResolution": "day",
+                    "value": 18.1,
+                },
+            }
+        )
+        self.assertIs(record.parameter, ClimateDataParameter.MeanTemp)
+        self.assertEqual(record.to_time, datetime(2021, 7, 21))
+        self.assertIsNone(record.latitude)
+
+    def test_station(self):
+        record = Station.from_feature(
+            {
+                "id": "s1",
+                "geometry": {"type": "Point", "coordinates": [12.5, 55.6]},
+                "properties": {
+                    "stationId": "06180",
+                    "name": "København Lufthavn",
+                    "parameterId": ["temp_dry", "humidity"],
+                    "validFrom": "2010-01-01T00:00:00Z",
+                    "validTo": None,
+                },
+            }
+        )
+        self.assertEqual(record.parameters, (Parameter.TempDry, Parameter.Humidity))
+        self.assertEqual(record.valid_from, datetime(2010, 1, 1))
+        self.assertIsNone(record.valid_to)
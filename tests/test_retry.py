@@ -0,0 +1,60 @@
+import time
+import unittest
+
+from dmi_open_data.exceptions import HTTPError, CircuitOpenError
+from dmi_open_data.retry import CircuitBreaker, RetryPolicy, TokenBucket
+from tests.fakes import FakeResponse, make_client
+
+
+class TestRetry(unittest.TestCase):
+    def test_transient_errors_are_retried(self):
+        client, session = make_client(
+            [
+                FakeResponse(503, {"message": "Unavailable"}),
+                FakeResponse(429, {"message": "Slow down"}, {"Retry-After": "0"}),
+                FakeResponse(200, {"features": [{"id": "a"}]}),
+            ]
+        )
+        self.assertEqual(client.get_stations(), [{"id": "a"}])
+        self.assertEqual(session.calls, 3)
+
+    def test_permanent_errors_are_not_retried(self):
+        client, session = make_client([FakeResponse(400, {"message": "Bad"})] * 3)
+        with self.assertRaises(HTTPError) as context:
+            client.get_stations()
+        self.assertEqual(context.exception.status_code, 400)
+        self.assertEqual(session.calls, 1)
+
+    def test_retry_after(self):
+        policy = RetryPolicy()
+        exc = HTTPError(status_code=429, retry_after=7.0)
+        self.assertEqual(policy.delay(attempt=1, exc=exc), 7.0)
+        self.assertLessEqual(policy.delay(attempt=20), policy.backoff_max)
+
+    def test_retry_after_is_capped(self):
+        policy = RetryPolicy(backoff_max=30.0)
+        exc = HTTPError(status_code=429, retry_after=3600.0)
+        self.assertEqual(policy.delay(attempt=1, exc=exc), 30.0)
+
+    def test_circuit_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_time=60)
+        client, session = make_client(
+            [FakeResponse(500, {})] * 3, circuit_breaker=breaker
+        )
+        with self.assertRaises(HTTPError):
+            client.get_stations()
+        self.assertTrue(breaker.is_open)
+        with self.assertRaises(CircuitOpenError):
+            client.get_stations()
+        self.assertEqual(session.calls, 3)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.045)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+import unittest
+
+from dmi_open_data.sharding import Shard, split_time_range, plan_shards, fetch_shards
+
+
+def make_fetch(n_stations=1, max_page_size=None):
+    """Fetches `n_stations` observations every 10 minutes, a page at a time.
+
+    Pages are capped at `max_page_size` regardless of `limit`, and truncated
+    pages have a `next` link.
+    """
+
+    def fetch(shard, limit, offset):
+        features, time = [], datetime(2021, 1, 1)
+        while time < shard.from_time:
+            time += timedelta(minutes=10)
+        while time < shard.to_time:
+            features.extend(
+                {
+                    "id": f"{time.isoformat()}-{station}",
+                    "properties": {"observed": f"{time.isoformat()}Z"},
+                }
+                for station in range(n_stations)
+            )
+            time += timedelta(minutes=10)
+        page_size = min(limit, max_page_size or limit)
+        page = features[offset : offset + page_size]
+        links = (
+            [{"rel": "next", "href": "next"}]
+            if offset + len(page) < len(features)
+            else []
+        )
+        return {"features": page, "links": links}
+
+    return fetch
+
+
+class TestSharding(unittest.TestCase):
+    def test_split_time_range(self):
+        from_time, to_time = datetime(2021, 1, 1), datetime(2021, 1, 2)
+        shards = split_time_range(from_time, to_time, 4)
+        self.assertEqual(len(shards), 4, "Wrong number of shards")
+        self.assertEqual(shards[0].from_time, from_time, "Range start not covered")
+        self.assertEqual(shards[-1].to_time, to_time, "Range end not covered")
+        self.assertTrue(
+            all(a.to_time == b.from_time for a, b in zip(shards[:-1], shards[1:])),
+            "Shards are not adjacent",
+        )
+
+    def test_plan_shards(self):
+        shards = plan_shards(
+            datetime(2021, 1, 1),
+            datetime(2021, 1, 2),
+            n_time_shards=3,
+            parameters=["a", "b"],
+            station_ids=[1, 2],
+        )
+        self.assertEqual(len(shards), 12, "Wrong number of shards")
+
+    def test_fetch_shards_splits_full_shards(self):
+        from_time, to_time = datetime(2021, 1, 1), datetime(2021, 1, 3)
+        features = fetch_shards(
+            fetch=make_fetch(),
+            shards=[Shard(from_time=from_time, to_time=to_time)],
+            limit=50,
+            max_workers=4,
+        )
+        self.assertEqual(len(features), 2 * 24 * 6, "Observations were lost")
+        observed = [feature["properties"]["observed"] for feature in features]
+        self.assertEqual(observed, sorted(set(observed)), "Not ordered or duplicated")
+
+    def test_fetch_shards_server_capped_page_size(self):
+        from_time, to_time = datetime(2021, 1, 1), datetime(2021, 1, 2)
+        features = fetch_shards(
+            fetch=make_fetch(n_stations=5, max_page_size=30),
+            shards=[Shard(from_time=from_time, to_time=to_time)],
+            limit=100,
+            max_workers=4,
+        )
+        self.assertEqual(len(features), 24 * 6 * 5, "Observations were lost")
+
+    def test_fetch_shards_pages_through_single_time(self):
+        from_time = datetime(2021, 1, 1)
+        features = fetch_shards(
+            fetch=make_fetch(n_stations=120, max_page_size=50),
+            shards=[Shard(from_time=from_time, to_time=from_time + timedelta(hours=1))],
+            limit=100,
+            max_workers=4,
+        )
+        self.assertEqual(len(features), 6 * 120, "Observations were lost")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from dmi_open_data.singleflight import SingleFlight, AsyncSingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_are_coalesced(self):
+        single_flight = SingleFlight()
+        n_calls = []
+
+        def slow():
+            n_calls.append(1)
+            time.sleep(0.1)
+            return {"features": []}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(single_flight.do("key", slow))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(n_calls), 1, "Identical calls were not coalesced")
+        self.assertEqual(len(results), 8)
+        self.assertEqual(single_flight.coalesced, 7)
+
+    def test_errors_are_shared(self):
+        single_flight = SingleFlight()
+
+        def fail():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            single_flight.do("key", fail)
+        self.assertEqual(single_flight.do("key", lambda: 1), 1)
+
+    def test_async(self):
+        single_flight = AsyncSingleFlight()
+        n_calls = []
+
+        async def slow(value):
+            n_calls.append(1)
+            await asyncio.sleep(0.05)
+            return value
+
+        async def main():
+            return await asyncio.gather(
+                *[single_flight.do("key", slow, 42) for _ in range(5)]
+            )
+
+        self.assertEqual(asyncio.run(main()), [42] * 5)
+        self.assertEqual(len(n_calls), 1)
+        self.assertEqual(single_flight.coalesced, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
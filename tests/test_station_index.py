@@ -0,0 +1,93 @@
+from datetime import datetime
+import random
+import unittest
+
+from dmi_open_data import Parameter, StationIndex
+from dmi_open_data.utils import distance
+from tests.fakes import make_station
+
+
+class TestStationIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(0)
+        cls.stations = [
+            make_station(f"{i:05d}", rng.uniform(54.5, 57.8), rng.uniform(8.0, 15.2))
+            for i in range(300)
+        ]
+        cls.index = StationIndex(cls.stations)
+
+    def brute_force(self, lat, lon):
+        return sorted(
+            (
+                distance(
+                    lat,
+                    lon,
+                    s["geometry"]["coordinates"][1],
+                    s["geometry"]["coordinates"][0],
+                ),
+                s["id"],
+            )
+            for s in self.stations
+        )
+
+    def test_nearest(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            lat, lon = rng.uniform(54, 58), rng.uniform(7, 16)
+            expected = self.brute_force(lat, lon)[:3]
+            found = self.index.nearest(latitude=lat, longitude=lon, k=3)
+            self.assertEqual(
+                [station["id"] for station, _ in found],
+                [i for _, i in expected],
+                "Nearest stations did not match brute force",
+            )
+            self.assertAlmostEqual(found[0][1], expected[0][0], places=6)
+
+    def test_within_radius(self):
+        lat, lon, radius = 55.7, 12.5, 50
+        expected = [i for dist, i in self.brute_force(lat, lon) if dist <= radius]
+        found = self.index.within_radius(latitude=lat, longitude=lon, radius=radius)
+        self.assertEqual([station["id"] for station, _ in found], expected)
+
+    def test_nearest_many(self):
+        found = self.index.nearest_many([55.0, 56.0], [10.0, 11.0], k=2)
+        self.assertEqual([len(stations) for stations in found], [2, 2])
+        rng = random.Random(2)
+        lats = [rng.uniform(54, 58) for _ in range(50)]
+        lons = [rng.uniform(7, 16) for _ in range(50)]
+        for lat, lon, stations in zip(
+            lats, lons, self.index.nearest_many(lats, lons, k=3)
+        ):
+            expected = self.index.nearest(latitude=lat, longitude=lon, k=3)
+            self.assertEqual(
+                [station["id"] for station, _ in stations],
+                [station["id"] for station, _ in expected],
+            )
+            self.assertAlmostEqual(stations[0][1], expected[0][1], places=6)
+
+    def test_filters(self):
+        index = StationIndex(
+            [
+                make_station(
+                    "00001",
+                    55.0,
+                    10.0,
+                    operationTo="2000-01-01T00:00:00Z",
+                    parameterId=["temp_dry"],
+                ),
+                make_station("00002", 55.5, 10.0, parameterId=["humidity"]),
+                make_station("00003", 56.0, 10.0, parameterId=["temp_dry"]),
+            ]
+        )
+        [(station, _)] = index.nearest(
+            latitude=55.0,
+            longitude=10.0,
+            active_at=datetime(2021, 1, 1),
+            parameter=Parameter.TempDry,
+        )
+        self.assertEqual(station["id"], "00003", "Filters were not applied")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+import os
+import tempfile
+import unittest
+
+from dmi_open_data import Parameter, columnar, sync
+from tests.fakes import make_observation
+
+
+class FakeClient:
+    """Serves one observation per station every 6 hours.
+
+    Observations of a station in `late` only become available after its
+    cutoff time has been cleared, and fetching from `fail_from` raises.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.late = {}
+        self.fail_from = None
+
+    def get_observations_table(
+        self, parameter, station_id, from_time, to_time, backend
+    ):
+        self.calls.append((from_time, to_time))
+        if self.fail_from is not None and from_time >= self.fail_from:
+            raise ConnectionError("Interrupted")
+        features, time = [], datetime(2021, 1, 1)
+        while time < to_time:
+            for station in ("06180", "06181"):
+                if time < from_time or time >= self.late.get(station, to_time):
+                    continue
+                features.append(make_observation(station, parameter.value, time))
+            time += timedelta(hours=6)
+        return columnar.build_columns([features], backend=backend)
+
+
+@unittest.skipIf(sync.pa is None, "pyarrow not installed")
+class TestParquetStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        self.client = FakeClient()
+        self.store = sync.ParquetStore(root=self.root, client=self.client)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def sync(self, until):
+        return self.store.sync_observations(
+            parameters=[Parameter.TempDry], since=datetime(2021, 1, 1), until=until
+        )
+
+    def test_incremental_sync(self):
+        rows = self.sync(until=datetime(2021, 2, 2))
+        self.assertEqual(rows, {"metObs/temp_dry/*": 2 * 4 * 32})
+        self.assertEqual(
+            self.client.calls,
+            [
+                (datetime(2021, 1, 1), datetime(2021, 2, 1)),
+                (datetime(2021, 2, 1), datetime(2021, 2, 2)),
+            ],
+            "Not fetched a month at a time",
+        )
+        self.assertEqual(
+            self.store.watermarks()["metObs/temp_dry/06181/2021-02"],
+            "2021-02-01T18:00:00",
+        )
+        self.assertEqual(
+            self.store.synced_through(), {"metObs/temp_dry/*": "2021-02-02T00:00:00"}
+        )
+        self.assertTrue(
+            os.path.isdir(
+                os.path.join(
+                    self.root,
+                    "api=metObs",
+                    "parameter=temp_dry",
+                    "station=06181",
+                    "month=2021-02",
+                )
+            )
+        )
+
+        rows = self.sync(until=datetime(2021, 2, 3))
+        self.assertEqual(rows, {"metObs/temp_dry/*": 2 * 4})
+        self.assertEqual(self.client.calls[-1][0], datetime(2021, 2, 1))
+
+        table = sync.pq.read_table(self.root)
+        self.assertEqual(table.num_rows, 2 * 4 * 33, "Rows lost or duplicated")
+
+    def test_late_station_is_synced(self):
+        self.client.late = {"06181": datetime(2021, 2, 1, 12)}
+        self.assertEqual(
+            self.sync(until=datetime(2021, 2, 2)),
+            {"metObs/temp_dry/*": 4 * 32 + 4 * 31 + 2},
+        )
+        self.client.late = {}
+        self.assertEqual(
+            self.sync(until=datetime(2021, 2, 3)), {"metObs/temp_dry/*": 2 + 2 * 4}
+        )
+        table = sync.pq.read_table(self.root)
+        self.assertEqual(table.num_rows, 2 * 4 * 33, "Rows lost or duplicated")
+
+    def test_interrupted_sync_resumes(self):
+        self.client.fail_from = datetime(2021, 3, 1)
+        with self.assertRaises(ConnectionError):
+            self.sync(until=datetime(2021, 4, 1))
+        self.assertEqual(
+            self.store.synced_through(), {"metObs/temp_dry/*": "2021-03-01T00:00:00"}
+        )
+        self.client.fail_from = None
+        self.sync(until=datetime(2021, 4, 1))
+        self.assertEqual(self.client.calls[-2][0], datetime(2021, 2, 28))
+        table = sync.pq.read_table(self.root)
+        self.assertEqual(table.num_rows, 2 * 4 * 90, "Rows lost or duplicated")
+
+
+if __name__ == "__main__":
+    unittest.main()
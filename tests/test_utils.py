@@ -0,0 +1,53 @@
+import importlib.util
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from dmi_open_data.utils import distance, distances_to, distance_matrix
+
+LATS = [55.707722, 56.0, 64.17, -33.9]
+LONS = [12.562119, 10.0, -51.74, 18.4]
+
+
+class TestDistance(unittest.TestCase):
+    def test_distances_to(self):
+        distances = distances_to(55.0, 12.0, LATS, LONS)
+        for dist, lat, lon in zip(distances, LATS, LONS):
+            self.assertAlmostEqual(dist, distance(55.0, 12.0, lat, lon), places=6)
+
+    def test_distance_matrix(self):
+        matrix = distance_matrix(LATS, LONS, LATS[:2], LONS[:2])
+        for i in range(len(LATS)):
+            for j in range(2):
+                self.assertAlmostEqual(
+                    matrix[i][j], distance(LATS[i], LONS[i], LATS[j], LONS[j]), places=6
+                )
+
+    @unittest.skipIf(importlib.util.find_spec("numpy") is None, "NumPy not installed")
+    def test_float32(self):
+        distances = distances_to(55.0, 12.0, LATS, LONS, float32=True)
+        self.assertEqual(distances.dtype.name, "float32")
+        for dist, lat, lon in zip(distances, LATS, LONS):
+            self.assertAlmostEqual(dist, distance(55.0, 12.0, lat, lon), delta=1.0)
+
+    def test_pure_python_fallback(self):
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            self.assertIsInstance(distances_to(55.0, 12.0, LATS, LONS), list)
+            self.assertIsInstance(distance_matrix(LATS, LONS, LATS, LONS), list)
+
+    def test_date_helpers_do_not_load_numpy(self):
+        code = (
+            "import sys; from datetime import datetime; "
+            "from dmi_open_data.utils import date2microseconds, microseconds2date; "
+            "microseconds2date(date2microseconds(datetime(2021, 1, 1))); "
+            "print('numpy' in sys.modules)"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
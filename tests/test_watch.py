@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+import unittest
+
+from dmi_open_data import Parameter
+from dmi_open_data.batch import BatchQuery
+from dmi_open_data.watch import ObservationWatcher, plan_watch
+from tests.fakes import make_observation
+
+
+class TestObservationWatcher(unittest.TestCase):
+    def test_duplicates_are_dropped(self):
+        watcher = ObservationWatcher()
+        first = [
+            make_observation("06180", "temp_dry", "2021-07-20T00:10:00Z"),
+            make_observation("06180", "temp_dry", "2021-07-20T00:00:00Z"),
+        ]
+        self.assertEqual(len(watcher.accept(first)), 2)
+        second = first + [make_observation("06180", "temp_dry", "2021-07-20T00:20:00Z")]
+        new = watcher.accept(second)
+        self.assertEqual(len(new), 1, "Duplicates were yielded")
+
+    def test_window_start(self):
+        now = datetime(2021, 7, 20, 1)
+        watcher = ObservationWatcher(lookback=timedelta(hours=1))
+        query = BatchQuery(parameter=Parameter.TempDry)
+        self.assertEqual(watcher.window_start(query, now), now - timedelta(hours=1))
+        watcher.accept(
+            [
+                make_observation("06180", "temp_dry", "2021-07-20T00:50:00Z"),
+                make_observation("06181", "temp_dry", "2021-07-20T00:40:00Z"),
+                make_observation("06181", "humidity", "2021-07-20T00:10:00Z"),
+            ]
+        )
+        self.assertEqual(watcher.window_start(query, now), datetime(2021, 7, 20, 0, 40))
+
+    def test_silent_station_is_forgotten(self):
+        watcher = ObservationWatcher(lookback=timedelta(hours=1))
+        query = BatchQuery(parameter=Parameter.TempDry)
+        watcher.accept(
+            [
+                make_observation("06180", "temp_dry", "2021-07-20T00:50:00Z"),
+                make_observation("06181", "temp_dry", "2021-07-20T00:40:00Z"),
+            ]
+        )
+        # 06181 stopped reporting, 06180 keeps reporting every 10 minutes
+        for step in range(1, 13):
+            observed = datetime(2021, 7, 20, 0, 50) + step * timedelta(minutes=10)
+            watcher.accept([make_observation("06180", "temp_dry", observed)])
+        now = datetime(2021, 7, 20, 3)
+        self.assertEqual(watcher.window_start(query, now), datetime(2021, 7, 20, 2, 50))
+        self.assertNotIn(("06181", "temp_dry"), watcher.last_observed)
+
+    def test_max_seen(self):
+        watcher = ObservationWatcher(max_seen=2)
+        observations = [
+            make_observation("06180", "temp_dry", f"2021-07-20T00:{i}0:00Z")
+            for i in range(3)
+        ]
+        watcher.accept(observations)
+        self.assertEqual(len(watcher.accept(observations[:1])), 1)
+
+    def test_plan_watch(self):
+        self.assertEqual(plan_watch(), [BatchQuery()])
+        self.assertEqual(
+            plan_watch(parameters=[Parameter.TempDry]),
+            [BatchQuery(parameter=Parameter.TempDry)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()